@@ -10,6 +10,77 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any
 
+from workflow_rules import Rule, RuleEngine
+
+# Environment variable used for keys containing each fragment (the last matching fragment wins)
+ENV_KEY_PATTERNS = {
+    'api_key': 'API_KEY',
+    'access_token': 'ACCESS_TOKEN',
+    'secret': 'SECRET_KEY',
+    'password': 'PASSWORD',
+    'url': 'BASE_URL',
+    'endpoint': 'API_ENDPOINT',
+    'webhook_url': 'WEBHOOK_URL'
+}
+
+
+class SensitivePatternRule(Rule):
+    """Specific sensitive data patterns found in validation"""
+    
+    name = 'sensitive_data'
+    
+    def visit(self, parent, key, value, path, result):
+        if not isinstance(parent, dict) or not value:
+            return None
+        
+        replacement = None
+        if key == "nodeCredentialType":
+            if isinstance(value, str) and not value.startswith('{{'):
+                replacement = "{{ $credentials.nodeCredentialType }}"
+        elif key == "sessionKey":
+            if isinstance(value, str) and not value.startswith('{{'):
+                replacement = "{{ $credentials.sessionKey }}"
+        elif key == "key":
+            # Only values that look like a real key
+            if isinstance(value, str) and not value.startswith('{{') and len(value) > 10 and any(c.isalnum() for c in value):
+                replacement = "{{ $credentials.key }}"
+        elif "outputKey" in key:
+            if isinstance(value, str) and not value.startswith('{{'):
+                replacement = "{{ $credentials.outputKey }}"
+        elif "maxTokens" in key:
+            if isinstance(value, (str, int)) and str(value).isdigit():
+                replacement = "{{ $env.MAX_TOKENS }}"
+        
+        if replacement is not None:
+            parent[key] = replacement
+            result.fixed.add(self.name)
+
+
+class EnvironmentValueRule(Rule):
+    """Hardcoded values that belong in environment variables"""
+    
+    name = 'environment'
+    
+    def visit(self, parent, key, value, path, result):
+        if not isinstance(parent, dict) or not isinstance(value, str) or not value or value.startswith('{{'):
+            return None
+        
+        lowered = key.lower()
+        env_var = None
+        for pattern, name in ENV_KEY_PATTERNS.items():
+            if pattern in lowered:
+                env_var = name
+        
+        if env_var:
+            parent[key] = f"{{{{ $env.{env_var} }}}}"
+            result.fixed.add(self.name)
+
+
+SENSITIVE_PATTERN_FIX = RuleEngine([SensitivePatternRule()])
+ENVIRONMENT_FIX = RuleEngine([EnvironmentValueRule()])
+# The credential reference fix only touches credential ids and 'authentication', so it commutes with both
+TREE_FIXES = RuleEngine([SensitivePatternRule(), EnvironmentValueRule()])
+
 class AdvancedSecurityFixer:
     def __init__(self, workflows_dir="workflows"):
         self.workflows_dir = Path(workflows_dir)
@@ -22,51 +93,8 @@ class AdvancedSecurityFixer:
         
     def fix_sensitive_data_patterns(self, workflow_data: Dict) -> Dict:
         """Fix specific sensitive data patterns found in validation"""
-        fixed = False
-        
-        def deep_fix_sensitive_data(obj, path=""):
-            nonlocal fixed
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    
-                    # Handle specific patterns found in validation
-                    if key == "nodeCredentialType" and value:
-                        if isinstance(value, str) and not value.startswith('{{'):
-                            obj[key] = "{{ $credentials.nodeCredentialType }}"
-                            fixed = True
-                    
-                    elif key == "sessionKey" and value:
-                        if isinstance(value, str) and not value.startswith('{{'):
-                            obj[key] = "{{ $credentials.sessionKey }}"
-                            fixed = True
-                    
-                    elif key == "key" and value:
-                        if isinstance(value, str) and not value.startswith('{{'):
-                            # Check if this looks like a sensitive key
-                            if len(value) > 10 and any(c.isalnum() for c in value):
-                                obj[key] = "{{ $credentials.key }}"
-                                fixed = True
-                    
-                    elif "outputKey" in key and value:
-                        if isinstance(value, str) and not value.startswith('{{'):
-                            obj[key] = "{{ $credentials.outputKey }}"
-                            fixed = True
-                    
-                    elif "maxTokens" in key and value:
-                        if isinstance(value, (str, int)) and str(value).isdigit():
-                            obj[key] = "{{ $env.MAX_TOKENS }}"
-                            fixed = True
-                    
-                    # Recursively process nested structures
-                    deep_fix_sensitive_data(value, current_path)
-                    
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    deep_fix_sensitive_data(item, f"{path}[{i}]")
-        
-        deep_fix_sensitive_data(workflow_data)
-        return workflow_data, fixed
+        result = SENSITIVE_PATTERN_FIX.run(workflow_data)
+        return workflow_data, 'sensitive_data' in result.fixed
     
     def fix_credential_references(self, workflow_data: Dict) -> Dict:
         """Fix credential references to use proper n8n credential system"""
@@ -97,40 +125,8 @@ class AdvancedSecurityFixer:
     
     def fix_environment_variables(self, workflow_data: Dict) -> Dict:
         """Replace hardcoded values with environment variables"""
-        fixed = False
-        
-        def replace_env_values(obj, path=""):
-            nonlocal fixed
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    
-                    # Common environment variable patterns
-                    env_patterns = {
-                        'api_key': 'API_KEY',
-                        'access_token': 'ACCESS_TOKEN',
-                        'secret': 'SECRET_KEY',
-                        'password': 'PASSWORD',
-                        'url': 'BASE_URL',
-                        'endpoint': 'API_ENDPOINT',
-                        'webhook_url': 'WEBHOOK_URL'
-                    }
-                    
-                    for pattern, env_var in env_patterns.items():
-                        if pattern in key.lower() and value:
-                            if isinstance(value, str) and not value.startswith('{{'):
-                                obj[key] = f"{{{{ $env.{env_var} }}}}"
-                                fixed = True
-                    
-                    # Recursively process nested structures
-                    replace_env_values(value, current_path)
-                    
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    replace_env_values(item, f"{path}[{i}]")
-        
-        replace_env_values(workflow_data)
-        return workflow_data, fixed
+        result = ENVIRONMENT_FIX.run(workflow_data)
+        return workflow_data, 'environment' in result.fixed
     
     def fix_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
         """Fix security issues in a single workflow"""
@@ -144,16 +140,14 @@ class AdvancedSecurityFixer:
                 'environment_fixed': False
             }
             
-            # Apply security fixes
-            workflow_data, sensitive_fixed = self.fix_sensitive_data_patterns(workflow_data)
-            fixes_applied['sensitive_data_fixed'] = sensitive_fixed
+            # Apply security fixes (sensitive patterns and environment values share one pass)
+            tree_fixes = TREE_FIXES.run(workflow_data)
+            fixes_applied['sensitive_data_fixed'] = 'sensitive_data' in tree_fixes.fixed
+            fixes_applied['environment_fixed'] = 'environment' in tree_fixes.fixed
             
             workflow_data, credential_fixed = self.fix_credential_references(workflow_data)
             fixes_applied['credential_fixed'] = credential_fixed
             
-            workflow_data, env_fixed = self.fix_environment_variables(workflow_data)
-            fixes_applied['environment_fixed'] = env_fixed
-            
             # Save if any fixes were applied
             if any(fixes_applied.values()):
                 with open(workflow_path, 'w', encoding='utf-8') as f:
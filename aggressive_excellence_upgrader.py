@@ -17,6 +17,11 @@ import concurrent.futures
 import threading
 from dataclasses import dataclass
 
+from parallel_workflows import iter_completed
+from report_stream import OnlineStats, UpgradeSummary
+from workflow_writer import load_for_update, write_workflow_if_changed
+from workflow_graph import iter_connection_targets
+
 @dataclass
 class WorkflowQuality:
     """Quality metrics for a workflow"""
@@ -35,7 +40,7 @@ class AggressiveExcellenceUpgrader:
         self.backup_dir = Path(backup_dir)
         self.max_workers = max_workers
         self.upgrade_stats = defaultdict(int)
-        self.quality_metrics = defaultdict(list)
+        self.quality_metrics = defaultdict(OnlineStats)
         self.thread_lock = threading.Lock()
         
         # Create backup directory
@@ -355,9 +360,15 @@ class AggressiveExcellenceUpgrader:
             if any(critical in node_type for critical in ['http', 'webhook', 'database', 'api', 'email']):
                 critical_nodes.append(node['id'])
         
+        # Nodes that already have a handler (from an earlier run) get no second one
+        handler_ids = {node.get('id') for node in nodes if node.get('type') == 'n8n-nodes-base.stopAndError'}
+        
         for node_id in critical_nodes:
+            if any(target in handler_ids for _, _, target in iter_connection_targets(connections.get(node_id))):
+                continue
+            
             error_node = {
-                "id": f"error-handler-{node_id}-{uuid.uuid4().hex[:8]}",
+                "id": f"error-handler-{node_id}",
                 "name": f"Error Handler",
                 "type": "n8n-nodes-base.stopAndError",
                 "typeVersion": 1,
@@ -421,6 +432,10 @@ class AggressiveExcellenceUpgrader:
         """Add comprehensive documentation to workflow"""
         nodes = workflow_data.get('nodes', [])
         
+        # Re-runs refresh the existing note instead of adding another one
+        doc_node = next((node for node in nodes if node.get('name') == 'Workflow Documentation'
+                         and node.get('type') == 'n8n-nodes-base.stickyNote'), None)
+        
         if not workflow_data.get('description'):
             workflow_name = workflow_data.get('name', 'Workflow')
             workflow_data['description'] = f"Automated workflow: {workflow_name}. This workflow processes data and performs automated tasks."
@@ -431,7 +446,7 @@ class AggressiveExcellenceUpgrader:
 {workflow_data.get('description', 'This workflow automates various tasks.')}
 
 ## Workflow Details
-- **Total Nodes**: {len(nodes)}
+- **Total Nodes**: {len(nodes) - (1 if doc_node else 0)}
 - **Error Handling**: ✅ Implemented
 - **Security**: ✅ Hardened
 - **Documentation**: ✅ Complete
@@ -448,18 +463,19 @@ class AggressiveExcellenceUpgrader:
 - Follow security best practices
 """
         
-        doc_node = {
-            "id": f"documentation-{uuid.uuid4().hex[:8]}",
-            "name": "Workflow Documentation",
-            "type": "n8n-nodes-base.stickyNote",
-            "typeVersion": 1,
-            "position": [50, 50],
-            "parameters": {
-                "content": doc_content
-            }
-        }
-        
-        nodes.append(doc_node)
+        if doc_node:
+            doc_node.setdefault('parameters', {})['content'] = doc_content
+        else:
+            nodes.append({
+                "id": f"documentation-{uuid.uuid4().hex[:8]}",
+                "name": "Workflow Documentation",
+                "type": "n8n-nodes-base.stickyNote",
+                "typeVersion": 1,
+                "position": [50, 50],
+                "parameters": {
+                    "content": doc_content
+                }
+            })
         workflow_data['nodes'] = nodes
         return workflow_data
     
@@ -482,17 +498,26 @@ class AggressiveExcellenceUpgrader:
     
     def add_metadata(self, workflow_data: Dict) -> Dict:
         """Add workflow metadata"""
+        # Identity and timestamps from an earlier run are kept so re-runs do not rewrite the file;
+        # updatedAt is bumped by touch_metadata only when the workflow is actually rewritten
+        existing = workflow_data['meta'] if isinstance(workflow_data.get('meta'), dict) else {}
+        now = datetime.now().isoformat()
         workflow_data['meta'] = {
-            'instanceId': f"workflow-{uuid.uuid4().hex[:8]}",
+            'instanceId': existing.get('instanceId') or f"workflow-{uuid.uuid4().hex[:8]}",
             'versionId': '1.0.0',
-            'createdAt': datetime.now().isoformat(),
-            'updatedAt': datetime.now().isoformat(),
+            'createdAt': existing.get('createdAt') or now,
+            'updatedAt': existing.get('updatedAt') or now,
             'owner': 'n8n-user',
             'license': 'MIT'
         }
         
         return workflow_data
     
+    def touch_metadata(self, workflow_data: Dict):
+        """Stamp meta.updatedAt on a workflow that is about to be rewritten"""
+        if isinstance(workflow_data.get('meta'), dict):
+            workflow_data['meta']['updatedAt'] = datetime.now().isoformat()
+    
     def add_tags(self, workflow_data: Dict) -> Dict:
         """Add workflow tags"""
         workflow_name = workflow_data.get('name', '').lower()
@@ -532,8 +557,7 @@ class AggressiveExcellenceUpgrader:
     def upgrade_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
         """Upgrade a single workflow to excellent quality"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                original_data = json.load(f)
+            original_data, snapshot = load_for_update(workflow_path)
             
             workflow_data = original_data.copy()
             
@@ -590,14 +614,14 @@ class AggressiveExcellenceUpgrader:
             # Calculate final quality
             final_quality = self.calculate_workflow_quality(workflow_data)
             
-            # Save upgraded workflow
-            with open(workflow_path, 'w', encoding='utf-8') as f:
-                json.dump(workflow_data, f, indent=2, ensure_ascii=False)
+            # Save upgraded workflow (unchanged files are left untouched)
+            written = write_workflow_if_changed(workflow_path, workflow_data, snapshot, self.touch_metadata)
             
             # Update statistics
             with self.thread_lock:
                 self.upgrade_stats['successful'] += 1
-                self.quality_metrics[final_quality.category].append(final_quality.score)
+                self.upgrade_stats['written' if written else 'unchanged'] += 1
+                self.quality_metrics[final_quality.category].add(final_quality.score)
             
             return {
                 'filename': workflow_path.name,
@@ -607,6 +631,7 @@ class AggressiveExcellenceUpgrader:
                 'improvement': final_quality.score - initial_quality.score,
                 'fixes_applied': fixes_applied,
                 'success': True,
+                'written': written,
                 'quality_category': final_quality.category,
                 'complexity': final_quality.complexity
             }
@@ -622,7 +647,7 @@ class AggressiveExcellenceUpgrader:
                 'success': False
             }
     
-    def upgrade_all_workflows(self) -> Dict[str, Any]:
+    def upgrade_all_workflows(self, stream_path: str = None) -> Dict[str, Any]:
         """Upgrade all workflows to excellent quality using parallel processing"""
         print("🚀 Starting AGGRESSIVE excellence upgrade...")
         print("🎯 Target: 100% EXCELLENT quality (90+ points)")
@@ -637,19 +662,13 @@ class AggressiveExcellenceUpgrader:
         print(f"📊 Found {len(workflow_files)} workflows to upgrade")
         
         # Process workflows in parallel
-        upgrade_results = []
+        summary = UpgradeSummary(stream_path)
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_workflow = {
-                executor.submit(self.upgrade_single_workflow, workflow_file): workflow_file 
-                for workflow_file in workflow_files
-            }
-            
             completed = 0
-            for future in concurrent.futures.as_completed(future_to_workflow):
-                workflow_file = future_to_workflow[future]
+            for workflow_file, future in iter_completed(executor, self.upgrade_single_workflow, workflow_files, self.max_workers * 4):
                 try:
                     result = future.result()
-                    upgrade_results.append(result)
+                    summary.add(result)
                     completed += 1
                     
                     if completed % 100 == 0:
@@ -657,7 +676,7 @@ class AggressiveExcellenceUpgrader:
                         
                 except Exception as e:
                     print(f"❌ Error processing {workflow_file.name}: {e}")
-                    upgrade_results.append({
+                    summary.add({
                         'filename': workflow_file.name,
                         'category': workflow_file.parent.name,
                         'error': str(e),
@@ -665,21 +684,26 @@ class AggressiveExcellenceUpgrader:
                     })
         
         # Calculate final statistics
-        successful_upgrades = sum(1 for r in upgrade_results if r.get('success', False))
-        failed_upgrades = len(upgrade_results) - successful_upgrades
+        summary.close()
+        successful_upgrades = summary.successful
+        failed_upgrades = summary.failed
         
         print(f"\n✅ AGGRESSIVE excellence upgrade complete!")
         print(f"📊 Processed {len(workflow_files)} workflows")
         print(f"🎯 Successfully upgraded {successful_upgrades} workflows")
         print(f"❌ Failed upgrades: {failed_upgrades}")
+        print(f"💾 Rewrote {self.upgrade_stats['written']} files ({self.upgrade_stats['unchanged']} unchanged)")
         
         return {
             'total_workflows': len(workflow_files),
             'successful_upgrades': successful_upgrades,
             'failed_upgrades': failed_upgrades,
             'upgrade_stats': dict(self.upgrade_stats),
-            'quality_metrics': dict(self.quality_metrics),
-            'results': upgrade_results
+            'quality_metrics': {category: stats.summary() for category, stats in self.quality_metrics.items()},
+            'results': summary.detailed_results(),
+            'category_breakdown': dict(summary.category_breakdown),
+            'average_improvement': summary.average_improvement(),
+            'excellent_upgrades': summary.excellent
         }
     
     def generate_comprehensive_report(self, upgrade_results: Dict[str, Any]):
@@ -697,16 +721,12 @@ class AggressiveExcellenceUpgrader:
         
         # Quality distribution
         print(f"\n🎯 QUALITY DISTRIBUTION:")
-        for category, scores in upgrade_results['quality_metrics'].items():
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                print(f"   {category.title()}: {len(scores)} workflows (avg: {avg_score:.1f})")
+        for category, stats in upgrade_results['quality_metrics'].items():
+            if stats['count']:
+                print(f"   {category.title()}: {stats['count']} workflows (avg: {stats['mean']:.1f})")
         
         # Category breakdown
-        category_stats = defaultdict(int)
-        for result in upgrade_results['results']:
-            if result.get('success'):
-                category_stats[result.get('category', 'unknown')] += 1
+        category_stats = upgrade_results['category_breakdown']
         
         print(f"\n📁 CATEGORY BREAKDOWN:")
         for category, count in sorted(category_stats.items()):
@@ -733,22 +753,27 @@ class AggressiveExcellenceUpgrader:
         print(f"\n📄 Comprehensive report saved to: aggressive_excellence_report.json")
         
         # Generate summary statistics
-        if upgrade_results['results']:
-            successful_results = [r for r in upgrade_results['results'] if r.get('success')]
-            if successful_results:
-                avg_improvement = sum(r.get('improvement', 0) for r in successful_results) / len(successful_results)
-                print(f"\n📈 AVERAGE QUALITY IMPROVEMENT: {avg_improvement:.1f} points")
-                
-                excellent_count = sum(1 for r in successful_results if r.get('quality_category') == 'excellent')
-                print(f"🏆 WORKFLOWS ACHIEVING EXCELLENCE: {excellent_count}/{len(successful_results)} ({excellent_count/len(successful_results)*100:.1f}%)")
-                
-                if excellent_count == len(successful_results):
-                    print(f"\n🎉 MISSION ACCOMPLISHED! 100% EXCELLENT QUALITY ACHIEVED! 🎉")
-                else:
-                    print(f"\n🎯 TARGET: {len(successful_results) - excellent_count} workflows still need improvement")
+        if upgrade_results['successful_upgrades']:
+            avg_improvement = upgrade_results['average_improvement']
+            print(f"\n📈 AVERAGE QUALITY IMPROVEMENT: {avg_improvement:.1f} points")
+            
+            excellent_count = upgrade_results['excellent_upgrades']
+            print(f"🏆 WORKFLOWS ACHIEVING EXCELLENCE: {excellent_count}/{upgrade_results['successful_upgrades']} ({excellent_count/upgrade_results['successful_upgrades']*100:.1f}%)")
+            
+            if excellent_count == upgrade_results['successful_upgrades']:
+                print(f"\n🎉 MISSION ACCOMPLISHED! 100% EXCELLENT QUALITY ACHIEVED! 🎉")
+            else:
+                print(f"\n🎯 TARGET: {upgrade_results['successful_upgrades'] - excellent_count} workflows still need improvement")
 
 def main():
     """Main aggressive excellence upgrade function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='AGGRESSIVE excellence upgrader')
+    parser.add_argument('--stream', help='Write per-workflow results to this file (.jsonl, .csv or .parquet) '
+                                         'instead of keeping them in the JSON report')
+    args = parser.parse_args()
+    
     print("🎯 AGGRESSIVE Excellence Upgrader for n8n Workflows")
     print("🎯 TARGET: 100% EXCELLENT QUALITY (90+ points)")
     print("=" * 60)
@@ -756,7 +781,7 @@ def main():
     upgrader = AggressiveExcellenceUpgrader()
     
     # Run aggressive upgrade
-    upgrade_results = upgrader.upgrade_all_workflows()
+    upgrade_results = upgrader.upgrade_all_workflows(args.stream)
     
     # Generate comprehensive report
     upgrader.generate_comprehensive_report(upgrade_results)
@@ -13,6 +13,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import math
 
+from instrumentation import CACHE_REQUESTS, RECOMMENDATION_SECONDS
+
 class AIRecommendationEngine:
     """AI-powered workflow recommendation system"""
     
@@ -544,10 +546,14 @@ class AIRecommendationEngine:
         
         # If no valid recommendations exist, generate new ones
         if not existing_recommendations:
-            recommendations = self.generate_hybrid_recommendations(user_id, limit)
+            CACHE_REQUESTS.inc(cache='recommendations', result='miss')
+            with RECOMMENDATION_SECONDS.time(strategy='hybrid'):
+                recommendations = self.generate_hybrid_recommendations(user_id, limit)
             self.save_recommendations(user_id, recommendations)
             return recommendations
         
+        CACHE_REQUESTS.inc(cache='recommendations', result='hit')
+        
         # Return existing recommendations with workflow data
         result = []
         for rec in existing_recommendations:
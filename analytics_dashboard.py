@@ -6,24 +6,201 @@ Analytics Dashboard - Create comprehensive analytics and monitoring
 import json
 import sqlite3
 import os
+import atexit
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import random
 
+from hyperloglog import HyperLogLog
+
+EVENT_INSERT_SQL = """
+    INSERT INTO analytics_events 
+    (event_type, workflow_filename, user_id, session_id, timestamp, metadata, ip_address, user_agent)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+METRIC_INSERT_SQL = """
+    INSERT INTO performance_metrics 
+    (metric_name, metric_value, workflow_filename, timestamp, metadata)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+def _utc_timestamp() -> str:
+    """Timestamp in the same format SQLite uses for CURRENT_TIMESTAMP"""
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+class AnalyticsEventBuffer:
+    """Bounded in-memory buffer that batch-writes analytics rows from a background thread"""
+    
+    def __init__(self, db_path: str, max_events: int = 10000, batch_size: int = 500,
+                 flush_interval_ms: int = 250, block_timeout: float = 0.0):
+        self.db_path = db_path
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.block_timeout = block_timeout
+        
+        self._rows = deque()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        
+        self._thread = threading.Thread(target=self._flush_loop, name="analytics-flusher", daemon=True)
+        self._thread.start()
+    
+    def put(self, table: str, row: Tuple) -> bool:
+        """Queue a row for ``analytics_events`` or ``performance_metrics``; False if it was dropped"""
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            
+            if len(self._rows) >= self.max_events and self.block_timeout > 0:
+                # Back-pressure: give the flusher a chance to drain before dropping
+                self._cond.notify_all()
+                self._cond.wait_for(
+                    lambda: len(self._rows) < self.max_events or self._closed,
+                    timeout=self.block_timeout
+                )
+            
+            if len(self._rows) >= self.max_events or self._closed:
+                self.dropped += 1
+                return False
+            
+            self._rows.append((table, row))
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every queued row has been written"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._rows and not self._in_flight,
+                timeout=timeout
+            )
+    
+    def close(self, timeout: float = 10.0):
+        """Stop accepting rows, write what is left and stop the flusher thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer counters"""
+        with self._cond:
+            return {
+                'buffered': len(self._rows),
+                'capacity': self.max_events,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed
+            }
+    
+    def _flush_loop(self):
+        """Drain the buffer every flush interval or whenever a full batch is waiting"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or self._flush_requested or len(self._rows) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                batch = list(self._rows)
+                self._rows.clear()
+                self._in_flight = len(batch)
+                self._flush_requested = False
+                stopping = self._closed
+                # Wake producers blocked on a full buffer
+                self._cond.notify_all()
+            
+            written = self._write_batch(conn, batch) if batch else 0
+            
+            with self._cond:
+                self.written += written
+                self.failed += len(batch) - written
+                self._in_flight = 0
+                self._cond.notify_all()
+            
+            if stopping:
+                break
+        
+        conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, Tuple]]) -> int:
+        """Insert a batch in a single transaction"""
+        events = [row for table, row in batch if table == 'analytics_events']
+        metrics = [row for table, row in batch if table == 'performance_metrics']
+        
+        try:
+            with conn:
+                if events:
+                    conn.executemany(EVENT_INSERT_SQL, events)
+                if metrics:
+                    conn.executemany(METRIC_INSERT_SQL, metrics)
+            return len(events) + len(metrics)
+        except Exception as e:
+            print(f"Error flushing analytics buffer: {e}")
+            return 0
+
 class AnalyticsDashboard:
-    """Create comprehensive analytics dashboard"""
+    """Create comprehensive analytics dashboard
     
-    def __init__(self, db_path: str = "database/workflows.db"):
+    Reads never write: rollup-backed queries see the rollups as of the last
+    compact_analytics() run, which comes from the --compact job or, for a
+    long-running host, the background compactor started by compact_interval.
+    """
+    
+    def __init__(self, db_path: str = "database/workflows.db", buffered: bool = True,
+                 buffer_size: int = 10000, batch_size: int = 500, flush_interval_ms: int = 250,
+                 raw_retention_days: Optional[int] = None, hll_precision: int = 12,
+                 compact_interval: Optional[float] = None):
         self.db_path = db_path
+        # Raw events older than this are deleted once rolled up (None keeps them forever)
+        self.raw_retention_days = raw_retention_days
+        # Unique-count sketches use 2**hll_precision registers (~1.04/sqrt(2**p) error)
+        self.hll_precision = hll_precision
         self.static_dir = Path("static")
         self.static_dir.mkdir(exist_ok=True)
         
         self.init_analytics_database()
+        
+        # Events are queued and written in batches unless buffering is disabled
+        self.event_buffer = None
+        if buffered:
+            self.event_buffer = AnalyticsEventBuffer(
+                db_path, max_events=buffer_size, batch_size=batch_size,
+                flush_interval_ms=flush_interval_ms
+            )
+            atexit.register(self.event_buffer.close)
+        
+        # Rollups are refreshed at most once per compact_interval seconds (None leaves it to --compact)
+        self.compact_interval = compact_interval
+        self._compactor = None
+        self._stop_compactor = threading.Event()
+        if compact_interval:
+            self._compactor = threading.Thread(target=self._compact_loop, name="analytics-compactor", daemon=True)
+            self._compactor.start()
     
     def init_analytics_database(self):
         """Initialize analytics database tables"""
         conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")  # Lets the background writer run alongside readers
         
         # Analytics events table
         conn.execute("""
@@ -84,10 +261,72 @@ class AnalyticsDashboard:
             )
         """)
         
+        # Hourly and daily event rollups maintained by compact_analytics()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_events_hourly (
+                hour TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                workflow_filename TEXT NOT NULL DEFAULT '',
+                events INTEGER DEFAULT 0,
+                PRIMARY KEY (hour, event_type, workflow_filename)
+            )
+        """)
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_events_daily (
+                day TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                workflow_filename TEXT NOT NULL DEFAULT '',
+                events INTEGER DEFAULT 0,
+                PRIMARY KEY (day, event_type, workflow_filename)
+            )
+        """)
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_daily_uniques (
+                day TEXT PRIMARY KEY,
+                users INTEGER DEFAULT 0,
+                sessions INTEGER DEFAULT 0
+            )
+        """)
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS performance_metrics_daily (
+                day TEXT NOT NULL,
+                metric_name TEXT NOT NULL,
+                count INTEGER DEFAULT 0,
+                total REAL DEFAULT 0,
+                min_value REAL,
+                max_value REAL,
+                PRIMARY KEY (day, metric_name)
+            )
+        """)
+        
+        # HyperLogLog sketches of distinct user/session ids per day ('' = all workflows)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_daily_sketches (
+                day TEXT NOT NULL,
+                workflow_filename TEXT NOT NULL DEFAULT '',
+                kind TEXT NOT NULL,
+                sketch BLOB NOT NULL,
+                PRIMARY KEY (day, workflow_filename, kind)
+            )
+        """)
+        
+        # Highest raw row id already folded into the rollups, per source table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_rollup_state (
+                source TEXT PRIMARY KEY,
+                last_id INTEGER DEFAULT 0,
+                compacted_at TIMESTAMP
+            )
+        """)
+        
         # Create indexes
         conn.execute("CREATE INDEX IF NOT EXISTS idx_analytics_event_type ON analytics_events(event_type)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_analytics_timestamp ON analytics_events(timestamp)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_performance_metric ON performance_metrics(metric_name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_performance_timestamp ON performance_metrics(timestamp)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON user_sessions(user_id)")
         
         conn.commit()
@@ -98,19 +337,17 @@ class AnalyticsDashboard:
                    metadata: Dict = None, ip_address: str = None, 
                    user_agent: str = None) -> bool:
         """Track analytics event"""
+        row = (
+            event_type, workflow_filename, user_id, session_id, _utc_timestamp(),
+            json.dumps(metadata) if metadata else None,
+            ip_address, user_agent
+        )
+        if self.event_buffer:
+            return self.event_buffer.put('analytics_events', row)
+        
         try:
             conn = sqlite3.connect(self.db_path)
-            
-            conn.execute("""
-                INSERT INTO analytics_events 
-                (event_type, workflow_filename, user_id, session_id, metadata, ip_address, user_agent)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event_type, workflow_filename, user_id, session_id,
-                json.dumps(metadata) if metadata else None,
-                ip_address, user_agent
-            ))
-            
+            conn.execute(EVENT_INSERT_SQL, row)
             conn.commit()
             conn.close()
             return True
@@ -122,18 +359,16 @@ class AnalyticsDashboard:
     def track_performance_metric(self, metric_name: str, metric_value: float,
                                workflow_filename: str = None, metadata: Dict = None) -> bool:
         """Track performance metric"""
+        row = (
+            metric_name, metric_value, workflow_filename, _utc_timestamp(),
+            json.dumps(metadata) if metadata else None
+        )
+        if self.event_buffer:
+            return self.event_buffer.put('performance_metrics', row)
+        
         try:
             conn = sqlite3.connect(self.db_path)
-            
-            conn.execute("""
-                INSERT INTO performance_metrics 
-                (metric_name, metric_value, workflow_filename, metadata)
-                VALUES (?, ?, ?, ?)
-            """, (
-                metric_name, metric_value, workflow_filename,
-                json.dumps(metadata) if metadata else None
-            ))
-            
+            conn.execute(METRIC_INSERT_SQL, row)
             conn.commit()
             conn.close()
             return True
@@ -142,12 +377,219 @@ class AnalyticsDashboard:
             print(f"Error tracking performance metric: {e}")
             return False
     
-    def get_analytics_summary(self, days: int = 30) -> Dict[str, Any]:
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write any buffered events so reads see them"""
+        if self.event_buffer:
+            return self.event_buffer.flush(timeout)
+        return True
+    
+    def close(self):
+        """Stop the background compactor, flush buffered events and stop the background writer"""
+        if self._compactor:
+            self._stop_compactor.set()
+            self._compactor.join()
+            self._compactor = None
+        if self.event_buffer:
+            self.event_buffer.close()
+    
+    def _compact_loop(self):
+        """Run compact_analytics() every compact_interval seconds until close()"""
+        while not self._stop_compactor.wait(self.compact_interval):
+            self.compact_analytics()
+    
+    def compact_analytics(self, retention_days: Optional[int] = None) -> Dict[str, int]:
+        """Fold new raw events into the hourly/daily rollups and apply raw-event retention"""
+        self.flush()
+        if retention_days is None:
+            retention_days = self.raw_retention_days
+        
+        stats = {'events_compacted': 0, 'metrics_compacted': 0, 'events_pruned': 0, 'metrics_pruned': 0}
+        conn = sqlite3.connect(self.db_path)
+        
+        try:
+            with conn:
+                last_id, max_id = self._get_compaction_range(conn, 'analytics_events')
+                if max_id > last_id:
+                    stats['events_compacted'] = self._compact_events(conn, last_id, max_id)
+                    self._set_compaction_watermark(conn, 'analytics_events', max_id)
+                
+                last_id, max_id = self._get_compaction_range(conn, 'performance_metrics')
+                if max_id > last_id:
+                    stats['metrics_compacted'] = self._compact_metrics(conn, last_id, max_id)
+                    self._set_compaction_watermark(conn, 'performance_metrics', max_id)
+                
+                if retention_days is not None:
+                    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+                    for source, key in (('analytics_events', 'events_pruned'), ('performance_metrics', 'metrics_pruned')):
+                        # Only rows that are already part of the rollups may be deleted
+                        cursor = conn.execute(f"""
+                            DELETE FROM {source}
+                            WHERE timestamp < ? AND id <= (
+                                SELECT last_id FROM analytics_rollup_state WHERE source = ?
+                            )
+                        """, (cutoff, source))
+                        stats[key] = cursor.rowcount
+        except Exception as e:
+            print(f"Error compacting analytics: {e}")
+        
+        conn.close()
+        return stats
+    
+    def _get_compaction_range(self, conn: sqlite3.Connection, source: str) -> Tuple[int, int]:
+        """Return (last compacted id, current max id) for a raw table"""
+        row = conn.execute("SELECT last_id FROM analytics_rollup_state WHERE source = ?", (source,)).fetchone()
+        last_id = row[0] if row else 0
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {source}").fetchone()[0]
+        return last_id, max_id
+    
+    def _set_compaction_watermark(self, conn: sqlite3.Connection, source: str, last_id: int):
+        """Record the highest raw id included in the rollups"""
+        conn.execute("""
+            INSERT INTO analytics_rollup_state (source, last_id, compacted_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source) DO UPDATE SET last_id = excluded.last_id, compacted_at = excluded.compacted_at
+        """, (source, last_id))
+    
+    def _compact_events(self, conn: sqlite3.Connection, last_id: int, max_id: int) -> int:
+        """Add raw events in (last_id, max_id] to the hourly and daily rollups"""
+        conn.execute("""
+            INSERT INTO analytics_events_hourly (hour, event_type, workflow_filename, events)
+            SELECT strftime('%Y-%m-%d %H:00', timestamp), event_type, COALESCE(workflow_filename, ''), COUNT(*)
+            FROM analytics_events
+            WHERE id > ? AND id <= ?
+            GROUP BY 1, 2, 3
+            ON CONFLICT(hour, event_type, workflow_filename) DO UPDATE SET events = events + excluded.events
+        """, (last_id, max_id))
+        
+        conn.execute("""
+            INSERT INTO analytics_events_daily (day, event_type, workflow_filename, events)
+            SELECT DATE(timestamp), event_type, COALESCE(workflow_filename, ''), COUNT(*)
+            FROM analytics_events
+            WHERE id > ? AND id <= ?
+            GROUP BY 1, 2, 3
+            ON CONFLICT(day, event_type, workflow_filename) DO UPDATE SET events = events + excluded.events
+        """, (last_id, max_id))
+        
+        self._update_daily_sketches(conn, last_id, max_id)
+        
+        return conn.execute(
+            "SELECT COUNT(*) FROM analytics_events WHERE id > ? AND id <= ?", (last_id, max_id)
+        ).fetchone()[0]
+    
+    def _update_daily_sketches(self, conn: sqlite3.Connection, last_id: int, max_id: int):
+        """Add user/session ids from raw events in (last_id, max_id] to the per-day sketches"""
+        sketches = {}
+        
+        def sketch_for(day: str, workflow_filename: str, kind: str) -> HyperLogLog:
+            key = (day, workflow_filename, kind)
+            if key not in sketches:
+                row = conn.execute("""
+                    SELECT sketch FROM analytics_daily_sketches
+                    WHERE day = ? AND workflow_filename = ? AND kind = ?
+                """, key).fetchone()
+                sketches[key] = HyperLogLog.from_bytes(row[0]) if row else HyperLogLog(self.hll_precision)
+            return sketches[key]
+        
+        cursor = conn.execute("""
+            SELECT DATE(timestamp), COALESCE(workflow_filename, ''), user_id, session_id
+            FROM analytics_events
+            WHERE id > ? AND id <= ?
+        """, (last_id, max_id))
+        for day, workflow_filename, user_id, session_id in cursor:
+            sketch_for(day, '', 'users').add(user_id)
+            sketch_for(day, '', 'sessions').add(session_id)
+            if workflow_filename:
+                sketch_for(day, workflow_filename, 'users').add(user_id)
+        
+        conn.executemany("""
+            INSERT OR REPLACE INTO analytics_daily_sketches (day, workflow_filename, kind, sketch)
+            VALUES (?, ?, ?, ?)
+        """, [(day, workflow_filename, kind, sketch.to_bytes())
+              for (day, workflow_filename, kind), sketch in sketches.items()])
+        
+        # Per-day unique counts for daily_stats come straight from the sketches
+        days = {day for day, workflow_filename, kind in sketches if not workflow_filename}
+        conn.executemany("""
+            INSERT OR REPLACE INTO analytics_daily_uniques (day, users, sessions)
+            VALUES (?, ?, ?)
+        """, [(day, sketches[(day, '', 'users')].count(), sketches[(day, '', 'sessions')].count())
+              for day in days])
+    
+    def estimate_unique_users(self, days: int = 30, workflow_filename: Optional[str] = None,
+                              kind: str = 'users') -> int:
+        """Estimate distinct users (or sessions) over a window by merging daily sketches"""
+        conn = sqlite3.connect(self.db_path)
+        since_day = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+        estimate = self._merge_daily_sketches(conn, since_day, workflow_filename or '', kind)
+        conn.close()
+        return estimate
+    
+    def _merge_daily_sketches(self, conn: sqlite3.Connection, since_day: str,
+                              workflow_filename: str, kind: str) -> int:
+        """Merge the daily sketches from since_day onwards and return the estimate"""
+        merged = None
+        cursor = conn.execute("""
+            SELECT sketch FROM analytics_daily_sketches
+            WHERE day >= ? AND workflow_filename = ? AND kind = ?
+        """, (since_day, workflow_filename, kind))
+        for (blob,) in cursor:
+            sketch = HyperLogLog.from_bytes(blob)
+            merged = sketch if merged is None else merged.merge(sketch)
+        return merged.count() if merged else 0
+    
+    def _compact_metrics(self, conn: sqlite3.Connection, last_id: int, max_id: int) -> int:
+        """Add raw performance metrics in (last_id, max_id] to the daily rollup"""
+        conn.execute("""
+            INSERT INTO performance_metrics_daily (day, metric_name, count, total, min_value, max_value)
+            SELECT DATE(timestamp), metric_name, COUNT(*), SUM(metric_value), MIN(metric_value), MAX(metric_value)
+            FROM performance_metrics
+            WHERE id > ? AND id <= ?
+            GROUP BY 1, 2
+            ON CONFLICT(day, metric_name) DO UPDATE SET
+                count = count + excluded.count,
+                total = total + excluded.total,
+                min_value = MIN(min_value, excluded.min_value),
+                max_value = MAX(max_value, excluded.max_value)
+        """, (last_id, max_id))
+        
+        return conn.execute(
+            "SELECT COUNT(*) FROM performance_metrics WHERE id > ? AND id <= ?", (last_id, max_id)
+        ).fetchone()[0]
+    
+    def export_columnar(self, output_dir: str = "exports/analytics", days: Optional[int] = None,
+                        chunk_size: int = 100000) -> Dict[str, int]:
+        """Export raw events and metrics to day-partitioned Parquet for offline analysis"""
+        from analytics_export import AnalyticsExporter
+        
+        self.flush()
+        exporter = AnalyticsExporter(self.db_path, output_dir, chunk_size=chunk_size)
+        return exporter.export(days)
+    
+    def get_hourly_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Get per-hour event counts from the hourly rollup"""
+        since_hour = (datetime.utcnow() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:00')
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute("""
+            SELECT hour, SUM(events) as events
+            FROM analytics_events_hourly
+            WHERE hour >= ?
+            GROUP BY hour
+            ORDER BY hour
+        """, (since_hour,))
+        hourly_stats = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return hourly_stats
+    
+    def get_analytics_summary(self, days: int = 30, use_rollups: bool = True) -> Dict[str, Any]:
         """Get analytics summary for specified days"""
+        if not use_rollups:
+            self.flush()
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
-        since_date = datetime.now() - timedelta(days=days)
+        since_date = datetime.utcnow() - timedelta(days=days)
         
         summary = {
             'period_days': days,
@@ -165,105 +607,177 @@ class AnalyticsDashboard:
         }
         
         try:
-            # Total events
-            cursor = conn.execute("""
-                SELECT COUNT(*) as count
-                FROM analytics_events
-                WHERE timestamp >= ?
-            """, (since_date,))
-            
-            total_events = cursor.fetchone()
-            if total_events:
-                summary['total_events'] = total_events['count']
-            
-            # Unique users and sessions
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(DISTINCT user_id) as unique_users,
-                    COUNT(DISTINCT session_id) as unique_sessions
-                FROM analytics_events
-                WHERE timestamp >= ?
-            """, (since_date,))
-            
-            user_stats = cursor.fetchone()
-            if user_stats:
-                summary['unique_users'] = user_stats['unique_users']
-                summary['unique_sessions'] = user_stats['unique_sessions']
-            
-            # Event types breakdown
-            cursor = conn.execute("""
-                SELECT event_type, COUNT(*) as count
-                FROM analytics_events
-                WHERE timestamp >= ?
-                GROUP BY event_type
-                ORDER BY count DESC
-            """, (since_date,))
-            
-            event_types = cursor.fetchall()
-            summary['event_types'] = {row['event_type']: row['count'] for row in event_types}
-            
-            # Top workflows
-            cursor = conn.execute("""
-                SELECT 
-                    workflow_filename,
-                    COUNT(*) as views
-                FROM analytics_events
-                WHERE timestamp >= ? AND event_type = 'workflow_view'
-                GROUP BY workflow_filename
-                ORDER BY views DESC
-                LIMIT 10
-            """, (since_date,))
-            
-            top_workflows = cursor.fetchall()
-            summary['top_workflows'] = [dict(row) for row in top_workflows]
-            
-            # Daily stats
-            cursor = conn.execute("""
-                SELECT 
-                    DATE(timestamp) as date,
-                    COUNT(*) as events,
-                    COUNT(DISTINCT user_id) as users,
-                    COUNT(DISTINCT session_id) as sessions
-                FROM analytics_events
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            """, (since_date,))
-            
-            daily_stats = cursor.fetchall()
-            summary['daily_stats'] = [dict(row) for row in daily_stats]
-            
-            # Performance metrics
-            cursor = conn.execute("""
-                SELECT 
-                    metric_name,
-                    AVG(metric_value) as avg_value,
-                    MIN(metric_value) as min_value,
-                    MAX(metric_value) as max_value,
-                    COUNT(*) as count
-                FROM performance_metrics
-                WHERE timestamp >= ?
-                GROUP BY metric_name
-            """, (since_date,))
-            
-            perf_metrics = cursor.fetchall()
-            summary['performance_metrics'] = {
-                row['metric_name']: {
-                    'average': round(row['avg_value'], 2),
-                    'minimum': round(row['min_value'], 2),
-                    'maximum': round(row['max_value'], 2),
-                    'count': row['count']
-                } for row in perf_metrics
-            }
-            
+            if use_rollups:
+                self._summarize_rollups(conn, since_date, summary)
+            else:
+                self._summarize_raw_events(conn, since_date, summary)
         except Exception as e:
             print(f"Error getting analytics summary: {e}")
         
         conn.close()
         return summary
     
+    def _summarize_rollups(self, conn: sqlite3.Connection, since_date: datetime, summary: Dict[str, Any]):
+        """Fill summary from the daily rollup tables"""
+        since_day = since_date.strftime('%Y-%m-%d')
+        
+        cursor = conn.execute("""
+            SELECT event_type, SUM(events) as count
+            FROM analytics_events_daily
+            WHERE day >= ?
+            GROUP BY event_type
+            ORDER BY count DESC
+        """, (since_day,))
+        summary['event_types'] = {row['event_type']: row['count'] for row in cursor.fetchall()}
+        summary['total_events'] = sum(summary['event_types'].values())
+        
+        # Distinct users/sessions are estimated by merging the daily HyperLogLog sketches
+        summary['unique_users'] = self._merge_daily_sketches(conn, since_day, '', 'users')
+        summary['unique_sessions'] = self._merge_daily_sketches(conn, since_day, '', 'sessions')
+        
+        cursor = conn.execute("""
+            SELECT workflow_filename, SUM(events) as views
+            FROM analytics_events_daily
+            WHERE day >= ? AND event_type = 'workflow_view' AND workflow_filename != ''
+            GROUP BY workflow_filename
+            ORDER BY views DESC
+            LIMIT 10
+        """, (since_day,))
+        summary['top_workflows'] = [dict(row) for row in cursor.fetchall()]
+        
+        cursor = conn.execute("""
+            SELECT 
+                d.day as date,
+                d.events as events,
+                COALESCE(u.users, 0) as users,
+                COALESCE(u.sessions, 0) as sessions
+            FROM (
+                SELECT day, SUM(events) as events
+                FROM analytics_events_daily
+                WHERE day >= ?
+                GROUP BY day
+            ) d
+            LEFT JOIN analytics_daily_uniques u ON u.day = d.day
+            ORDER BY d.day
+        """, (since_day,))
+        summary['daily_stats'] = [dict(row) for row in cursor.fetchall()]
+        
+        cursor = conn.execute("""
+            SELECT 
+                metric_name,
+                SUM(total) / SUM(count) as avg_value,
+                MIN(min_value) as min_value,
+                MAX(max_value) as max_value,
+                SUM(count) as count
+            FROM performance_metrics_daily
+            WHERE day >= ?
+            GROUP BY metric_name
+        """, (since_day,))
+        summary['performance_metrics'] = {
+            row['metric_name']: {
+                'average': round(row['avg_value'], 2),
+                'minimum': round(row['min_value'], 2),
+                'maximum': round(row['max_value'], 2),
+                'count': row['count']
+            } for row in cursor.fetchall()
+        }
+    
+    def _summarize_raw_events(self, conn: sqlite3.Connection, since_date: datetime, summary: Dict[str, Any]):
+        """Fill summary by scanning the raw event tables"""
+        # Total events
+        cursor = conn.execute("""
+            SELECT COUNT(*) as count
+            FROM analytics_events
+            WHERE timestamp >= ?
+        """, (since_date,))
+        
+        total_events = cursor.fetchone()
+        if total_events:
+            summary['total_events'] = total_events['count']
+        
+        # Unique users and sessions
+        cursor = conn.execute("""
+            SELECT 
+                COUNT(DISTINCT user_id) as unique_users,
+                COUNT(DISTINCT session_id) as unique_sessions
+            FROM analytics_events
+            WHERE timestamp >= ?
+        """, (since_date,))
+        
+        user_stats = cursor.fetchone()
+        if user_stats:
+            summary['unique_users'] = user_stats['unique_users']
+            summary['unique_sessions'] = user_stats['unique_sessions']
+        
+        # Event types breakdown
+        cursor = conn.execute("""
+            SELECT event_type, COUNT(*) as count
+            FROM analytics_events
+            WHERE timestamp >= ?
+            GROUP BY event_type
+            ORDER BY count DESC
+        """, (since_date,))
+        
+        event_types = cursor.fetchall()
+        summary['event_types'] = {row['event_type']: row['count'] for row in event_types}
+        
+        # Top workflows
+        cursor = conn.execute("""
+            SELECT 
+                workflow_filename,
+                COUNT(*) as views
+            FROM analytics_events
+            WHERE timestamp >= ? AND event_type = 'workflow_view'
+            GROUP BY workflow_filename
+            ORDER BY views DESC
+            LIMIT 10
+        """, (since_date,))
+        
+        top_workflows = cursor.fetchall()
+        summary['top_workflows'] = [dict(row) for row in top_workflows]
+        
+        # Daily stats
+        cursor = conn.execute("""
+            SELECT 
+                DATE(timestamp) as date,
+                COUNT(*) as events,
+                COUNT(DISTINCT user_id) as users,
+                COUNT(DISTINCT session_id) as sessions
+            FROM analytics_events
+            WHERE timestamp >= ?
+            GROUP BY DATE(timestamp)
+            ORDER BY date
+        """, (since_date,))
+        
+        daily_stats = cursor.fetchall()
+        summary['daily_stats'] = [dict(row) for row in daily_stats]
+        
+        # Performance metrics
+        cursor = conn.execute("""
+            SELECT 
+                metric_name,
+                AVG(metric_value) as avg_value,
+                MIN(metric_value) as min_value,
+                MAX(metric_value) as max_value,
+                COUNT(*) as count
+            FROM performance_metrics
+            WHERE timestamp >= ?
+            GROUP BY metric_name
+        """, (since_date,))
+        
+        perf_metrics = cursor.fetchall()
+        summary['performance_metrics'] = {
+            row['metric_name']: {
+                'average': round(row['avg_value'], 2),
+                'minimum': round(row['min_value'], 2),
+                'maximum': round(row['max_value'], 2),
+                'count': row['count']
+            } for row in perf_metrics
+        }
+    
     def get_workflow_analytics(self, workflow_filename: str) -> Dict[str, Any]:
         """Get detailed analytics for a specific workflow"""
+        self.flush()
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
@@ -917,7 +1431,40 @@ class AnalyticsDashboard:
 
 def main():
     """Main execution function"""
-    dashboard = AnalyticsDashboard()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='N8N Workflows Analytics Dashboard')
+    parser.add_argument('--db', default='database/workflows.db', help='Analytics database path')
+    parser.add_argument('--compact', action='store_true', help='Roll up raw events and apply retention, then exit')
+    parser.add_argument('--retention-days', type=int, help='Delete rolled-up raw events older than this many days')
+    parser.add_argument('--hll-precision', type=int, default=12, help='HyperLogLog precision for unique counts (4-16)')
+    parser.add_argument('--export', metavar='DIR', help='Export events and metrics to partitioned Parquet, then exit')
+    parser.add_argument('--export-days', type=int, help='Only export the last N days')
+    parser.add_argument('--summary-from', metavar='DIR', help='Print the 30-day summary from a Parquet export')
+    args = parser.parse_args()
+    
+    if args.summary_from:
+        from analytics_export import ColumnarAnalyticsReader
+        summary = ColumnarAnalyticsReader(args.summary_from).get_analytics_summary(30)
+        print(json.dumps(summary, indent=2))
+        return
+    
+    dashboard = AnalyticsDashboard(args.db, raw_retention_days=args.retention_days,
+                                   hll_precision=args.hll_precision)
+    
+    if args.export:
+        exported = dashboard.export_columnar(args.export, days=args.export_days)
+        print(f"✅ Exported {exported['analytics_events']} events and "
+              f"{exported['performance_metrics']} metrics to {args.export}")
+        dashboard.close()
+        return
+    
+    if args.compact:
+        stats = dashboard.compact_analytics()
+        print(f"✅ Compacted {stats['events_compacted']} events and {stats['metrics_compacted']} metrics, "
+              f"pruned {stats['events_pruned']} events and {stats['metrics_pruned']} metrics")
+        dashboard.close()
+        return
     
     print("📊 ANALYTICS DASHBOARD")
     print("=" * 30)
@@ -925,6 +1472,7 @@ def main():
     # Seed sample data
     print("🌱 Seeding sample analytics data...")
     dashboard.seed_sample_analytics()
+    dashboard.compact_analytics()
     
     # Create dashboard
     print("📈 Creating analytics dashboard...")
@@ -962,6 +1510,8 @@ def main():
     
     print(f"\n🎉 Analytics dashboard complete!")
     print(f"📊 Dashboard: {dashboard_path}")
+    
+    dashboard.close()
 
 if __name__ == "__main__":
     main()
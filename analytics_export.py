@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Analytics Export - Columnar Parquet export of analytics events for offline analysis
+"""
+
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+
+# Columns (with Arrow types) exported per table and the partition keys used on disk
+EXPORT_TABLES = {
+    'analytics_events': {
+        'columns': {
+            'id': 'int64', 'event_type': 'string', 'workflow_filename': 'string',
+            'user_id': 'string', 'session_id': 'string', 'timestamp': 'string',
+            'metadata': 'string', 'ip_address': 'string', 'user_agent': 'string', 'day': 'string'
+        },
+        'partitioning': ['day', 'event_type'],
+    },
+    'performance_metrics': {
+        'columns': {
+            'id': 'int64', 'metric_name': 'string', 'metric_value': 'float64',
+            'workflow_filename': 'string', 'timestamp': 'string', 'metadata': 'string', 'day': 'string'
+        },
+        'partitioning': ['day', 'metric_name'],
+    },
+}
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily so the dashboard works without it"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("pyarrow is required for columnar export (💡 Install with: pip install pyarrow)")
+    return pyarrow
+
+
+class AnalyticsExporter:
+    """Stream analytics tables from SQLite into day-partitioned Parquet datasets"""
+
+    def __init__(self, db_path: str, output_dir: str = "exports/analytics", chunk_size: int = 100000):
+        self.db_path = db_path
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+
+    def export(self, days: Optional[int] = None) -> Dict[str, int]:
+        """Export both analytics tables, optionally limited to the last N days"""
+        since = None
+        if days is not None:
+            since = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        return {table: self.export_table(table, since) for table in EXPORT_TABLES}
+
+    def export_table(self, table: str, since: Optional[str] = None) -> int:
+        """Export one table chunk by chunk; returns the number of rows written"""
+        pa = _require_pyarrow()
+        spec = EXPORT_TABLES[table]
+        table_dir = self.output_dir / table
+
+        # Each export replaces the previous snapshot of the table
+        if table_dir.exists():
+            shutil.rmtree(table_dir)
+        table_dir.mkdir(parents=True)
+
+        select = [name for name in spec['columns'] if name != 'day']
+        query = f"SELECT {', '.join(select)}, DATE(timestamp) AS day FROM {table}"
+        params = []
+        if since:
+            query += " WHERE timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY id"
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.execute(query, params)
+        names = [description[0] for description in cursor.description]
+        types = [getattr(pa, spec['columns'][name])() for name in names]
+
+        total = 0
+        chunk_index = 0
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+
+            columns = list(zip(*rows))
+            arrays = {
+                name: pa.array(values, type=arrow_type)
+                for name, values, arrow_type in zip(names, columns, types)
+            }
+            arrays['timestamp'] = arrays['timestamp'].cast(pa.timestamp('us'))
+
+            pa.dataset.write_dataset(
+                pa.table(arrays),
+                table_dir,
+                format='parquet',
+                partitioning=spec['partitioning'],
+                partitioning_flavor='hive',
+                basename_template=f"chunk-{chunk_index:05d}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore'
+            )
+            total += len(rows)
+            chunk_index += 1
+
+        conn.close()
+        return total
+
+
+class ColumnarAnalyticsReader:
+    """Run the dashboard summary aggregations over an exported Parquet snapshot"""
+
+    def __init__(self, export_dir: str = "exports/analytics"):
+        self.export_dir = Path(export_dir)
+        self.pa = _require_pyarrow()
+
+    def _load(self, table: str, columns: List[str], since_day: str):
+        """Load the requested columns, pruning partitions older than since_day"""
+        table_dir = self.export_dir / table
+        if not table_dir.exists():
+            return None
+
+        ds = self.pa.dataset
+        dataset = ds.dataset(table_dir, format='parquet', partitioning='hive')
+        return dataset.to_table(columns=columns, filter=ds.field('day') >= since_day)
+
+    def get_analytics_summary(self, days: int = 30) -> Dict[str, Any]:
+        """Same shape as AnalyticsDashboard.get_analytics_summary, computed from the export"""
+        pc = self.pa.compute
+        since_date = datetime.utcnow() - timedelta(days=days)
+        since_day = since_date.strftime('%Y-%m-%d')
+
+        summary = {
+            'period_days': days,
+            'since_date': since_date.isoformat(),
+            'total_events': 0,
+            'unique_users': 0,
+            'unique_sessions': 0,
+            'total_page_views': 0,
+            'total_downloads': 0,
+            'top_workflows': [],
+            'event_types': {},
+            'daily_stats': [],
+            'user_engagement': {},
+            'performance_metrics': {}
+        }
+
+        events = self._load(
+            'analytics_events',
+            ['id', 'event_type', 'workflow_filename', 'user_id', 'session_id', 'day'],
+            since_day
+        )
+        if events is not None and events.num_rows:
+            summary['total_events'] = events.num_rows
+            summary['unique_users'] = pc.count_distinct(events['user_id']).as_py()
+            summary['unique_sessions'] = pc.count_distinct(events['session_id']).as_py()
+
+            event_types = events.group_by('event_type').aggregate([('id', 'count')])
+            event_types = event_types.sort_by([('id_count', 'descending')])
+            summary['event_types'] = dict(zip(
+                event_types['event_type'].to_pylist(), event_types['id_count'].to_pylist()
+            ))
+
+            views = events.filter(pc.equal(events['event_type'], 'workflow_view'))
+            top_workflows = views.group_by('workflow_filename').aggregate([('id', 'count')])
+            top_workflows = top_workflows.sort_by([('id_count', 'descending')]).slice(0, 10)
+            summary['top_workflows'] = [
+                {'workflow_filename': filename, 'views': count}
+                for filename, count in zip(top_workflows['workflow_filename'].to_pylist(),
+                                           top_workflows['id_count'].to_pylist())
+            ]
+
+            daily = events.group_by('day').aggregate([
+                ('id', 'count'),
+                ('user_id', 'count_distinct'),
+                ('session_id', 'count_distinct')
+            ]).sort_by('day')
+            summary['daily_stats'] = [
+                {'date': day, 'events': count, 'users': users, 'sessions': sessions}
+                for day, count, users, sessions in zip(
+                    daily['day'].to_pylist(), daily['id_count'].to_pylist(),
+                    daily['user_id_count_distinct'].to_pylist(),
+                    daily['session_id_count_distinct'].to_pylist()
+                )
+            ]
+
+        metrics = self._load('performance_metrics', ['metric_name', 'metric_value', 'day'], since_day)
+        if metrics is not None and metrics.num_rows:
+            grouped = metrics.group_by('metric_name').aggregate([
+                ('metric_value', 'mean'),
+                ('metric_value', 'min'),
+                ('metric_value', 'max'),
+                ('metric_value', 'count')
+            ])
+            summary['performance_metrics'] = {
+                name: {
+                    'average': round(avg_value, 2),
+                    'minimum': round(min_value, 2),
+                    'maximum': round(max_value, 2),
+                    'count': count
+                } for name, avg_value, min_value, max_value, count in zip(
+                    grouped['metric_name'].to_pylist(),
+                    grouped['metric_value_mean'].to_pylist(),
+                    grouped['metric_value_min'].to_pylist(),
+                    grouped['metric_value_max'].to_pylist(),
+                    grouped['metric_value_count'].to_pylist()
+                )
+            }
+
+        return summary
@@ -4,20 +4,33 @@ FastAPI Server for N8N Workflow Documentation
 High-performance API with sub-100ms response times.
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict, Any
 import json
 import os
+import sys
 import asyncio
 from pathlib import Path
 import uvicorn
 
 from workflow_db import WorkflowDatabase
+from documentation_cache import DocumentationCache, GUIDE_TYPES
+from instrumentation import instrument_app
+import json_backend
+
+# src/ modules use src/ as their import root; appended so root-level modules keep precedence
+sys.path.append(str(Path(__file__).parent / "src"))
+
+try:
+    from performance_monitor import install_performance_monitor
+except ImportError:
+    # /monitor needs psutil, an optional dependency (see requirements.txt)
+    install_performance_monitor = None
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -36,9 +49,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency/error metrics and the /metrics endpoint
+instrument_app(app)
+
+# /monitor routes, fed by this app's request latency (skipped without psutil)
+if install_performance_monitor:
+    install_performance_monitor(app)
+
 # Initialize database
 db = WorkflowDatabase()
 
+# Guides are rendered on request and cached by workflow content hash
+doc_cache = DocumentationCache()
+
 # Startup function to verify database
 @app.on_event("startup")
 async def startup_event():
@@ -220,8 +243,7 @@ async def get_workflow_detail(filename: str):
             print(f"Warning: File {file_path} not found on filesystem but exists in database")
             raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            raw_json = json.load(f)
+        raw_json = json_backend.load_file(file_path)
         
         return {
             "metadata": workflow_meta,
@@ -278,8 +300,7 @@ async def get_workflow_diagram(filename: str):
             print(f"Warning: Diagram requested for missing file: {file_path}")
             raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_backend.load_file(file_path)
         
         nodes = data.get('nodes', [])
         connections = data.get('connections', {})
@@ -299,6 +320,42 @@ async def get_workflow_diagram(filename: str):
         print(f"Error generating diagram for {filename}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating diagram: {str(e)}")
 
+@app.get("/api/workflows/{filename}/docs/{guide_type}")
+async def get_workflow_guide(filename: str, guide_type: str, request: Request):
+    """Render one documentation guide (Markdown) for a workflow, served from cache when unchanged."""
+    if guide_type not in GUIDE_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown guide type '{guide_type}' (use one of: {', '.join(GUIDE_TYPES)})")
+    try:
+        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
+        if not workflows:
+            raise HTTPException(status_code=404, detail="Workflow not found in database")
+        
+        # The indexed hash serves hot guides without touching the workflow file
+        content_hash = workflows[0].get('file_hash')
+        guides = doc_cache.cached(content_hash) if content_hash else None
+        if guides is None:
+            matching_files = [f for f in Path('workflows').rglob("*.json") if f.name == filename]
+            if not matching_files:
+                print(f"Warning: File {filename} not found in workflows directory")
+                raise HTTPException(status_code=404, detail=f"Workflow file '{filename}' not found on filesystem")
+            guides, content_hash = doc_cache.render(matching_files[0])
+        
+        headers = {
+            "ETag": f'"{content_hash}-{doc_cache.template_version}"',
+            "Cache-Control": "public, max-age=300"
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=guides[guide_type], media_type="text/markdown; charset=utf-8", headers=headers)
+    except HTTPException:
+        raise
+    except json.JSONDecodeError as e:
+        print(f"Error parsing JSON in {filename}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid JSON in workflow file: {str(e)}")
+    except Exception as e:
+        print(f"Error rendering {guide_type} for {filename}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error rendering documentation: {str(e)}")
+
 def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
     """Generate Mermaid.js flowchart code from workflow nodes and connections."""
     if not nodes:
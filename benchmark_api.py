@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+API Benchmark Suite - Load-test the search API against a synthetic catalogue
+Generates N workflows, builds the index and drives api_server in-process with concurrent clients.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+from synthetic_workflows import SyntheticWorkflowGenerator
+
+ENDPOINTS = ('search', 'detail', 'diagram', 'stats', 'category')
+
+SEARCH_TERMS = ['slack', 'telegram', 'sync', 'create', 'webhook', 'openai', 'sheets', 'notion', 'monitor', 'records']
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies_ms: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles for one endpoint run."""
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        'requests': count,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        'mean_ms': round(sum(ordered) / count, 2) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50), 2),
+        'p95_ms': round(percentile(ordered, 0.95), 2),
+        'p99_ms': round(percentile(ordered, 0.99), 2),
+        'max_ms': round(ordered[-1], 2) if ordered else 0.0
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class APIBenchmark:
+    """Benchmark api_server endpoints against a generated workflow catalogue."""
+
+    def __init__(self, workflow_count: int = 10000, concurrency: int = 16, requests_per_endpoint: int = 500,
+                 seed: int = 42, workdir: Optional[str] = None, endpoints=ENDPOINTS):
+        self.workflow_count = workflow_count
+        self.concurrency = concurrency
+        self.requests_per_endpoint = requests_per_endpoint
+        self.seed = seed
+        self.endpoints = tuple(endpoints)
+        self.keep_workdir = workdir is not None
+        self.workdir = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix='n8n-bench-'))
+        self.rng = random.Random(seed)
+        self.filenames: List[str] = []
+        self.service_categories: List[str] = []
+        self.results: Dict[str, Any] = {}
+
+    def prepare(self) -> Dict[str, Any]:
+        """Generate the catalogue (unless already present) and build the index."""
+        workflows_dir = self.workdir / 'workflows'
+        preparation = {}
+
+        if not workflows_dir.exists():
+            print(f"🧪 Generating {self.workflow_count} synthetic workflows in {workflows_dir}...")
+            start = time.perf_counter()
+            generated = SyntheticWorkflowGenerator(seed=self.seed).write_corpus(str(workflows_dir), self.workflow_count)
+            preparation['generate_seconds'] = round(time.perf_counter() - start, 2)
+            preparation['corpus_bytes'] = generated['bytes']
+        else:
+            print(f"♻️  Reusing existing catalogue in {workflows_dir}")
+
+        # api_server resolves workflows/ and its database relative to the working directory
+        os.environ['WORKFLOW_DB_PATH'] = str(self.workdir / 'workflows.db')
+        os.chdir(self.workdir)
+
+        from workflow_db import WorkflowDatabase
+        db = WorkflowDatabase()
+        start = time.perf_counter()
+        index_stats = db.index_all_workflows()
+        preparation['index_seconds'] = round(time.perf_counter() - start, 2)
+        preparation['index'] = index_stats
+
+        import sqlite3
+        conn = sqlite3.connect(db.db_path)
+        self.filenames = [row[0] for row in conn.execute("SELECT filename FROM workflows")]
+        conn.close()
+        self.service_categories = list(db.get_service_categories().keys())
+        preparation['indexed_workflows'] = len(self.filenames)
+
+        print(f"✅ Indexed {len(self.filenames)} workflows in {preparation['index_seconds']}s")
+        return preparation
+
+    def _path_factories(self) -> Dict[str, Callable[[], str]]:
+        rng = self.rng
+        return {
+            'search': lambda: f"/api/workflows?q={rng.choice(SEARCH_TERMS)}&per_page=20",
+            'detail': lambda: f"/api/workflows/{rng.choice(self.filenames)}",
+            'diagram': lambda: f"/api/workflows/{rng.choice(self.filenames)}/diagram",
+            'stats': lambda: "/api/stats",
+            'category': lambda: f"/api/workflows/category/{rng.choice(self.service_categories)}"
+        }
+
+    async def _run_endpoint(self, client, make_path: Callable[[], str]) -> Dict[str, Any]:
+        """Fire requests_per_endpoint requests from ``concurrency`` concurrent clients."""
+        paths = [make_path() for _ in range(self.requests_per_endpoint)]
+        latencies: List[float] = []
+        errors = 0
+        cursor = 0
+
+        async def worker():
+            nonlocal cursor, errors
+            while cursor < len(paths):
+                path = paths[cursor]
+                cursor += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return summarize_latencies(latencies, errors, time.perf_counter() - start)
+
+    async def _drive(self) -> Dict[str, Any]:
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("httpx is required for the API benchmark (pip install httpx)")
+
+        # Imported only now so its module-level database points at the benchmark catalogue
+        import api_server
+
+        factories = self._path_factories()
+        transport = httpx.ASGITransport(app=api_server.app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for endpoint in self.endpoints:
+                # Warm up caches and lazily initialised state before measuring
+                for _ in range(min(10, self.requests_per_endpoint)):
+                    await client.get(factories[endpoint]())
+                print(f"⏱️  {endpoint}: {self.requests_per_endpoint} requests, concurrency {self.concurrency}")
+                results[endpoint] = await self._run_endpoint(client, factories[endpoint])
+        return results
+
+    def run(self) -> Dict[str, Any]:
+        """Prepare the catalogue, run every endpoint and return the JSON-serializable report."""
+        original_cwd = os.getcwd()
+        try:
+            preparation = self.prepare()
+            endpoints = asyncio.run(self._drive())
+        finally:
+            os.chdir(original_cwd)
+            if not self.keep_workdir:
+                shutil.rmtree(self.workdir, ignore_errors=True)
+
+        self.results = {
+            'timestamp': datetime.now().isoformat(),
+            'revision': _git_revision(),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'config': {
+                'workflows': self.workflow_count,
+                'concurrency': self.concurrency,
+                'requests_per_endpoint': self.requests_per_endpoint,
+                'seed': self.seed
+            },
+            'preparation': preparation,
+            'endpoints': endpoints
+        }
+        return self.results
+
+    def save_results(self, output_path: str) -> str:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=2)
+        return output_path
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Percentage change per endpoint for throughput and latency percentiles."""
+    changes = {}
+    for endpoint, stats in current.get('endpoints', {}).items():
+        before = baseline.get('endpoints', {}).get(endpoint)
+        if not before:
+            continue
+        changes[endpoint] = {
+            key: round((stats[key] - before[key]) / before[key] * 100, 1) if before.get(key) else 0.0
+            for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')
+        }
+    return changes
+
+
+def print_report(results: Dict[str, Any], changes: Optional[Dict[str, Dict[str, float]]] = None):
+    print("\n📊 API BENCHMARK RESULTS")
+    print("=" * 78)
+    print(f"{'endpoint':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for endpoint, stats in results['endpoints'].items():
+        print(f"{endpoint:<10} {stats['throughput_rps']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+              f"{stats['p99_ms']:>9} {stats['max_ms']:>9} {stats['errors']:>7}")
+
+    if changes:
+        print("\n📈 Change vs baseline (%)")
+        for endpoint, delta in changes.items():
+            print(f"{endpoint:<10} req/s {delta['throughput_rps']:+.1f}  p50 {delta['p50_ms']:+.1f}  "
+                  f"p95 {delta['p95_ms']:+.1f}  p99 {delta['p99_ms']:+.1f}")
+
+
+def main():
+    """Command-line interface for the API benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the workflow search API')
+    parser.add_argument('--workflows', type=int, default=10000, help='Synthetic workflows to generate')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='Comma-separated endpoints to run')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for corpus and request mix')
+    parser.add_argument('--workdir', help='Keep/reuse the generated catalogue and index in this directory')
+    parser.add_argument('--output', help='Results JSON path (default: benchmark_results/<timestamp>.json)')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)} (choose from {', '.join(ENDPOINTS)})")
+
+    output = os.path.abspath(args.output or os.path.join(
+        'benchmark_results', f"api_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    workdir = os.path.abspath(args.workdir) if args.workdir else None
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    benchmark = APIBenchmark(args.workflows, args.concurrency, args.requests, args.seed, workdir, endpoints)
+    results = benchmark.run()
+
+    changes = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            changes = compare_results(results, json.load(f))
+        results['comparison'] = {'baseline': args.compare, 'change_percent': changes}
+
+    print_report(results, changes)
+    benchmark.save_results(output)
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
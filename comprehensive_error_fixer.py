@@ -17,6 +17,8 @@ import concurrent.futures
 import threading
 from dataclasses import dataclass
 
+from workflow_graph import WorkflowGraph
+
 @dataclass
 class WorkflowError:
     """Error information for a workflow"""
@@ -336,41 +338,20 @@ class ComprehensiveErrorFixer:
         """Check for circular dependencies"""
         errors = []
         connections = workflow_data.get('connections', {})
-        
-        # Simple circular dependency check
-        visited = set()
-        rec_stack = set()
-        
-        def has_cycle(node_id):
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            if node_id in connections:
-                for output_connections in connections[node_id].values():
-                    if isinstance(output_connections, list):
-                        for connection in output_connections:
-                            if isinstance(connection, list):
-                                for conn in connection:
-                                    if isinstance(conn, dict) and 'node' in conn:
-                                        target = conn['node']
-                                        if target not in visited:
-                                            if has_cycle(target):
-                                                return True
-                                        elif target in rec_stack:
-                                            return True
-            
-            rec_stack.remove(node_id)
-            return False
-        
-        for node_id in connections:
-            if node_id not in visited:
-                if has_cycle(node_id):
-                    errors.append(WorkflowError(
-                        error_type='circular_dependency',
-                        severity='high',
-                        description=f'Circular dependency detected involving node: {node_id}',
-                        location=f'connections.{node_id}'
-                    ))
+        if not isinstance(connections, dict):
+            return errors
+        
+        graph = WorkflowGraph(workflow_data.get('nodes', []), connections)
+        for cycle in graph.cycles():
+            # Report the cycle on its first source in connections order, by its actual connections key
+            members = set(cycle)
+            node_id = next((key for name, key in graph.source_keys.items() if name in members), cycle[0])
+            errors.append(WorkflowError(
+                error_type='circular_dependency',
+                severity='high',
+                description=f'Circular dependency detected involving node: {node_id}',
+                location=f'connections.{node_id}'
+            ))
         
         return errors
     
@@ -462,10 +443,10 @@ class ComprehensiveErrorFixer:
             elif error.error_type == 'circular_dependency':
                 # Remove problematic connections
                 if error.location.startswith('connections.'):
-                    node_id = error.location.split('.')[1]
+                    node_id = error.location[len('connections.'):]
                     if node_id in fixed_workflow['connections']:
                         del fixed_workflow['connections'][node_id]
-                fixes_applied.append('Removed circular dependency')
+                        fixes_applied.append('Removed circular dependency')
         
         return fixed_workflow, fixes_applied
     
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Dict, List, Any
 import re
 
+from workflow_corpus import load_workflow
+
 class WorkflowTemplateGenerator:
     """Generate reusable workflow templates from existing workflows"""
     
@@ -47,8 +49,7 @@ class WorkflowTemplateGenerator:
         
         for file_path in json_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = load_workflow(file_path)
                 
                 nodes = data.get('nodes', [])
                 connections = data.get('connections', {})
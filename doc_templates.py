@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Documentation Templates - Precompiled Markdown templates for the workflow guides
+Templates are split into literal text and fields once at import; all four guides render from one shared context.
+"""
+
+from string import Template
+from typing import Any, Dict, List
+
+# Bump when the rendered output changes in a way the source fingerprint cannot see
+TEMPLATE_VERSION = 1
+
+
+class CompiledTemplate:
+    """A ``string.Template`` pre-split into literal chunks and field names; rendering is a single join."""
+
+    def __init__(self, text: str):
+        literals: List[str] = []
+        fields: List[str] = []
+        chunk = []
+        position = 0
+        for match in Template.pattern.finditer(text):
+            chunk.append(text[position:match.start()])
+            position = match.end()
+            if match.group('escaped') is not None:
+                chunk.append('$')
+            elif match.group('invalid') is not None:
+                raise ValueError(f"Invalid placeholder in template at offset {match.start()}")
+            else:
+                literals.append(''.join(chunk))
+                fields.append(match.group('named') or match.group('braced'))
+                chunk = []
+        chunk.append(text[position:])
+        literals.append(''.join(chunk))
+        self.literals = tuple(literals)
+        self.fields = tuple(fields)
+
+    def render(self, context: Dict[str, str]) -> str:
+        parts = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            parts.append(context[field])
+            parts.append(literal)
+        return ''.join(parts)
+
+
+API_DOCS_TEMPLATE = CompiledTemplate("""# API Documentation: $name
+
+## Overview
+$overview
+
+## Workflow Metadata
+- **Total Nodes**: $total_nodes
+- **Complexity Level**: $complexity_level
+- **Estimated Execution Time**: $execution_time_estimate
+- **Error Handling**: $error_handling_status
+
+## Trigger Information
+$trigger_list$webhook_list
+## Node Types Used
+$node_type_list
+## Integrations
+$integration_list
+## Required Credentials
+$credential_list
+## Environment Variables
+$env_var_list""")
+
+USAGE_GUIDE_TEMPLATE = CompiledTemplate("""# Usage Guide: $name
+
+## Quick Start
+
+### Prerequisites
+$usage_credentials$usage_env_vars
+### Deployment Steps
+
+1. **Import Workflow**
+   - Copy the workflow JSON into your n8n instance
+   - Or import directly from the workflow file
+
+2. **Configure Credentials**
+   - Go to Settings > Credentials
+   - Add all required credentials as identified above
+
+3. **Set Environment Variables**
+   - Configure in your n8n environment or `.env` file
+   - Ensure all variables are properly set
+
+4. **Test Workflow**
+   - Run the workflow in test mode
+   - Verify all nodes execute successfully
+   - Check data flow and transformations
+
+5. **Activate Workflow**
+   - Enable the workflow for production use
+   - Monitor execution logs for any issues
+
+## Workflow Flow
+
+This workflow consists of $total_nodes nodes with the following execution flow:
+
+$flow_steps
+## Configuration Options
+
+### Node Configuration
+- Review each node's parameters
+- Update any hardcoded values
+- Configure retry and timeout settings
+
+### Error Handling
+$error_handling_note
+
+### Performance Tuning
+- Monitor execution time: $execution_time_estimate
+- Optimize for your expected data volume
+- Consider rate limiting for external APIs
+
+## Troubleshooting
+
+### Common Issues
+1. **Credential Errors**: Verify all credentials are properly configured
+2. **Environment Variable Issues**: Check that all required variables are set
+3. **Node Execution Failures**: Review node logs for specific error messages
+4. **Data Format Issues**: Ensure input data matches expected format
+
+### Debug Mode
+- Enable debug mode in n8n settings
+- Check execution logs for detailed information
+- Use test data to verify workflow behavior
+
+## Best Practices
+- Regularly monitor workflow execution
+- Set up alerts for failures
+- Keep credentials secure and rotate regularly
+- Test changes in development environment first
+""")
+
+DEPLOYMENT_GUIDE_TEMPLATE = CompiledTemplate("""# Deployment Guide: $name
+
+## Pre-Deployment Checklist
+
+### ✅ Environment Setup
+- [ ] n8n instance is running and accessible
+- [ ] Required credentials are configured
+- [ ] Environment variables are set
+- [ ] Network connectivity to external services
+
+### ✅ Workflow Validation
+- [ ] Workflow JSON is valid
+- [ ] All nodes are properly configured
+- [ ] Connections are correctly established
+- [ ] Error handling is implemented
+
+### ✅ Security Review
+- [ ] No sensitive data in workflow JSON
+- [ ] Credentials use secure storage
+- [ ] Webhook endpoints are secured
+- [ ] Access controls are in place
+
+## Deployment Methods
+
+### Method 1: Direct Import
+1. Copy the workflow JSON
+2. In n8n, go to Workflows > Import
+3. Paste the JSON content
+4. Save and configure credentials
+
+### Method 2: File Upload
+1. Save workflow as `.json` file
+2. Use n8n import functionality
+3. Upload the file
+4. Review and activate
+
+### Method 3: API Deployment
+```bash
+# Example using n8n API
+curl -X POST "http://your-n8n-instance/api/v1/workflows" \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Bearer YOUR_API_KEY" \\
+  -d @workflow.json
+```
+
+## Post-Deployment Configuration
+
+### 1. Credential Setup
+$deployment_credentials
+### 2. Environment Variables
+$deployment_env_vars
+### 3. Webhook Configuration
+$deployment_webhooks
+## Testing & Validation
+
+### 1. Test Execution
+- Run workflow in test mode
+- Verify all nodes execute successfully
+- Check data transformations
+- Validate output format
+
+### 2. Integration Testing
+- Test with real data sources
+- Verify external API connections
+- Check error handling scenarios
+- Monitor performance metrics
+
+### 3. Load Testing
+- Test with expected data volume
+- Monitor execution time
+- Check resource usage
+- Verify scalability
+
+## Monitoring & Maintenance
+
+### Monitoring Setup
+- Enable execution logging
+- Set up performance monitoring
+- Configure error alerts
+- Monitor webhook usage
+
+### Maintenance Tasks
+- Regular credential rotation
+- Update API endpoints if needed
+- Monitor for deprecated nodes
+- Review and optimize performance
+
+### Backup & Recovery
+- Export workflow regularly
+- Backup credential configurations
+- Document custom configurations
+- Test recovery procedures
+
+## Production Considerations
+
+### Security
+- Use HTTPS for webhook endpoints
+- Implement proper authentication
+- Regular security audits
+- Monitor access logs
+
+### Performance
+- Expected execution time: $execution_time_estimate
+- Monitor resource usage
+- Optimize for your data volume
+- Consider rate limiting
+
+### Reliability
+- Implement retry logic
+- Set up monitoring alerts
+- Plan for disaster recovery
+- Regular health checks
+""")
+
+TROUBLESHOOTING_GUIDE_TEMPLATE = CompiledTemplate("""# Troubleshooting Guide: $name
+
+## Common Issues & Solutions
+
+### 1. Workflow Won't Start
+
+#### Issue: No trigger activation
+**Symptoms**: Workflow doesn't execute automatically
+**Solutions**:
+- Check if workflow is active
+- Verify trigger configuration
+- Test trigger manually
+- Check webhook URL accessibility
+
+#### Issue: Credential errors
+**Symptoms**: Nodes fail with authentication errors
+**Solutions**:
+- Verify credentials are properly configured
+- Check credential expiration
+- Test credentials independently
+- Update credential values if needed
+
+### 2. Node Execution Failures
+
+#### Issue: HTTP Request failures
+**Symptoms**: HTTP nodes return error codes
+**Solutions**:
+- Check URL accessibility
+- Verify request format
+- Check authentication headers
+- Review rate limiting
+
+#### Issue: Data format errors
+**Symptoms**: Nodes fail with parsing errors
+**Solutions**:
+- Verify input data format
+- Check data transformations
+- Validate JSON structure
+- Use data validation nodes
+
+#### Issue: API rate limiting
+**Symptoms**: External API calls fail with rate limit errors
+**Solutions**:
+- Implement delay nodes
+- Use batch processing
+- Check API quotas
+- Optimize request frequency
+
+### 3. Performance Issues
+
+#### Issue: Slow execution
+**Symptoms**: Workflow takes longer than expected
+**Solutions**:
+- Monitor node execution times
+- Optimize data transformations
+- Use parallel processing where possible
+- Check external service performance
+
+#### Issue: Memory issues
+**Symptoms**: Workflow fails with memory errors
+**Solutions**:
+- Reduce data volume per execution
+- Use pagination for large datasets
+- Optimize data structures
+- Consider workflow splitting
+
+### 4. Data Flow Issues
+
+#### Issue: Missing data
+**Symptoms**: Expected data not available in nodes
+**Solutions**:
+- Check data source connectivity
+- Verify data filtering logic
+- Review conditional nodes
+- Check data mapping
+
+#### Issue: Incorrect data format
+**Symptoms**: Data doesn't match expected format
+**Solutions**:
+- Add data validation nodes
+- Check data transformations
+- Verify API response format
+- Use data type conversion
+
+## Debugging Techniques
+
+### 1. Enable Debug Mode
+- Go to n8n Settings > Logging
+- Enable debug mode
+- Review detailed execution logs
+- Check node-specific error messages
+
+### 2. Test Individual Nodes
+- Run nodes in isolation
+- Use sample data for testing
+- Verify node configurations
+- Check input/output formats
+
+### 3. Use Execution History
+- Review past executions
+- Compare successful vs failed runs
+- Check execution data
+- Identify patterns in failures
+
+### 4. Monitor External Services
+- Check API status pages
+- Verify service availability
+- Monitor response times
+- Check error rates
+
+## Error Codes Reference
+
+### HTTP Status Codes
+- **400**: Bad Request - Check request format
+- **401**: Unauthorized - Verify credentials
+- **403**: Forbidden - Check permissions
+- **404**: Not Found - Verify URL/endpoint
+- **429**: Too Many Requests - Implement rate limiting
+- **500**: Internal Server Error - Check external service
+
+### n8n Specific Errors
+- **Credential Error**: Authentication issue
+- **Data Error**: Format or validation issue
+- **Connection Error**: Network or service unavailable
+- **Execution Error**: Node configuration issue
+
+## Prevention Strategies
+
+### 1. Proactive Monitoring
+- Set up execution monitoring
+- Configure error alerts
+- Monitor performance metrics
+- Track usage patterns
+
+### 2. Regular Maintenance
+- Update credentials regularly
+- Review and test workflows
+- Monitor for deprecated features
+- Keep documentation current
+
+### 3. Testing Procedures
+- Test with various data scenarios
+- Verify error handling
+- Check edge cases
+- Validate recovery procedures
+
+### 4. Documentation
+- Keep troubleshooting guides updated
+- Document known issues
+- Record solutions for common problems
+- Maintain change logs
+
+## Getting Help
+
+### Self-Help Resources
+- n8n Documentation: https://docs.n8n.io
+- Community Forum: https://community.n8n.io
+- GitHub Issues: https://github.com/n8n-io/n8n/issues
+
+### Support Contacts
+- Check your n8n support plan
+- Contact system administrator
+- Escalate to technical team
+- Use vendor support channels
+
+## Emergency Procedures
+
+### Workflow Recovery
+1. Disable workflow immediately
+2. Check system resources
+3. Review error logs
+4. Restore from backup if needed
+5. Test in isolated environment
+6. Re-enable with monitoring
+
+### Data Recovery
+1. Check execution history
+2. Identify failed executions
+3. Re-run with corrected data
+4. Verify data integrity
+5. Update downstream systems
+""")
+
+GUIDE_TEMPLATES = {
+    'api_docs': API_DOCS_TEMPLATE,
+    'usage_guide': USAGE_GUIDE_TEMPLATE,
+    'deployment_guide': DEPLOYMENT_GUIDE_TEMPLATE,
+    'troubleshooting_guide': TROUBLESHOOTING_GUIDE_TEMPLATE
+}
+
+
+def _items(values, line: str, empty: str = '') -> str:
+    """One formatted line per value, or ``empty`` when there are none."""
+    if not values:
+        return empty
+    return ''.join(line.format(value) for value in values)
+
+
+def build_context(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """Every field the guides use, computed once from ``extract_workflow_metadata`` output."""
+    triggers = metadata['trigger_types']
+    integrations = metadata['integrations']
+    credentials = metadata['credentials_needed']
+    env_vars = metadata['environment_variables']
+    endpoints = metadata['webhook_endpoints']
+
+    flow_steps = ''
+    if triggers:
+        flow_steps += f"1. **Trigger**: Workflow starts with {', '.join(triggers)}\n"
+    flow_steps += f"2. **Processing**: Data flows through {metadata['total_nodes'] - len(triggers)} processing nodes\n"
+    if integrations:
+        flow_steps += f"3. **Integration**: Connects with {', '.join(integrations)}\n"
+
+    return {
+        'name': f"{metadata['name']}",
+        'overview': f"{metadata['description'] or 'Automated workflow for data processing and integration.'}",
+        'total_nodes': f"{metadata['total_nodes']}",
+        'complexity_level': metadata['complexity_level'].title(),
+        'execution_time_estimate': f"{metadata['execution_time_estimate']}",
+        'error_handling_status': '✅ Implemented' if metadata['error_handling'] else '❌ Not implemented',
+        'error_handling_note': ('✅ This workflow includes error handling nodes' if metadata['error_handling']
+                                else '⚠️ Consider adding error handling nodes'),
+
+        # API documentation
+        'trigger_list': "### Trigger Types\n" + _items(
+            triggers, "- `{}`\n", "- Manual trigger (no automatic triggers configured)\n"),
+        'webhook_list': ("\n### Webhook Endpoints\n" + ''.join(
+            f"- **Path**: `{endpoint['path']}`\n- **Method**: `{endpoint['method']}`\n"
+            f"- **Webhook ID**: `{endpoint['id']}`\n\n" for endpoint in endpoints)) if endpoints else '',
+        'node_type_list': _items(metadata['node_types'], "- `{}`\n"),
+        'integration_list': _items(integrations, "- {}\n", "- No external integrations detected\n"),
+        'credential_list': _items(credentials, "- `{}`\n", "- No credentials required\n"),
+        'env_var_list': _items(env_vars, "- `{}`\n", "- No environment variables required\n"),
+
+        # Usage guide
+        'usage_credentials': ("1. **Configure Credentials**: Set up the following credentials in n8n:\n"
+                              + _items(credentials, "   - {}\n")) if credentials else '',
+        'usage_env_vars': ("\n2. **Set Environment Variables**: Configure these environment variables:\n"
+                           + _items(env_vars, "   - `{}`\n")) if env_vars else '',
+        'flow_steps': flow_steps,
+
+        # Deployment guide
+        'deployment_credentials': ("Configure these credentials in n8n:\n" + ''.join(
+            f"- **{credential}**: [Instructions for setting up {credential}]\n" for credential in credentials)
+        ) if credentials else "No credentials required for this workflow.\n",
+        'deployment_env_vars': ("Set these environment variables:\n" + _items(
+            env_vars, "- `{}`: [Description of what this variable should contain]\n")
+        ) if env_vars else "No environment variables required.\n",
+        'deployment_webhooks': ("Configure webhook endpoints:\n" + ''.join(
+            f"- **Path**: `{endpoint['path']}`\n- **Method**: `{endpoint['method']}`\n"
+            f"- **URL**: `https://your-n8n-instance/webhook/{endpoint['path']}`\n\n" for endpoint in endpoints)
+        ) if endpoints else "No webhook endpoints to configure.\n"
+    }
+
+
+def render_guides(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """All four guides rendered from one shared context."""
+    context = build_context(metadata)
+    return {guide: template.render(context) for guide, template in GUIDE_TEMPLATES.items()}
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Documentation Cache - On-demand workflow guide rendering with memory and disk caches
+Rendered guides are keyed by workflow content hash and template version, so a cached guide is never stale.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import json_backend
+from doc_templates import GUIDE_TEMPLATES, TEMPLATE_VERSION, render_guides
+from validation_store import rules_version
+from workflow_documentation_generator import WorkflowDocumentationGenerator
+from workflow_writer import write_atomic
+
+GUIDE_TYPES = tuple(GUIDE_TEMPLATES)
+
+DEFAULT_RENDER_CACHE_DIR = '.documentation_render_cache'
+DEFAULT_MEMORY_ENTRIES = 256
+
+
+class DocumentationCache:
+    """All four guides of a workflow, rendered once per content hash.
+
+    Lookups go memory (LRU of ``max_entries`` workflows) -> disk (one JSON
+    file per content hash and template version) -> render. Editing the
+    templates or the metadata extraction changes the version, so older
+    entries are never served and are removed from disk on start-up.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or os.environ.get('WORKFLOW_DOCS_RENDER_CACHE', DEFAULT_RENDER_CACHE_DIR))
+        if max_entries is None:
+            max_entries = int(os.environ.get('WORKFLOW_DOCS_MEMORY_ENTRIES', DEFAULT_MEMORY_ENTRIES))
+        self.max_entries = max_entries
+        self.template_version = rules_version(TEMPLATE_VERSION, 'doc_templates', 'workflow_documentation_generator')
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'rendered': 0}
+        self._entries: 'OrderedDict[str, Dict[str, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._generator = WorkflowDocumentationGenerator()
+        self._remove_stale_versions()
+
+    def _remove_stale_versions(self):
+        if not self.cache_dir.is_dir():
+            return
+        suffix = f"-{self.template_version}.json"
+        for entry in self.cache_dir.glob('*.json'):
+            if not entry.name.endswith(suffix):
+                try:
+                    entry.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _disk_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}-{self.template_version}.json"
+
+    def _remember(self, content_hash: str, guides: Dict[str, str]):
+        with self._lock:
+            self._entries[content_hash] = guides
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, content_hash: str) -> Optional[Dict[str, str]]:
+        """Guides for ``content_hash`` from memory or disk, or None if it was never rendered."""
+        with self._lock:
+            guides = self._entries.get(content_hash)
+            if guides is not None:
+                self._entries.move_to_end(content_hash)
+                self.stats['memory_hits'] += 1
+                return guides
+
+        try:
+            guides = json.loads(self._disk_path(content_hash).read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+        self.stats['disk_hits'] += 1
+        self._remember(content_hash, guides)
+        return guides
+
+    def render(self, workflow_path: Union[str, Path]) -> Tuple[Dict[str, str], str]:
+        """(guides, content hash) for the workflow file as it is on disk now."""
+        raw = Path(workflow_path).read_bytes()
+        content_hash = hashlib.md5(raw).hexdigest()
+        guides = self.cached(content_hash)
+        if guides is not None:
+            return guides, content_hash
+
+        metadata = self._generator.extract_workflow_metadata(json_backend.loads(raw))
+        guides = render_guides(metadata)
+        self.stats['rendered'] += 1
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self._disk_path(content_hash), json.dumps(guides, ensure_ascii=False).encode('utf-8'))
+        self._remember(content_hash, guides)
+        return guides, content_hash
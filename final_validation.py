@@ -15,6 +15,13 @@ import concurrent.futures
 import threading
 from dataclasses import dataclass
 
+from parallel_workflows import process_map, DEFAULT_CHUNK_SIZE
+from validation_store import ValidationStore, rules_version
+from workflow_corpus import load_workflow
+
+# Bump when a check changes in a way the source fingerprint cannot see
+VALIDATION_RULES_VERSION = 1
+
 @dataclass
 class ValidationResult:
     """Validation result for a workflow"""
@@ -28,11 +35,23 @@ class ValidationResult:
 class FinalValidator:
     """Final validator for n8n workflows"""
     
-    def __init__(self, workflows_dir="C:\\Users\\sahii\\OneDrive\\Saved Games\\Microsoft Edge Drop Files\\Documents\\Cline\\n8n-workflows\\workflows", max_workers=8):
+    def __init__(self, workflows_dir="C:\\Users\\sahii\\OneDrive\\Saved Games\\Microsoft Edge Drop Files\\Documents\\Cline\\n8n-workflows\\workflows", max_workers=8, use_processes=True, chunk_size=DEFAULT_CHUNK_SIZE, incremental=True, store_path=None):
         self.workflows_dir = Path(workflows_dir)
         self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.chunk_size = chunk_size
+        self.incremental = incremental
+        self.store_path = store_path
+        self._store = None
         self.validation_stats = defaultdict(int)
         self.thread_lock = threading.Lock()
+    
+    def get_validation_store(self) -> ValidationStore:
+        """Stored results for this validator's current rule set (opened on first use)"""
+        if self._store is None:
+            self._store = ValidationStore('final_validation', rules_version(VALIDATION_RULES_VERSION, __name__),
+                                          self.store_path)
+        return self._store
         
     def validate_workflow(self, workflow_data: Dict) -> ValidationResult:
         """Comprehensive validation of a workflow"""
@@ -320,25 +339,12 @@ class FinalValidator:
     def validate_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
         """Validate a single workflow"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                workflow_data = json.load(f)
+            workflow_data = load_workflow(workflow_path)
             
             # Validate workflow
             validation_result = self.validate_workflow(workflow_data)
             
-            # Update statistics
-            with self.thread_lock:
-                self.validation_stats['total_workflows'] += 1
-                if validation_result.is_valid:
-                    self.validation_stats['valid_workflows'] += 1
-                if validation_result.is_active:
-                    self.validation_stats['active_workflows'] += 1
-                if validation_result.is_production_ready:
-                    self.validation_stats['production_ready_workflows'] += 1
-                
-                self.validation_stats[f'{validation_result.category}_workflows'] += 1
-            
-            return {
+            result = {
                 'filename': workflow_path.name,
                 'category': workflow_path.parent.name,
                 'is_valid': validation_result.is_valid,
@@ -351,15 +357,32 @@ class FinalValidator:
             }
             
         except Exception as e:
-            with self.thread_lock:
-                self.validation_stats['failed_workflows'] += 1
-            
-            return {
+            result = {
                 'filename': workflow_path.name,
                 'category': workflow_path.parent.name,
                 'error': str(e),
                 'success': False
             }
+        
+        self.record_stats(result)
+        return result
+    
+    def record_stats(self, result: Dict[str, Any]):
+        """Count a validation result (fresh or reused from the store) in the statistics"""
+        with self.thread_lock:
+            if not result['success']:
+                self.validation_stats['failed_workflows'] += 1
+                return
+            
+            self.validation_stats['total_workflows'] += 1
+            if result['is_valid']:
+                self.validation_stats['valid_workflows'] += 1
+            if result['is_active']:
+                self.validation_stats['active_workflows'] += 1
+            if result['is_production_ready']:
+                self.validation_stats['production_ready_workflows'] += 1
+            
+            self.validation_stats[f"{result['category']}_workflows"] += 1
     
     def validate_all_workflows(self) -> Dict[str, Any]:
         """Validate all workflows"""
@@ -375,33 +398,66 @@ class FinalValidator:
         
         print(f"📊 Found {len(workflow_files)} workflows to validate")
         
-        # Process workflows in parallel
+        # Reuse stored results for files whose content and rule set are unchanged
+        store = self.get_validation_store()
         validation_results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_workflow = {
-                executor.submit(self.validate_single_workflow, workflow_file): workflow_file 
-                for workflow_file in workflow_files
-            }
+        changed_files = []
+        file_hashes = {}
+        for workflow_file in workflow_files:
+            result, hash_value = store.lookup(workflow_file) if self.incremental else (None, None)
+            if result is None:
+                changed_files.append(workflow_file)
+                file_hashes[workflow_file] = hash_value
+            else:
+                self.record_stats(result)
+                validation_results.append(result)
+        
+        print(f"♻️ Reusing {len(validation_results)} stored results, validating {len(changed_files)} workflows")
+        
+        # Process workflows in parallel
+        if self.use_processes:
+            # CPU-bound work: one process per core, per-worker stats merged into this instance
+            results = process_map(self, 'validate_single_workflow', changed_files,
+                                  {'workflows_dir': self.workflows_dir}, ('validation_stats',),
+                                  self.max_workers, self.chunk_size)
+            for completed, (workflow_file, result) in enumerate(zip(changed_files, results), 1):
+                # Failures may be transient (I/O, a lost worker), so only successes are stored
+                if result.get('success', False):
+                    store.store(workflow_file, result, file_hashes[workflow_file])
+                validation_results.append(result)
+                if completed % 100 == 0:
+                    print(f"🔍 Validated {completed}/{len(changed_files)} workflows...")
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_workflow = {
+                    executor.submit(self.validate_single_workflow, workflow_file): workflow_file 
+                    for workflow_file in changed_files
+                }
             
-            completed = 0
-            for future in concurrent.futures.as_completed(future_to_workflow):
-                workflow_file = future_to_workflow[future]
-                try:
-                    result = future.result()
-                    validation_results.append(result)
-                    completed += 1
+                completed = 0
+                for future in concurrent.futures.as_completed(future_to_workflow):
+                    workflow_file = future_to_workflow[future]
+                    try:
+                        result = future.result()
+                        if result.get('success', False):
+                            store.store(workflow_file, result, file_hashes[workflow_file])
+                        validation_results.append(result)
+                        completed += 1
                     
-                    if completed % 100 == 0:
-                        print(f"🔍 Validated {completed}/{len(workflow_files)} workflows...")
+                        if completed % 100 == 0:
+                            print(f"🔍 Validated {completed}/{len(changed_files)} workflows...")
                         
-                except Exception as e:
-                    print(f"❌ Error validating {workflow_file.name}: {e}")
-                    validation_results.append({
-                        'filename': workflow_file.name,
-                        'category': workflow_file.parent.name,
-                        'error': str(e),
-                        'success': False
-                    })
+                    except Exception as e:
+                        print(f"❌ Error validating {workflow_file.name}: {e}")
+                        validation_results.append({
+                            'filename': workflow_file.name,
+                            'category': workflow_file.parent.name,
+                            'error': str(e),
+                            'success': False
+                        })
+        
+        store.prune(self.workflows_dir)
+        store.flush()
         
         # Calculate final statistics
         successful_validations = sum(1 for r in validation_results if r.get('success', False))
@@ -420,6 +476,21 @@ class FinalValidator:
             'results': validation_results
         }
     
+    def load_stored_results(self) -> Dict[str, Any]:
+        """Rebuild the validation results from the store without re-validating"""
+        self.validation_stats = defaultdict(int)
+        results = list(self.get_validation_store().iter_results(self.workflows_dir))
+        for result in results:
+            self.record_stats(result)
+        successful_validations = sum(1 for r in results if r.get('success', False))
+        return {
+            'total_workflows': len(results),
+            'successful_validations': successful_validations,
+            'failed_validations': len(results) - successful_validations,
+            'validation_stats': dict(self.validation_stats),
+            'results': results
+        }
+    
     def generate_validation_report(self, validation_results: Dict[str, Any]):
         """Generate comprehensive validation report"""
         print("\n" + "="*80)
@@ -496,14 +567,33 @@ class FinalValidator:
 
 def main():
     """Main final validation function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Final validator for n8n workflows')
+    parser.add_argument('--dir', help='Workflows directory')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parallel workers (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Workflows per worker task')
+    parser.add_argument('--threads', action='store_true', help='Use a thread pool instead of worker processes')
+    parser.add_argument('--full', action='store_true', help='Re-validate every workflow, ignoring stored results')
+    parser.add_argument('--from-store', action='store_true', help='Report from stored results without validating')
+    parser.add_argument('--store', help='Validation results database (default: .validation_cache.db)')
+    args = parser.parse_args()
+    
     print("🔍 Final Validator for n8n Workflows")
     print("🎯 Target: Error-free, active, production-ready workflows")
     print("=" * 60)
     
-    validator = FinalValidator()
+    options = {'max_workers': args.workers, 'use_processes': not args.threads, 'chunk_size': args.chunk_size,
+               'incremental': not args.full, 'store_path': args.store}
+    if args.dir:
+        options['workflows_dir'] = args.dir
+    validator = FinalValidator(**options)
     
     # Run final validation
-    validation_results = validator.validate_all_workflows()
+    if args.from_store:
+        validation_results = validator.load_stored_results()
+    else:
+        validation_results = validator.validate_all_workflows()
     
     # Generate comprehensive report
     validator.generate_validation_report(validation_results)
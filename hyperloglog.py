@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HyperLogLog cardinality sketches
+Small, mergeable estimators for distinct counts (unique users, sessions).
+"""
+
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimator with 2**precision registers.
+
+    The standard error is roughly 1.04 / sqrt(2**precision), e.g. ~1.6% at
+    precision 12 (4 KB of registers) and ~0.8% at precision 14.
+    """
+
+    def __init__(self, precision: int = 12, registers: Optional[bytearray] = None):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            registers = bytearray(self.size)
+        elif len(registers) != self.size:
+            raise ValueError("register count does not match precision")
+        self.registers = registers
+
+    @staticmethod
+    def _hash(value) -> int:
+        """64-bit hash of a value's string form."""
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    def add(self, value) -> None:
+        """Add a value to the sketch (None is ignored, like COUNT(DISTINCT))."""
+        if value is None:
+            return
+        x = self._hash(value)
+        index = x >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        w = x & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - w.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable) -> None:
+        """Add several values."""
+        for value in values:
+            self.add(value)
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = self.size
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        elif m == 64:
+            alpha = 0.709
+        elif m == 32:
+            alpha = 0.697
+        else:
+            alpha = 0.673
+
+        total = 0.0
+        zeros = 0
+        for register in self.registers:
+            total += 2.0 ** -register
+            if register == 0:
+                zeros += 1
+
+        estimate = alpha * m * m / total
+        # Small-range correction: linear counting is more accurate here
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def reduce_precision(self, precision: int) -> 'HyperLogLog':
+        """Return an equivalent sketch with fewer registers."""
+        if precision > self.precision:
+            raise ValueError("cannot increase the precision of an existing sketch")
+        if precision == self.precision:
+            return self.copy()
+
+        shift = self.precision - precision
+        low_mask = (1 << shift) - 1
+        reduced = HyperLogLog(precision)
+        for index, register in enumerate(self.registers):
+            if not register:
+                continue
+            # Index bits dropped from the bucket number become the leading bits of the rank
+            low_bits = index & low_mask
+            if low_bits:
+                rank = shift - low_bits.bit_length() + 1
+            else:
+                rank = shift + register
+            target = index >> shift
+            if rank > reduced.registers[target]:
+                reduced.registers[target] = rank
+        return reduced
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Merge another sketch into this one in place, folding to the lower precision."""
+        if other.precision < self.precision:
+            folded = self.reduce_precision(other.precision)
+            self.precision, self.size, self.registers = folded.precision, folded.size, folded.registers
+        elif other.precision > self.precision:
+            other = other.reduce_precision(self.precision)
+
+        registers = self.registers
+        for index, register in enumerate(other.registers):
+            if register > registers[index]:
+                registers[index] = register
+        return self
+
+    def copy(self) -> 'HyperLogLog':
+        """Return an independent copy."""
+        return HyperLogLog(self.precision, bytearray(self.registers))
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact blob (precision byte + compressed registers)."""
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> 'HyperLogLog':
+        """Load a sketch produced by ``to_bytes``."""
+        precision = blob[0]
+        return cls(precision, bytearray(zlib.decompress(blob[1:])))
+
+    def __len__(self) -> int:
+        return self.count()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Index Profiler - Per-stage timings for WorkflowDatabase.index_all_workflows
+Wall/CPU time and bytes read per stage, plus the slowest files of a run.
+"""
+
+import heapq
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+# Stages in pipeline order (used to order the report)
+STAGES = ('lookup', 'hash', 'read', 'parse', 'analyze_nodes', 'describe', 'db_write', 'commit')
+
+
+class StageStats:
+    """Accumulated exclusive time for one stage."""
+
+    __slots__ = ('calls', 'wall', 'cpu', 'bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes = 0
+
+
+class IndexProfiler:
+    """Collect per-stage and per-file costs of an indexing run.
+
+    Stage times are exclusive: time spent in a nested stage (e.g. hashing
+    inside file analysis) is attributed to that stage only.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.stages: Dict[str, StageStats] = {}
+        self.slowest: List[Tuple[float, float, int, str]] = []
+        self.files = 0
+        self.run_wall = 0.0
+        self.run_cpu = 0.0
+        self._stack: List[List[float]] = []
+        self._file: Optional[List[Any]] = None
+
+    def _enter(self):
+        self._stack.append([time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def _exit(self, name: str, size: int = 0):
+        start_wall, start_cpu, child_wall, child_cpu = self._stack.pop()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        stats.calls += 1
+        stats.wall += wall - child_wall
+        stats.cpu += cpu - child_cpu
+        stats.bytes += size
+
+        if self._stack:
+            self._stack[-1][2] += wall
+            self._stack[-1][3] += cpu
+        if self._file is not None:
+            self._file[2] += size
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of code as ``name``."""
+        self._enter()
+        try:
+            yield
+        finally:
+            self._exit(name)
+
+    def wrap(self, name: str, func: Callable, size_of: Optional[Callable[..., int]] = None) -> Callable:
+        """Wrap ``func`` so each call is timed as ``name``; ``size_of(result, *args)`` gives bytes read."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self._enter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                size = 0
+                if size_of is not None:
+                    try:
+                        size = size_of(result, *args)
+                    except (OSError, TypeError):
+                        size = 0
+                self._exit(name, size)
+        return wrapper
+
+    def begin_run(self):
+        self._run_start = (time.perf_counter(), time.process_time())
+
+    def end_run(self):
+        self.run_wall = time.perf_counter() - self._run_start[0]
+        self.run_cpu = time.process_time() - self._run_start[1]
+
+    def begin_file(self, file_path: str):
+        self._file = [file_path, time.perf_counter(), 0]
+
+    def end_file(self):
+        if self._file is None:
+            return
+        file_path, start, size = self._file
+        self._file = None
+        self.files += 1
+        entry = (time.perf_counter() - start, size, file_path)
+        # Min-heap of the N slowest files seen so far
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def instrument(self, db) -> 'IndexProfiler':
+        """Route a WorkflowDatabase instance's stage methods through the profiler."""
+        file_size = lambda result, file_path: os.path.getsize(file_path)
+        db.get_file_hash = self.wrap('hash', db.get_file_hash, file_size)
+        db._read_workflow_file = self.wrap('read', db._read_workflow_file, lambda result, *args: len(result or b''))
+        db._parse_workflow_json = self.wrap('parse', db._parse_workflow_json)
+        db.analyze_nodes = self.wrap('analyze_nodes', db.analyze_nodes)
+        db.generate_description = self.wrap('describe', db.generate_description)
+        db._stored_file_hash = self.wrap('lookup', db._stored_file_hash)
+        db._upsert_workflow = self.wrap('db_write', db._upsert_workflow)
+        db.profiler = self
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        """Stage breakdown and slowest files as a JSON-friendly dict."""
+        measured = sum(stats.wall for stats in self.stages.values())
+        order = [name for name in STAGES if name in self.stages] + \
+                [name for name in self.stages if name not in STAGES]
+        stages = {}
+        for name in order:
+            stats = self.stages[name]
+            stages[name] = {
+                'calls': stats.calls,
+                'wall_seconds': round(stats.wall, 4),
+                'cpu_seconds': round(stats.cpu, 4),
+                'percent_of_wall': round(stats.wall / self.run_wall * 100, 1) if self.run_wall else 0.0,
+                'bytes_read': stats.bytes
+            }
+        return {
+            'files': self.files,
+            'wall_seconds': round(self.run_wall, 3),
+            'cpu_seconds': round(self.run_cpu, 3),
+            'files_per_second': round(self.files / self.run_wall, 1) if self.run_wall else 0.0,
+            'unattributed_seconds': round(max(0.0, self.run_wall - measured), 4),
+            'stages': stages,
+            'slowest_files': [
+                {'file': path, 'wall_ms': round(wall * 1000, 2), 'bytes_read': size}
+                for wall, size, path in sorted(self.slowest, reverse=True)
+            ]
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(f"\n⏱️  INDEXER PROFILE: {report['files']} files in {report['wall_seconds']}s "
+              f"(cpu {report['cpu_seconds']}s, {report['files_per_second']} files/s)")
+        print("=" * 72)
+        print(f"{'stage':<15} {'calls':>8} {'wall s':>10} {'cpu s':>10} {'% wall':>8} {'MB read':>10}")
+        for name, stats in report['stages'].items():
+            print(f"{name:<15} {stats['calls']:>8} {stats['wall_seconds']:>10.3f} {stats['cpu_seconds']:>10.3f} "
+                  f"{stats['percent_of_wall']:>8.1f} {stats['bytes_read'] / 1024 / 1024:>10.2f}")
+        print(f"{'(other)':<15} {'':>8} {report['unattributed_seconds']:>10.3f}")
+
+        if report['slowest_files']:
+            print(f"\n🐢 Slowest {len(report['slowest_files'])} files:")
+            for entry in report['slowest_files']:
+                print(f"  {entry['wall_ms']:>9.2f} ms  {entry['bytes_read'] / 1024:>8.1f} KB  {entry['file']}")
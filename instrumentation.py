@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Instrumentation - Process metrics in OpenMetrics text format
+Shared counters, gauges and histograms plus a /metrics endpoint for the API servers.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Any, Optional, Tuple
+
+from request_metrics import LATENCY_BUCKETS_MS, RequestMetrics, RequestMetricsMiddleware, request_metrics
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds; tuned for SQLite queries and recommendation scoring
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named metric family with optional labels."""
+
+    metric_type = 'unknown'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _labels(self, key: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def header(self) -> List[str]:
+        return [f"# TYPE {self.name} {self.metric_type}", f"# HELP {self.name} {_escape(self.documentation)}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}_total{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(Metric):
+    """Fixed-bucket distribution of observed values (seconds by convention)."""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def time(self, **labels) -> '_Timer':
+        """Context manager that observes the elapsed wall time."""
+        return _Timer(self, labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+
+        lines = []
+        for key, counts, total in items:
+            labels = self._labels(key)
+            lines.extend(_histogram_lines(self.name, labels, self.buckets, counts, total))
+        return lines
+
+
+def _histogram_lines(name: str, labels: Dict[str, str], bounds, counts: List[int], total: float) -> List[str]:
+    """Cumulative _bucket/_count/_sum samples for one histogram series."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(bounds) + [float('inf')], counts):
+        cumulative += count
+        bucket_labels = dict(labels, le=_format_value(float(bound)))
+        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(float(total))}")
+    return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator form of ``histogram.time()``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self, requests: Optional[RequestMetrics] = None):
+        self.requests = requests or request_metrics
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _request_lines(self) -> List[str]:
+        """HTTP metrics from the request middleware's per-route counters."""
+        bounds = [bound / 1000 for bound in LATENCY_BUCKETS_MS]
+        requests = ["# TYPE http_requests counter", "# HELP http_requests HTTP requests handled, by route"]
+        errors = ["# TYPE http_request_errors counter", "# HELP http_request_errors HTTP requests that returned 5xx"]
+        latency = ["# TYPE http_request_duration_seconds histogram",
+                   "# HELP http_request_duration_seconds HTTP request latency, by route"]
+
+        for route, stats in list(self.requests.routes.items()):
+            buckets, count, route_errors, total_ms = stats.snapshot()
+            method, _, path = route.partition(' ')
+            labels = {'method': method, 'route': path} if path else {'method': '', 'route': route}
+            requests.append(f"http_requests_total{_format_labels(labels)} {count}")
+            errors.append(f"http_request_errors_total{_format_labels(labels)} {route_errors}")
+            latency.extend(_histogram_lines('http_request_duration_seconds', labels, bounds, buckets, total_ms / 1000))
+
+        in_flight = ["# TYPE http_requests_in_flight gauge",
+                     "# HELP http_requests_in_flight HTTP requests currently being served",
+                     f"http_requests_in_flight {self.requests.in_flight}"]
+        return requests + errors + latency + in_flight
+
+    def _cache_ratio_lines(self) -> List[str]:
+        """Hit ratio per cache, derived from the cache_requests counter."""
+        lookups = self._metrics.get('cache_requests')
+        if lookups is None:
+            return []
+        totals: Dict[str, List[float]] = {}
+        for (cache, result), value in list(lookups._values.items()):
+            hits_and_total = totals.setdefault(cache, [0, 0])
+            hits_and_total[1] += value
+            if result == 'hit':
+                hits_and_total[0] += value
+        if not totals:
+            return []
+        lines = ["# TYPE cache_hit_ratio gauge", "# HELP cache_hit_ratio Fraction of cache lookups that were hits"]
+        for cache, (hits, total) in totals.items():
+            ratio = hits / total if total else 0.0
+            lines.append(f"cache_hit_ratio{_format_labels({'cache': cache})} {_format_value(round(ratio, 4))}")
+        return lines
+
+    def render(self) -> str:
+        """Render every metric in OpenMetrics text exposition format."""
+        lines = self._request_lines()
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        lines.extend(self._cache_ratio_lines())
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry and the metrics the shared code paths record into
+registry = MetricsRegistry()
+
+DB_QUERY_SECONDS = registry.histogram(
+    'workflow_db_query_duration_seconds', 'Time spent in WorkflowDatabase queries', ('operation',)
+)
+CACHE_REQUESTS = registry.counter(
+    'cache_requests', 'Cache lookups by cache name and result (hit/miss)', ('cache', 'result')
+)
+INDEX_GENERATION = registry.gauge(
+    'workflow_index_generation', 'Number of completed index runs in this process'
+)
+INDEX_LAST_COMPLETED = registry.gauge(
+    'workflow_index_last_completed_timestamp_seconds', 'Unix time the last index run finished'
+)
+INDEXER_FILES = registry.counter(
+    'workflow_indexer_files', 'Workflow files handled by the indexer, by result', ('result',)
+)
+INDEXER_RUN_SECONDS = registry.histogram(
+    'workflow_indexer_run_duration_seconds', 'Wall time of complete index runs',
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+RECOMMENDATION_SECONDS = registry.histogram(
+    'recommendation_duration_seconds', 'Time spent generating recommendations', ('strategy',)
+)
+
+
+def instrument_app(app, metrics_registry: Optional[MetricsRegistry] = None, path: str = "/metrics"):
+    """Add request timing middleware and an OpenMetrics endpoint to a FastAPI app."""
+    from fastapi.responses import Response
+
+    metrics_registry = metrics_registry or registry
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics_registry.requests)
+
+    @app.get(path, include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(content=metrics_registry.render(), media_type=OPENMETRICS_CONTENT_TYPE)
+
+    return app
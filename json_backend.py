@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+JSON Backend - Fast workflow JSON parsing with a stdlib fallback
+Uses orjson or pysimdjson when installed; set WORKFLOW_JSON_BACKEND=json|orjson|simdjson to choose.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+BACKENDS = ('orjson', 'simdjson', 'json')
+
+# Fields kept by the partial (indexing) parse
+SUMMARY_KEYS = ('id', 'name', 'active', 'tags', 'createdAt', 'updatedAt', 'description')
+NODE_SUMMARY_KEYS = ('type', 'name')
+
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+def _available(name: str) -> bool:
+    return {'orjson': orjson, 'simdjson': simdjson, 'json': json}.get(name) is not None
+
+
+def _select_backend(requested: str = None) -> str:
+    requested = (requested or 'auto').lower()
+    if requested != 'auto':
+        if requested in BACKENDS and _available(requested):
+            return requested
+        print(f"⚠️  JSON backend '{requested}' is not available, falling back to auto-detection")
+    for name in BACKENDS:
+        if _available(name):
+            return name
+    return 'json'
+
+
+backend = _select_backend(os.environ.get('WORKFLOW_JSON_BACKEND'))
+
+
+def set_backend(name: str) -> str:
+    """Switch the process-wide backend ('auto' picks the fastest installed one)."""
+    global backend
+    backend = _select_backend(name)
+    return backend
+
+
+def _stdlib_loads(data: JSONInput) -> Any:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        # Same decoding as open(path, encoding='utf-8'): invalid bytes raise UnicodeDecodeError
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def loads(data: JSONInput) -> Any:
+    """Parse a JSON document.
+
+    Documents the fast parsers reject (NaN literals, a UTF-8 BOM, invalid
+    UTF-8) are re-parsed with the stdlib, so results and exception types
+    (json.JSONDecodeError, UnicodeDecodeError) match plain ``json.loads``.
+    """
+    if backend == 'orjson':
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    elif backend == 'simdjson':
+        try:
+            return simdjson.loads(data)
+        except ValueError:
+            pass
+    return _stdlib_loads(data)
+
+
+def load(fp) -> Any:
+    """Parse JSON from an open file (text or binary)."""
+    return loads(fp.read())
+
+
+def load_file(path: Union[str, os.PathLike]) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def summarize_workflow(document: Any) -> Any:
+    """Project a parsed workflow down to top-level metadata, nodes[].type/name and connections."""
+    if not isinstance(document, dict):
+        return document
+
+    summary = {key: document[key] for key in SUMMARY_KEYS if key in document}
+    nodes = document.get('nodes')
+    if isinstance(nodes, list):
+        summary['nodes'] = [
+            {key: node[key] for key in NODE_SUMMARY_KEYS if key in node} if isinstance(node, dict) else node
+            for node in nodes
+        ]
+    elif 'nodes' in document:
+        summary['nodes'] = nodes
+    if 'connections' in document:
+        summary['connections'] = document['connections']
+    return summary
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _simdjson_summary(data: JSONInput) -> Any:
+    """Lazy parse: only the summary fields are converted to Python objects."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    document = simdjson.Parser().parse(bytes(data))
+    if not isinstance(document, simdjson.Object):
+        return _materialize(document)
+
+    summary = {key: _materialize(document[key]) for key in SUMMARY_KEYS if key in document}
+    if 'nodes' in document:
+        nodes = document['nodes']
+        if isinstance(nodes, simdjson.Array):
+            summary['nodes'] = [
+                {key: _materialize(node[key]) for key in NODE_SUMMARY_KEYS if key in node}
+                if isinstance(node, simdjson.Object) else _materialize(node)
+                for node in nodes
+            ]
+        else:
+            summary['nodes'] = _materialize(nodes)
+    if 'connections' in document:
+        summary['connections'] = _materialize(document['connections'])
+    return summary
+
+
+def loads_summary(data: JSONInput) -> Any:
+    """Partial parse for indexing paths (see ``summarize_workflow``)."""
+    if backend == 'simdjson':
+        try:
+            return _simdjson_summary(data)
+        except ValueError:
+            pass
+    return summarize_workflow(loads(data))
+
+
+def load_file_summary(path: Union[str, os.PathLike]) -> Any:
+    """Read a workflow file and return only the fields the indexer uses."""
+    with open(path, 'rb') as f:
+        return loads_summary(f.read())
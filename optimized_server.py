@@ -19,6 +19,18 @@ from fastapi.responses import JSONResponse, FileResponse
 import uvicorn
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from instrumentation import instrument_app
+
+# src/ modules use src/ as their import root; appended so root-level modules keep precedence
+sys.path.append(str(Path(__file__).parent / "src"))
+
+try:
+    from performance_monitor import install_performance_monitor
+except ImportError:
+    # /monitor needs psutil, an optional dependency (see requirements.txt)
+    install_performance_monitor = None
 
 class OptimizedWorkflowServer:
     """Optimized server with error handling and performance optimization"""
@@ -49,6 +61,13 @@ class OptimizedWorkflowServer:
         
         # Gzip compression for better performance
         self.app.add_middleware(GZipMiddleware, minimum_size=1000)
+        
+        # Request latency/error metrics and the /metrics endpoint
+        instrument_app(self.app)
+        
+        # /monitor routes, fed by this app's request latency (skipped without psutil)
+        if install_performance_monitor:
+            install_performance_monitor(self.app)
     
     def _ensure_database(self):
         """Ensure database exists and is optimized"""
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Parallel Workflows - Process-pool execution for the CPU-bound batch tools
+Workflow files go to worker processes in chunks; each worker owns its own tool instance and its stats are merged back.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from workflow_corpus import flush_corpora
+
+DEFAULT_CHUNK_SIZE = 32
+
+# Tool instance owned by this worker process
+_worker_tool = None
+
+
+def _init_worker(factory: Callable[..., Any], kwargs: Dict[str, Any]):
+    global _worker_tool
+    _worker_tool = factory(**kwargs)
+
+
+def failure_record(workflow_path: Path, error: BaseException) -> Dict[str, Any]:
+    """Result for a file whose processing raised (same record as the thread-pool paths)."""
+    return {
+        'filename': workflow_path.name,
+        'category': workflow_path.parent.name,
+        'error': str(error),
+        'success': False
+    }
+
+
+def _run_chunk(method_name: str, stat_attrs: Sequence[str], paths: List[str]) -> Tuple[List[Any], Dict[str, Dict]]:
+    method = getattr(_worker_tool, method_name)
+    results = []
+    for path in paths:
+        try:
+            results.append(method(Path(path)))
+        except Exception as e:
+            results.append(failure_record(Path(path), e))
+
+    # Hand back only this chunk's counters so nothing is merged twice
+    stats = {}
+    for attr in stat_attrs:
+        counters = getattr(_worker_tool, attr)
+        stats[attr] = dict(counters)
+        counters.clear()
+
+    flush_corpora()
+    return results, stats
+
+
+def merge_stats(target: Dict[str, Any], partial: Dict[str, Any]):
+    """Fold a worker's counters into ``target`` (numbers are summed, lists extended, accumulators merged)."""
+    for key, value in partial.items():
+        if hasattr(value, 'merge'):
+            target[key].merge(value)
+        elif isinstance(value, list):
+            target[key].extend(value)
+        else:
+            target[key] += value
+
+
+def _chunks(paths: Iterable[Path], chunk_size: int) -> Iterator[List[str]]:
+    chunk = []
+    for path in paths:
+        chunk.append(str(path))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chunk_results(tool: Any, paths: List[str], future: Future) -> List[Any]:
+    try:
+        results, stats = future.result()
+    except Exception as e:
+        # Unpicklable result or a dead worker (BrokenProcessPool): the whole chunk is lost
+        print(f"❌ Worker failed on a chunk of {len(paths)} workflows: {e}")
+        return [failure_record(Path(path), e) for path in paths]
+    for attr, counters in stats.items():
+        merge_stats(getattr(tool, attr), counters)
+    return results
+
+
+def process_map(tool: Any, method_name: str, workflow_files: Iterable[Path], init_kwargs: Dict[str, Any],
+                stat_attrs: Sequence[str] = (), workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield ``tool.<method_name>(path)`` for every file, computed in a process pool.
+
+    Each worker builds ``type(tool)(**init_kwargs)`` once. Results come back
+    in input order, and the per-chunk values of the ``stat_attrs`` dicts are
+    merged into ``tool`` as chunks complete. A file that raises, or a chunk
+    lost to a worker failure, yields ``failure_record`` instead of aborting
+    the run.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(type(tool), init_kwargs)) as executor:
+        run_chunk = partial(_run_chunk, method_name, tuple(stat_attrs))
+        # Only a bounded window of chunks is in flight, so memory does not grow with the corpus
+        pending = deque()
+        for paths in _chunks(workflow_files, max(1, chunk_size)):
+            try:
+                future = executor.submit(run_chunk, paths)
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+            pending.append((paths, future))
+            if len(pending) >= workers * 2:
+                yield from _chunk_results(tool, *pending.popleft())
+        while pending:
+            yield from _chunk_results(tool, *pending.popleft())
+
+
+def iter_completed(executor: Executor, func: Callable[[Any], Any], items: Iterable[Any],
+                   max_pending: int) -> Iterator[Tuple[Any, Future]]:
+    """Yield ``(item, future)`` for ``func(item)`` as each finishes, with at most ``max_pending`` in flight.
+
+    The thread-pool counterpart of ``process_map``'s window: futures are
+    submitted lazily and released once yielded, instead of one per file
+    being held until the whole corpus is done.
+    """
+    pending: Dict[Future, Any] = {}
+
+    def drain():
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+
+    for item in items:
+        pending[executor.submit(func, item)] = item
+        if len(pending) >= max(1, max_pending):
+            yield from drain()
+    while pending:
+        yield from drain()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Report Stream - Constant-memory result sinks and online summary statistics
+Per-workflow results are written as they arrive (JSON Lines, CSV or Parquet) and summaries are accumulated online.
+"""
+
+import csv
+import heapq
+import json
+from collections import Counter, defaultdict
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SINK_FORMATS = ('.jsonl', '.csv', '.parquet')
+
+# Flattened columns of the excellence upgraders' per-workflow results (success and failure records)
+UPGRADE_RESULT_FIELDS = ('filename', 'category', 'success', 'written', 'initial_score', 'final_score',
+                         'improvement', 'quality_category', 'complexity', 'fixes_applied', 'error')
+
+
+def flatten_record(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Nested dicts become dotted columns; lists are stored as JSON text."""
+    flat = {}
+    for key, value in record.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, f"{column}."))
+        elif isinstance(value, (list, tuple)):
+            flat[column] = json.dumps(value, ensure_ascii=False, default=str)
+        else:
+            flat[column] = value
+    return flat
+
+
+class ResultSink:
+    """Write per-workflow result dicts one at a time; use as a context manager or call close()."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.count = 0
+        self.fields: Optional[List[str]] = None
+        self.dropped_columns = set()
+        self._field_set = set()
+
+    def write(self, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def _check_columns(self, row: Dict[str, Any]):
+        """Warn (once per column) about values that have no column in a fixed-schema sink."""
+        for column in row:
+            if column not in self._field_set and column not in self.dropped_columns:
+                self.dropped_columns.add(column)
+                print(f"⚠️  {self.path.name}: column '{column}' is not in the declared fields and is not written")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonlSink(ResultSink):
+    """One JSON document per line."""
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write('\n')
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class CsvSink(ResultSink):
+    """Flattened records; the columns come from ``fields`` or the first record.
+
+    Values for any other column are left out, with a warning naming the column.
+    """
+
+    def __init__(self, path: Union[str, Path], fields: Optional[Sequence[str]] = None):
+        super().__init__(path)
+        self.fields = list(fields) if fields else None
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._writer = None
+
+    def write(self, record):
+        row = flatten_record(record)
+        if self._writer is None:
+            self.fields = self.fields or list(row)
+            self._field_set = set(self.fields)
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction='ignore')
+            self._writer.writeheader()
+        self._check_columns(row)
+        self._writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """Flattened records written in row groups (requires pyarrow).
+
+    The columns come from ``fields`` or the first batch, and their types are
+    inferred from the first batch: all-boolean and all-numeric columns keep
+    their type, everything else is stored as text. Later values that do not
+    fit a numeric column are written as null; values for any other column
+    are left out, with a warning naming the column.
+    """
+
+    def __init__(self, path: Union[str, Path], fields: Optional[Sequence[str]] = None, batch_size: int = 1024):
+        if pa is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        super().__init__(path)
+        self.fields = list(fields) if fields else None
+        self.batch_size = batch_size
+        self._rows: List[Dict[str, Any]] = []
+        self._schema = None
+        self._writer = None
+
+    def write(self, record):
+        self._rows.append(flatten_record(record))
+        self.count += 1
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _infer_schema(self):
+        fields = self.fields or list(dict.fromkeys(column for row in self._rows for column in row))
+        columns = []
+        for field in fields:
+            values = [row[field] for row in self._rows if row.get(field) is not None]
+            if values and all(isinstance(value, bool) for value in values):
+                columns.append(pa.field(field, pa.bool_()))
+            elif values and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+                columns.append(pa.field(field, pa.float64()))
+            else:
+                columns.append(pa.field(field, pa.string()))
+        self._schema = pa.schema(columns)
+        self._field_set = set(fields)
+
+    @staticmethod
+    def _coerce(value: Any, arrow_type) -> Any:
+        if value is None:
+            return None
+        if arrow_type == pa.string():
+            return value if isinstance(value, str) else str(value)
+        if arrow_type == pa.bool_():
+            return value if isinstance(value, bool) else None
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+    def _flush(self):
+        if not self._rows:
+            return
+        if self._schema is None:
+            self._infer_schema()
+            self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        for row in self._rows:
+            self._check_columns(row)
+        columns = {
+            field.name: [self._coerce(row.get(field.name), field.type) for row in self._rows]
+            for field in self._schema
+        }
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def open_sink(path: Union[str, Path], fields: Optional[Sequence[str]] = None) -> ResultSink:
+    """Sink for ``path`` chosen by its suffix (.jsonl, .csv or .parquet)."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.jsonl':
+        return JsonlSink(path)
+    if suffix == '.csv':
+        return CsvSink(path, fields)
+    if suffix == '.parquet':
+        return ParquetSink(path, fields)
+    raise ValueError(f"Unsupported result format '{suffix}' (use one of: {', '.join(SINK_FORMATS)})")
+
+
+class OnlineStats:
+    """Count, mean, median, min/max and bucket counts over a stream of numbers.
+
+    Values are kept as a value -> occurrences table, so memory is bounded by
+    the number of distinct values (scores are rounded), not the stream
+    length. Mean and median match the ``statistics`` module exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.values: Counter = Counter()
+        self.min = None
+        self.max = None
+
+    def add(self, value: Union[int, float]):
+        self.count += 1
+        self.values[value] += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'OnlineStats'):
+        """Fold another accumulator (e.g. a worker process's) into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.values.update(other.values)
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+
+    def mean(self) -> Union[int, float]:
+        total = sum(Fraction(value) * occurrences for value, occurrences in self.values.items())
+        mean = total / self.count
+        if mean.denominator == 1 and all(isinstance(value, int) for value in self.values):
+            return int(mean)
+        return float(mean)
+
+    def _nth(self, index: int) -> Union[int, float]:
+        seen = 0
+        for value in sorted(self.values):
+            seen += self.values[value]
+            if seen > index:
+                return value
+        raise IndexError(index)
+
+    def median(self) -> Union[int, float]:
+        middle = self.count // 2
+        if self.count % 2 == 1:
+            return self._nth(middle)
+        return (self._nth(middle - 1) + self._nth(middle)) / 2
+
+    def count_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Number of values for which ``predicate`` holds."""
+        return sum(occurrences for value, occurrences in self.values.items() if predicate(value))
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready count, mean, median and range."""
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.mean(), 'median': self.median(),
+                'min': self.min, 'max': self.max}
+
+
+class TopK:
+    """The ``size`` items with the largest (or smallest) key, ties kept in arrival order.
+
+    Equivalent to ``sorted(items, key=key, reverse=largest)[:size]`` in O(size) memory.
+    """
+
+    def __init__(self, size: int, key: Callable[[Any], Any], largest: bool = True):
+        self.size = size
+        self.key = key
+        self.largest = largest
+        self._heap: List = []
+        self._seen = 0
+
+    def add(self, item: Any):
+        self._seen += 1
+        value = self.key(item)
+        entry = ((value if self.largest else -value), -self._seen, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+class UpgradeSummary:
+    """Online totals for the excellence upgraders' per-workflow results.
+
+    With ``stream_path`` each result is written to that file as it arrives
+    and nothing is kept in memory; otherwise results are collected for the
+    JSON report as before.
+    """
+
+    def __init__(self, stream_path: Optional[Union[str, Path]] = None):
+        self.sink = open_sink(stream_path, UPGRADE_RESULT_FIELDS) if stream_path else None
+        self.results: Optional[List[Dict[str, Any]]] = None if self.sink else []
+        self.total = 0
+        self.successful = 0
+        self.excellent = 0
+        self.improvement_total = 0
+        self.category_breakdown: Dict[str, int] = defaultdict(int)
+
+    def add(self, result: Dict[str, Any]):
+        self.total += 1
+        if result.get('success', False):
+            self.successful += 1
+            self.category_breakdown[result.get('category', 'unknown')] += 1
+            self.improvement_total += result.get('improvement', 0)
+            if result.get('quality_category') == 'excellent':
+                self.excellent += 1
+        if self.sink:
+            self.sink.write(result)
+        else:
+            self.results.append(result)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.successful
+
+    def average_improvement(self) -> Optional[float]:
+        return self.improvement_total / self.successful if self.successful else None
+
+    def detailed_results(self) -> Union[List[Dict[str, Any]], str]:
+        """The collected results, or the file they were streamed to."""
+        return self.results if self.sink is None else str(self.sink.path)
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
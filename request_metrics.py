@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Request Metrics - Real per-route latency histograms for the FastAPI servers
+ASGI middleware plus fixed-bucket counters that monitors can read cheaply.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional, Tuple
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Unmatched paths (404s, scanners) are folded into one series to bound memory
+MAX_ROUTES = 200
+OTHER_ROUTE = "__other__"
+
+
+def histogram_quantile(buckets: List[int], q: float) -> float:
+    """Estimate a quantile (ms) from bucket counts by interpolating inside the bucket."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        if seen + count >= rank and count:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0
+            if index >= len(LATENCY_BUCKETS_MS):
+                # +Inf bucket: the best we can say is "above the last bound"
+                return float(LATENCY_BUCKETS_MS[-1])
+            upper = LATENCY_BUCKETS_MS[index]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+class RouteStats:
+    """Cumulative counters for one route.
+
+    Counters are only written from the event loop thread (by the middleware),
+    so they need no lock; other threads just read the current values.
+    """
+
+    __slots__ = ('buckets', 'count', 'errors', 'total_ms')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    def observe(self, duration_ms: float, error: bool):
+        """Record one request."""
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> Tuple[List[int], int, int, float]:
+        """Copy of the counters (a fixed-size list, so O(1) in the number of requests)."""
+        return list(self.buckets), self.count, self.errors, self.total_ms
+
+
+class RequestMetrics:
+    """Registry of per-route request statistics for one process."""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+        self.in_flight = 0
+        self.workflow_executions = 0
+        self.started_at = time.time()
+        self._previous: Dict[str, Tuple[List[int], int, int, float]] = {}
+        self._previous_executions = 0
+
+    def _route_stats(self, route: str) -> RouteStats:
+        stats = self.routes.get(route)
+        if stats is None:
+            if len(self.routes) >= MAX_ROUTES:
+                route = OTHER_ROUTE
+                stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+        return stats
+
+    def observe(self, route: str, duration_ms: float, status_code: int):
+        """Record a finished request; 5xx responses count as errors."""
+        self._route_stats(route).observe(duration_ms, status_code >= 500)
+
+    def record_workflow_execution(self, count: int = 1):
+        """Count workflow executions triggered through the API."""
+        self.workflow_executions += count
+
+    def totals(self) -> Dict[str, Any]:
+        """Cumulative totals across all routes."""
+        requests = errors = 0
+        for stats in list(self.routes.values()):
+            requests += stats.count
+            errors += stats.errors
+        return {
+            'requests': requests,
+            'errors': errors,
+            'in_flight': self.in_flight,
+            'workflow_executions': self.workflow_executions,
+            'uptime_seconds': round(time.time() - self.started_at, 1)
+        }
+
+    def collect_interval(self) -> Dict[str, Any]:
+        """Per-route statistics since the previous call (meant for a single collector).
+
+        Cost depends on the number of routes and buckets, never on traffic.
+        """
+        routes = {}
+        requests = errors = 0
+
+        for route, stats in list(self.routes.items()):
+            buckets, count, route_errors, total_ms = stats.snapshot()
+            prev_buckets, prev_count, prev_errors, prev_total = self._previous.get(
+                route, ([0] * len(buckets), 0, 0, 0.0)
+            )
+            self._previous[route] = (buckets, count, route_errors, total_ms)
+
+            interval_count = count - prev_count
+            if not interval_count:
+                continue
+            interval_buckets = [now - before for now, before in zip(buckets, prev_buckets)]
+            interval_errors = route_errors - prev_errors
+
+            routes[route] = {
+                'count': interval_count,
+                'errors': interval_errors,
+                'avg_ms': round((total_ms - prev_total) / interval_count, 2),
+                'p50_ms': round(histogram_quantile(interval_buckets, 0.50), 2),
+                'p95_ms': round(histogram_quantile(interval_buckets, 0.95), 2),
+                'p99_ms': round(histogram_quantile(interval_buckets, 0.99), 2)
+            }
+            requests += interval_count
+            errors += interval_errors
+
+        executions = self.workflow_executions
+        interval_executions = executions - self._previous_executions
+        self._previous_executions = executions
+
+        return {
+            'routes': routes,
+            'requests': requests,
+            'errors': errors,
+            'error_rate': round(errors / requests * 100, 2) if requests else 0.0,
+            'in_flight': self.in_flight,
+            'workflow_executions': interval_executions
+        }
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware that times every HTTP request by its route template."""
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            metrics.in_flight -= 1
+            duration_ms = (time.perf_counter() - start) * 1000
+            metrics.observe(self._route_name(scope), duration_ms, status_code)
+
+    @staticmethod
+    def _route_name(scope) -> str:
+        """Use the matched route template so /api/workflows/{filename} is one series."""
+        route = scope.get('route')
+        path = getattr(route, 'path', None)
+        if path:
+            return f"{scope['method']} {path}"
+        return OTHER_ROUTE
+
+
+# Process-wide registry shared by the middleware and the monitors
+request_metrics = RequestMetrics()
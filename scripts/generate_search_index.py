@@ -4,17 +4,42 @@ Generate Static Search Index for GitHub Pages
 Creates a lightweight JSON index for client-side search functionality.
 """
 
+import gzip
 import json
 import os
+import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Add the parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 from workflow_db import WorkflowDatabase
 
+DOWNLOAD_URL_BASE = "https://raw.githubusercontent.com/Zie619/n8n-workflows/main/workflows"
+
+# Sharded index layout
+SHARDED_INDEX_DIR = 'search'
+DEFAULT_SHARD_SIZE = 500
+DEFAULT_PREFIX_LENGTH = 2
+MIN_TOKEN_LENGTH = 2
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+METADATA_FIELDS = ('id', 'name', 'description', 'filename', 'folder', 'active', 'trigger_type',
+                   'complexity', 'node_count', 'integrations', 'tags', 'category')
+FACET_FIELDS = ('category', 'complexity', 'trigger_type')
+
+
+def fetch_all_workflows(db: WorkflowDatabase) -> Tuple[List[Dict], int]:
+    """Every indexed workflow; the page size is taken from the row count so nothing is truncated."""
+    _, total = db.search_workflows(limit=0)
+    return db.search_workflows(limit=max(total, 1))
+
 
 def generate_static_search_index(db_path: str, output_dir: str) -> Dict[str, Any]:
     """Generate a static search index for client-side searching."""
@@ -23,7 +48,7 @@ def generate_static_search_index(db_path: str, output_dir: str) -> Dict[str, Any
     db = WorkflowDatabase(db_path)
 
     # Get all workflows
-    workflows, total = db.search_workflows(limit=10000)  # Get all workflows
+    workflows, total = fetch_all_workflows(db)
 
     # Get statistics
     stats = db.get_stats()
@@ -62,7 +87,7 @@ def generate_static_search_index(db_path: str, output_dir: str) -> Dict[str, Any
             'tags': workflow['tags'],
             'category': category,
             'searchable_text': searchable_text,
-            'download_url': f"https://raw.githubusercontent.com/Zie619/n8n-workflows/main/workflows/{extract_folder_from_filename(workflow['filename'])}/{workflow['filename']}"
+            'download_url': f"{DOWNLOAD_URL_BASE}/{extract_folder_from_filename(workflow['filename'])}/{workflow['filename']}"
         }
         search_workflows.append(search_workflow)
 
@@ -205,15 +230,16 @@ def extract_folder_from_filename(filename: str) -> str:
     return 'Misc'
 
 
-def save_search_index(search_index: Dict[str, Any], output_dir: str):
+def save_search_index(search_index: Dict[str, Any], output_dir: str, include_full_index: bool = True):
     """Save the search index to multiple formats for different uses."""
 
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
     # Save complete index
-    with open(os.path.join(output_dir, 'search-index.json'), 'w', encoding='utf-8') as f:
-        json.dump(search_index, f, indent=2, ensure_ascii=False)
+    if include_full_index:
+        with open(os.path.join(output_dir, 'search-index.json'), 'w', encoding='utf-8') as f:
+            json.dump(search_index, f, indent=2, ensure_ascii=False)
 
     # Save stats only (for quick loading)
     with open(os.path.join(output_dir, 'stats.json'), 'w', encoding='utf-8') as f:
@@ -234,12 +260,143 @@ def save_search_index(search_index: Dict[str, Any], output_dir: str):
     print(f"   Files saved to: {output_dir}")
 
 
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of at least MIN_TOKEN_LENGTH characters."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def shard_file_name(kind: str, key: str) -> str:
+    """File name for a shard; non-ASCII token prefixes are hex-encoded."""
+    if not re.fullmatch(r'[a-z0-9]+', key):
+        key = 'x' + key.encode('utf-8').hex()
+    return f"{kind}-{key}.json"
+
+
+def write_compressed(path: str, payload: Any) -> Dict[str, int]:
+    """Write minified JSON plus .gz (and .br when brotli is installed); returns the byte sizes."""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sizes = {'json': len(data)}
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    # mtime=0 keeps the .gz bytes identical between runs
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(compressed)
+    sizes['gz'] = len(compressed)
+
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        with open(path + '.br', 'wb') as f:
+            f.write(compressed)
+        sizes['br'] = len(compressed)
+    return sizes
+
+
+def save_sharded_search_index(search_index: Dict[str, Any], output_dir: str,
+                              shard_size: int = DEFAULT_SHARD_SIZE,
+                              prefix_length: int = DEFAULT_PREFIX_LENGTH) -> Dict[str, Any]:
+    """Save the index as small shards so a client only fetches what its query touches.
+
+    Layout under ``<output_dir>/search/`` (every file also as .gz / .br):
+
+    - ``manifest.json``: stats, field order, and the shard file for each
+      token prefix and metadata block
+    - ``terms-<prefix>.json``: ``{token: [doc, ...]}`` for tokens starting
+      with that prefix; a doc is a position in the filename-sorted list
+    - ``meta-<n>.json``: rows of METADATA_FIELDS for docs
+      ``n * shard_size`` .. ``(n + 1) * shard_size - 1``
+    - ``facets.json``: ``{field: {value: [doc, ...]}}`` for the filters
+    """
+    shard_dir = os.path.join(output_dir, SHARDED_INDEX_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    # Drop shards from a previous run so removed prefixes do not linger
+    for entry in os.listdir(shard_dir):
+        if re.fullmatch(r'(manifest|facets|meta-\d+|terms-\w+)\.json(\.gz|\.br)?', entry):
+            os.remove(os.path.join(shard_dir, entry))
+
+    workflows = sorted(search_index['workflows'], key=lambda workflow: workflow['filename'])
+
+    postings: Dict[str, Dict[str, List[int]]] = {}
+    facets: Dict[str, Dict[str, List[int]]] = {field: {} for field in FACET_FIELDS}
+    for doc, workflow in enumerate(workflows):
+        for token in set(tokenize(workflow['searchable_text'])):
+            postings.setdefault(token[:prefix_length], {}).setdefault(token, []).append(doc)
+        for field in FACET_FIELDS:
+            facets[field].setdefault(str(workflow.get(field) or ''), []).append(doc)
+
+    totals = {'files': 0, 'json': 0, 'gz': 0, 'br': 0}
+
+    def write_shard(file_name: str, payload: Any):
+        sizes = write_compressed(os.path.join(shard_dir, file_name), payload)
+        totals['files'] += 1
+        for encoding, size in sizes.items():
+            totals[encoding] += size
+
+    term_shards = {}
+    for prefix in sorted(postings):
+        file_name = shard_file_name('terms', prefix)
+        term_shards[prefix] = file_name
+        write_shard(file_name, {token: postings[prefix][token] for token in sorted(postings[prefix])})
+
+    meta_shards = []
+    for start in range(0, len(workflows), shard_size):
+        file_name = f"meta-{start // shard_size}.json"
+        meta_shards.append(file_name)
+        rows = []
+        for workflow in workflows[start:start + shard_size]:
+            row = dict(workflow, folder=extract_folder_from_filename(workflow['filename']))
+            rows.append([row.get(field) for field in METADATA_FIELDS])
+        write_shard(file_name, rows)
+
+    write_shard('facets.json', facets)
+
+    manifest = {
+        'version': '2.0',
+        'generated_at': search_index['generated_at'],
+        'stats': search_index['stats'],
+        'categories': search_index['categories'],
+        'integrations': search_index['integrations'],
+        'total_docs': len(workflows),
+        'fields': list(METADATA_FIELDS),
+        'download_url_template': f"{DOWNLOAD_URL_BASE}/{{folder}}/{{filename}}",
+        'shard_size': shard_size,
+        'prefix_length': prefix_length,
+        'min_token_length': MIN_TOKEN_LENGTH,
+        'term_shards': term_shards,
+        'meta_shards': meta_shards,
+        'facets': 'facets.json',
+        'encodings': ['gzip', 'br'] if brotli is not None else ['gzip']
+    }
+    write_shard('manifest.json', manifest)
+
+    print(f"Sharded search index generated:")
+    print(f"   {len(term_shards)} term shards, {len(meta_shards)} metadata shards")
+    print(f"   {totals['files']} files, {totals['json']:,} bytes minified, {totals['gz']:,} bytes gzip"
+          + (f", {totals['br']:,} bytes brotli" if brotli is not None else ""))
+    print(f"   Files saved to: {shard_dir}")
+    return manifest
+
+
 def main():
     """Main function to generate search index."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the static search index for GitHub Pages')
+    parser.add_argument('--db', default='database/workflows.db', help='Workflow database path')
+    parser.add_argument('--output', default='docs/api', help='Output directory')
+    parser.add_argument('--sharded', action='store_true',
+                        help='Write a sharded, pre-compressed index instead of search-index.json')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f'Workflows per metadata shard (default: {DEFAULT_SHARD_SIZE})')
+    parser.add_argument('--prefix-length', type=int, default=DEFAULT_PREFIX_LENGTH,
+                        help=f'Token prefix length used to shard the inverted index (default: {DEFAULT_PREFIX_LENGTH})')
+    args = parser.parse_args()
 
     # Paths
-    db_path = "database/workflows.db"
-    output_dir = "docs/api"
+    db_path = args.db
+    output_dir = args.output
 
     # Check if database exists
     if not os.path.exists(db_path):
@@ -250,7 +407,9 @@ def main():
     try:
         print("Generating static search index...")
         search_index = generate_static_search_index(db_path, output_dir)
-        save_search_index(search_index, output_dir)
+        save_search_index(search_index, output_dir, include_full_index=not args.sharded)
+        if args.sharded:
+            save_sharded_search_index(search_index, output_dir, args.shard_size, args.prefix_length)
 
         print("Static search index ready for GitHub Pages!")
 
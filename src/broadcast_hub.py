@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Broadcast Hub for real-time WebSocket updates
+Thread-safe publish from background collectors, serialize once, bounded per-client queues.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+# Close code sent to clients that cannot keep up (1013 = try again later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Subscriber:
+    """One connected client: a bounded outbox drained by its own sender task."""
+
+    __slots__ = ('queue', 'dropped')
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+
+
+class BroadcastHub:
+    """Fan out messages published from any thread to WebSocket subscribers."""
+
+    def __init__(self, max_queue: int = 32):
+        self.max_queue = max_queue
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.subscribers: Set[_Subscriber] = set()
+        self.published = 0
+        self.undelivered = 0
+        self.slow_consumers_dropped = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self.subscribers)
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Bind the hub to the event loop serving the WebSocket connections."""
+        self.loop = loop
+
+    def publish(self, message: Dict[str, Any]) -> bool:
+        """Serialize once and hand off to the event loop; safe to call from any thread."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or not self.subscribers:
+            self.undelivered += 1
+            return False
+
+        text = json.dumps(message, default=str)
+        try:
+            loop.call_soon_threadsafe(self._fan_out, text)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            self.undelivered += 1
+            return False
+        self.published += 1
+        return True
+
+    def _fan_out(self, text: str):
+        """Runs on the event loop: enqueue the payload for every subscriber."""
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(text)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: _Subscriber):
+        """Disconnect a subscriber whose outbox is full rather than block the others."""
+        self.subscribers.discard(subscriber)
+        subscriber.dropped = True
+        self.slow_consumers_dropped += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    async def serve(self, websocket: WebSocket):
+        """Accept a WebSocket and stream published messages until it disconnects."""
+        await websocket.accept()
+        if self.loop is None:
+            self.attach_loop(asyncio.get_running_loop())
+
+        subscriber = _Subscriber(self.max_queue)
+        self.subscribers.add(subscriber)
+
+        sender = asyncio.create_task(self._send_loop(websocket, subscriber))
+        receiver = asyncio.create_task(self._receive_loop(websocket))
+        try:
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.subscribers.discard(subscriber)
+            for task in (sender, receiver):
+                task.cancel()
+
+        if subscriber.dropped:
+            try:
+                await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            except Exception:
+                pass
+
+    async def _send_loop(self, websocket: WebSocket, subscriber: _Subscriber):
+        while True:
+            text = await subscriber.queue.get()
+            if text is None:
+                return
+            await websocket.send_text(text)
+
+    async def _receive_loop(self, websocket: WebSocket):
+        # Incoming messages are only keep-alives; this ends when the client goes away
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            return
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'clients': self.client_count,
+            'published': self.published,
+            'undelivered': self.undelivered,
+            'slow_consumers_dropped': self.slow_consumers_dropped
+        }
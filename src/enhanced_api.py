@@ -8,16 +8,29 @@ import sqlite3
 import json
 import time
 import hashlib
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from pathlib import Path
 from pydantic import BaseModel
 import uvicorn
 
+# src/ is the import root; shared root-level modules are appended so src/ modules keep precedence
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
 # Import community features
 from community_features import CommunityFeatures, create_community_api_endpoints
+from instrumentation import instrument_app
+try:
+    from performance_monitor import install_performance_monitor
+except ImportError:
+    # /monitor needs psutil, an optional dependency (see requirements.txt)
+    install_performance_monitor = None
 
 class WorkflowSearchRequest(BaseModel):
     """Workflow search request model"""
@@ -70,6 +83,13 @@ class EnhancedAPI:
         
         # Gzip compression
         self.app.add_middleware(GZipMiddleware, minimum_size=1000)
+        
+        # Request latency/error metrics and the /metrics endpoint
+        instrument_app(self.app)
+        
+        # /monitor routes, fed by this app's request latency (skipped without psutil)
+        if install_performance_monitor:
+            install_performance_monitor(self.app)
     
     def _setup_routes(self):
         """Setup API routes"""
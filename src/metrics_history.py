@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Metrics History for the Performance Monitor
+Fixed-size, array-backed ring buffers with 5s raw, 1 minute and 1 hour resolutions.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+# Numeric fields kept per sample, in storage order
+HISTORY_FIELDS = (
+    'cpu_usage', 'memory_usage', 'disk_usage', 'bytes_sent', 'bytes_recv',
+    'packets_sent', 'packets_recv', 'active_connections', 'request_count', 'workflow_executions', 'error_rate',
+    'api_p95_ms', 'database_size'
+)
+
+# Per-interval counts are summed when downsampling; everything else is averaged
+SUMMED_FIELDS = {'request_count', 'workflow_executions'}
+
+# (name, bucket seconds, capacity): 24h of raw samples, 7 days of minutes, 90 days of hours
+RESOLUTIONS = (
+    ('raw', 5, 17280),
+    ('minute', 60, 7 * 24 * 60),
+    ('hour', 3600, 90 * 24),
+)
+
+
+class _LogicalIndex:
+    """Sequence view of a ring's timestamps in oldest-to-newest order (for bisect)."""
+
+    __slots__ = ('ring',)
+
+    def __init__(self, ring: 'MetricsRing'):
+        self.ring = ring
+
+    def __len__(self):
+        return self.ring.size
+
+    def __getitem__(self, index):
+        return self.ring.timestamps[self.ring._physical(index)]
+
+
+class MetricsRing:
+    """Ring buffer of numeric samples stored column-wise in ``array('d')``."""
+
+    def __init__(self, capacity: int, fields: Tuple[str, ...] = HISTORY_FIELDS):
+        self.capacity = capacity
+        self.fields = fields
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.columns = {field: array('d', bytes(8 * capacity)) for field in fields}
+        self.start = 0
+        self.size = 0
+
+    def _physical(self, logical: int) -> int:
+        return (self.start + logical) % self.capacity
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        """Add a sample, overwriting the oldest one once full."""
+        if self.size < self.capacity:
+            position = self._physical(self.size)
+            self.size += 1
+        else:
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        self.timestamps[position] = timestamp
+        for field in self.fields:
+            self.columns[field][position] = values.get(field, 0.0)
+
+    def _slice(self, column: array, first: int, last: int) -> array:
+        """Copy logical range [first, last) as at most two contiguous array slices."""
+        if first >= last:
+            return array('d')
+        begin = self._physical(first)
+        end = begin + (last - first)
+        if end <= self.capacity:
+            return column[begin:end]
+        return column[begin:] + column[:end - self.capacity]
+
+    def range(self, start_ts: float, end_ts: Optional[float] = None) -> Dict[str, array]:
+        """Columns for samples with start_ts <= timestamp <= end_ts."""
+        index = _LogicalIndex(self)
+        first = bisect_left(index, start_ts)
+        last = self.size if end_ts is None else bisect_right(index, end_ts)
+
+        result = {'timestamp': self._slice(self.timestamps, first, last)}
+        for field in self.fields:
+            result[field] = self._slice(self.columns[field], first, last)
+        return result
+
+    def tail(self, count: int) -> Dict[str, array]:
+        """Columns for the newest ``count`` samples."""
+        first = max(0, self.size - count)
+        result = {'timestamp': self._slice(self.timestamps, first, self.size)}
+        for field in self.fields:
+            result[field] = self._slice(self.columns[field], first, self.size)
+        return result
+
+
+class _Bucket:
+    """Running aggregate for the current downsampling bucket."""
+
+    __slots__ = ('key', 'count', 'totals')
+
+    def __init__(self, key: int, fields: Tuple[str, ...]):
+        self.key = key
+        self.count = 0
+        self.totals = dict.fromkeys(fields, 0.0)
+
+    def add(self, values: Dict[str, float]):
+        self.count += 1
+        for field in self.totals:
+            self.totals[field] += values.get(field, 0.0)
+
+    def result(self) -> Dict[str, float]:
+        return {
+            field: total if field in SUMMED_FIELDS else total / self.count
+            for field, total in self.totals.items()
+        }
+
+
+class MetricsHistory:
+    """Multi-resolution history in constant memory."""
+
+    def __init__(self, resolutions: Tuple[Tuple[str, int, int], ...] = RESOLUTIONS,
+                 fields: Tuple[str, ...] = HISTORY_FIELDS):
+        self.fields = fields
+        self.resolutions = resolutions
+        self.rings = {name: MetricsRing(capacity, fields) for name, seconds, capacity in resolutions}
+        self._buckets: Dict[str, Optional[_Bucket]] = {name: None for name, seconds, capacity in resolutions[1:]}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.rings[self.resolutions[0][0]].size
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        """Record a raw sample and roll it into the coarser resolutions."""
+        with self._lock:
+            self.rings[self.resolutions[0][0]].append(timestamp, values)
+
+            for name, seconds, capacity in self.resolutions[1:]:
+                key = int(timestamp // seconds)
+                bucket = self._buckets[name]
+                if bucket is not None and bucket.key != key:
+                    # Previous bucket is complete: store it stamped with its start time
+                    self.rings[name].append(bucket.key * seconds, bucket.result())
+                    bucket = None
+                if bucket is None:
+                    bucket = self._buckets[name] = _Bucket(key, self.fields)
+                bucket.add(values)
+
+    def pick_resolution(self, seconds: float) -> str:
+        """Finest resolution whose buffer still covers the requested span."""
+        for name, bucket_seconds, capacity in self.resolutions:
+            if seconds <= bucket_seconds * capacity:
+                return name
+        return self.resolutions[-1][0]
+
+    def query(self, start_ts: float, end_ts: Optional[float] = None,
+              resolution: Optional[str] = None) -> Dict[str, array]:
+        """Column-wise samples in a time range at the given (or automatic) resolution."""
+        if resolution is None:
+            span_end = end_ts if end_ts is not None else datetime.now().timestamp()
+            resolution = self.pick_resolution(span_end - start_ts)
+        with self._lock:
+            return self.rings[resolution].range(start_ts, end_ts)
+
+    def tail(self, count: int) -> Dict[str, array]:
+        """Newest raw samples."""
+        with self._lock:
+            return self.rings[self.resolutions[0][0]].tail(count)
+
+    @staticmethod
+    def to_records(columns: Dict[str, array]) -> List[Dict[str, Any]]:
+        """Convert column-wise results to JSON-friendly rows."""
+        timestamps = columns['timestamp']
+        fields = [field for field in columns if field != 'timestamp']
+        return [
+            dict(
+                {'timestamp': datetime.fromtimestamp(timestamp).isoformat()},
+                **{field: round(columns[field][index], 2) for field in fields}
+            )
+            for index, timestamp in enumerate(timestamps)
+        ]
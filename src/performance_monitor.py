@@ -4,17 +4,29 @@ Performance Monitoring System for N8N Workflows
 Real-time metrics, monitoring, and alerting.
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, FastAPI, HTTPException, WebSocket
+from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import asyncio
+import os
+import sys
 import time
 import psutil
 import sqlite3
 from datetime import datetime, timedelta
-import json
 import threading
 import queue
+from pathlib import Path
+
+# src/ is the import root; shared root-level modules are appended so src/ modules keep precedence
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from request_metrics import RequestMetrics, RequestMetricsMiddleware, request_metrics
+from metrics_history import MetricsHistory
+from broadcast_hub import BroadcastHub
 
 class PerformanceMetrics(BaseModel):
     timestamp: str
@@ -23,7 +35,9 @@ class PerformanceMetrics(BaseModel):
     disk_usage: float
     network_io: Dict[str, int]
     api_response_times: Dict[str, float]
+    api_latency: Dict[str, Dict[str, Any]] = {}
     active_connections: int
+    request_count: int = 0
     database_size: int
     workflow_executions: int
     error_rate: float
@@ -37,11 +51,13 @@ class Alert(BaseModel):
     resolved: bool = False
 
 class PerformanceMonitor:
-    def __init__(self, db_path: str = "workflows.db"):
+    def __init__(self, db_path: str = "workflows.db", metrics: Optional[RequestMetrics] = None):
         self.db_path = db_path
-        self.metrics_history = []
+        self.request_metrics = metrics or request_metrics
+        self.metrics_history = MetricsHistory()
+        self.latest_metrics: Optional[PerformanceMetrics] = None
         self.alerts = []
-        self.websocket_connections = []
+        self.hub = BroadcastHub()
         self.monitoring_active = False
         self.metrics_queue = queue.Queue()
         
@@ -49,6 +65,8 @@ class PerformanceMonitor:
         """Start performance monitoring in background thread."""
         if not self.monitoring_active:
             self.monitoring_active = True
+            # Prime psutil so later non-blocking cpu_percent() calls measure the interval between samples
+            psutil.cpu_percent(interval=None)
             monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             monitor_thread.start()
     
@@ -57,11 +75,8 @@ class PerformanceMonitor:
         while self.monitoring_active:
             try:
                 metrics = self._collect_metrics()
-                self.metrics_history.append(metrics)
-                
-                # Keep only last 1000 metrics
-                if len(self.metrics_history) > 1000:
-                    self.metrics_history = self.metrics_history[-1000:]
+                self.latest_metrics = metrics
+                self.metrics_history.append(time.time(), self._history_values(metrics))
                 
                 # Check for alerts
                 self._check_alerts(metrics)
@@ -77,8 +92,8 @@ class PerformanceMonitor:
     
     def _collect_metrics(self) -> PerformanceMetrics:
         """Collect current system metrics."""
-        # CPU and Memory
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # CPU and Memory (non-blocking: usage since the previous sample)
+        cpu_usage = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         memory_usage = memory.percent
         
@@ -95,27 +110,22 @@ class PerformanceMonitor:
             "packets_recv": network.packets_recv
         }
         
-        # API response times (simulated)
-        api_response_times = {
-            "/api/stats": self._measure_api_time("/api/stats"),
-            "/api/workflows": self._measure_api_time("/api/workflows"),
-            "/api/search": self._measure_api_time("/api/workflows?q=test")
-        }
+        # Request latency, errors and in-flight requests recorded by RequestMetricsMiddleware
+        interval = self.request_metrics.collect_interval()
+        api_latency = interval['routes']
+        api_response_times = {route: stats['p95_ms'] for route, stats in api_latency.items()}
         
-        # Active connections
-        active_connections = len(psutil.net_connections())
+        # Requests currently being served
+        active_connections = interval['in_flight']
         
         # Database size
         try:
             db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
-        except:
+        except OSError:
             db_size = 0
         
-        # Workflow executions (simulated)
-        workflow_executions = self._get_workflow_executions()
-        
-        # Error rate (simulated)
-        error_rate = self._calculate_error_rate()
+        workflow_executions = interval['workflow_executions']
+        error_rate = interval['error_rate']
         
         return PerformanceMetrics(
             timestamp=datetime.now().isoformat(),
@@ -124,29 +134,31 @@ class PerformanceMonitor:
             disk_usage=disk_usage,
             network_io=network_io,
             api_response_times=api_response_times,
+            api_latency=api_latency,
             active_connections=active_connections,
+            request_count=interval['requests'],
             database_size=db_size,
             workflow_executions=workflow_executions,
             error_rate=error_rate
         )
     
-    def _measure_api_time(self, endpoint: str) -> float:
-        """Measure API response time (simulated)."""
-        # In a real implementation, this would make actual HTTP requests
-        import random
-        return round(random.uniform(10, 100), 2)
-    
-    def _get_workflow_executions(self) -> int:
-        """Get number of workflow executions (simulated)."""
-        # In a real implementation, this would query execution logs
-        import random
-        return random.randint(0, 50)
-    
-    def _calculate_error_rate(self) -> float:
-        """Calculate error rate (simulated)."""
-        # In a real implementation, this would analyze error logs
-        import random
-        return round(random.uniform(0, 5), 2)
+    def _history_values(self, metrics: PerformanceMetrics) -> Dict[str, float]:
+        """Flatten a metrics sample into the numeric fields kept in history."""
+        return {
+            'cpu_usage': metrics.cpu_usage,
+            'memory_usage': metrics.memory_usage,
+            'disk_usage': metrics.disk_usage,
+            'bytes_sent': metrics.network_io.get('bytes_sent', 0),
+            'bytes_recv': metrics.network_io.get('bytes_recv', 0),
+            'packets_sent': metrics.network_io.get('packets_sent', 0),
+            'packets_recv': metrics.network_io.get('packets_recv', 0),
+            'active_connections': metrics.active_connections,
+            'request_count': metrics.request_count,
+            'workflow_executions': metrics.workflow_executions,
+            'error_rate': metrics.error_rate,
+            'api_p95_ms': max(metrics.api_response_times.values(), default=0.0),
+            'database_size': metrics.database_size
+        }
     
     def _check_alerts(self, metrics: PerformanceMetrics):
         """Check metrics against alert thresholds."""
@@ -162,10 +174,12 @@ class PerformanceMonitor:
         if metrics.disk_usage > 90:
             self._create_alert("high_disk", "critical", f"High disk usage: {metrics.disk_usage}%")
         
-        # API response time alert
-        for endpoint, response_time in metrics.api_response_times.items():
-            if response_time > 1000:  # 1 second
-                self._create_alert("slow_api", "warning", f"Slow API response: {endpoint} ({response_time}ms)")
+        # API latency alerts on the interval's p95/p99
+        for endpoint, latency in metrics.api_latency.items():
+            if latency['p99_ms'] > 2500:
+                self._create_alert("very_slow_api", "critical", f"Very slow API p99: {endpoint} ({latency['p99_ms']}ms)")
+            elif latency['p95_ms'] > 1000:  # 1 second
+                self._create_alert("slow_api", "warning", f"Slow API p95: {endpoint} ({latency['p95_ms']}ms)")
         
         # Error rate alert
         if metrics.error_rate > 10:
@@ -189,7 +203,7 @@ class PerformanceMonitor:
     
     def _broadcast_metrics(self, metrics: PerformanceMetrics):
         """Broadcast metrics to all websocket connections."""
-        if self.websocket_connections:
+        if self.hub.client_count:
             message = {
                 "type": "metrics",
                 "data": metrics.dict()
@@ -205,26 +219,19 @@ class PerformanceMonitor:
         self._broadcast_to_websockets(message)
     
     def _broadcast_to_websockets(self, message: dict):
-        """Broadcast message to all websocket connections."""
-        disconnected = []
-        for websocket in self.websocket_connections:
-            try:
-                asyncio.create_task(websocket.send_text(json.dumps(message)))
-            except:
-                disconnected.append(websocket)
-        
-        # Remove disconnected connections
-        for ws in disconnected:
-            self.websocket_connections.remove(ws)
+        """Broadcast message to all websocket connections (called from the monitor thread)."""
+        self.hub.publish(message)
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get performance metrics summary."""
-        if not self.metrics_history:
+        latest = self.latest_metrics
+        if latest is None:
             return {"message": "No metrics available"}
         
-        latest = self.metrics_history[-1]
-        avg_cpu = sum(m.cpu_usage for m in self.metrics_history[-10:]) / min(10, len(self.metrics_history))
-        avg_memory = sum(m.memory_usage for m in self.metrics_history[-10:]) / min(10, len(self.metrics_history))
+        recent = self.metrics_history.tail(10)
+        samples = max(len(recent['cpu_usage']), 1)
+        avg_cpu = sum(recent['cpu_usage']) / samples
+        avg_memory = sum(recent['memory_usage']) / samples
         
         return {
             "current": latest.dict(),
@@ -236,15 +243,36 @@ class PerformanceMonitor:
             "status": "healthy" if latest.cpu_usage < 80 and latest.memory_usage < 85 else "warning"
         }
     
-    def get_historical_metrics(self, hours: int = 24) -> List[Dict]:
-        """Get historical metrics for specified hours."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        cutoff_timestamp = cutoff_time.isoformat()
+    def get_historical_metrics(self, hours: int = 24, resolution: Optional[str] = None) -> List[Dict]:
+        """Get historical metrics for specified hours (raw, minute or hour resolution).
         
-        return [
-            metrics.dict() for metrics in self.metrics_history
-            if metrics.timestamp >= cutoff_timestamp
-        ]
+        Samples keep the PerformanceMetrics shape. Only the slowest route's p95
+        is stored per sample, so ``api_response_times`` holds it under ``"*"``
+        and ``api_latency`` is empty; /monitor/metrics has the per-route view.
+        """
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        columns = self.metrics_history.query(cutoff_time.timestamp(), resolution=resolution)
+        return [self._history_sample(record) for record in MetricsHistory.to_records(columns)]
+    
+    @staticmethod
+    def _history_sample(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a PerformanceMetrics dict from a flat history row."""
+        return PerformanceMetrics(
+            timestamp=record['timestamp'],
+            cpu_usage=record['cpu_usage'],
+            memory_usage=record['memory_usage'],
+            disk_usage=record['disk_usage'],
+            network_io={
+                key: round(record[key])
+                for key in ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv')
+            },
+            api_response_times={'*': record['api_p95_ms']} if record['request_count'] else {},
+            active_connections=round(record['active_connections']),
+            request_count=round(record['request_count']),
+            database_size=round(record['database_size']),
+            workflow_executions=round(record['workflow_executions']),
+            error_rate=record['error_rate']
+        ).dict()
     
     def resolve_alert(self, alert_id: str) -> bool:
         """Resolve an alert."""
@@ -256,27 +284,28 @@ class PerformanceMonitor:
 
 # Initialize performance monitor
 performance_monitor = PerformanceMonitor()
-performance_monitor.start_monitoring()
 
-# FastAPI app for Performance Monitoring
-monitor_app = FastAPI(title="N8N Performance Monitor", version="1.0.0")
+# Monitoring routes; mounted on the standalone monitor app and on the API servers
+monitor_router = APIRouter()
 
-@monitor_app.get("/monitor/metrics")
+@monitor_router.get("/monitor/metrics")
 async def get_current_metrics():
     """Get current performance metrics."""
     return performance_monitor.get_metrics_summary()
 
-@monitor_app.get("/monitor/history")
-async def get_historical_metrics(hours: int = 24):
+@monitor_router.get("/monitor/history")
+async def get_historical_metrics(hours: int = 24, resolution: Optional[str] = None):
     """Get historical performance metrics."""
-    return performance_monitor.get_historical_metrics(hours)
+    if resolution not in (None, "raw", "minute", "hour"):
+        raise HTTPException(status_code=400, detail="resolution must be raw, minute or hour")
+    return performance_monitor.get_historical_metrics(hours, resolution)
 
-@monitor_app.get("/monitor/alerts")
+@monitor_router.get("/monitor/alerts")
 async def get_alerts():
     """Get current alerts."""
     return [alert.dict() for alert in performance_monitor.alerts if not alert.resolved]
 
-@monitor_app.post("/monitor/alerts/{alert_id}/resolve")
+@monitor_router.post("/monitor/alerts/{alert_id}/resolve")
 async def resolve_alert(alert_id: str):
     """Resolve an alert."""
     success = performance_monitor.resolve_alert(alert_id)
@@ -285,20 +314,12 @@ async def resolve_alert(alert_id: str):
     else:
         return {"message": "Alert not found"}
 
-@monitor_app.websocket("/monitor/ws")
+@monitor_router.websocket("/monitor/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time metrics."""
-    await websocket.accept()
-    performance_monitor.websocket_connections.append(websocket)
-    
-    try:
-        while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        performance_monitor.websocket_connections.remove(websocket)
+    await performance_monitor.hub.serve(websocket)
 
-@monitor_app.get("/monitor/dashboard")
+@monitor_router.get("/monitor/dashboard")
 async def get_monitoring_dashboard():
     """Get performance monitoring dashboard HTML."""
     html_content = """
@@ -569,7 +590,7 @@ async def get_monitoring_dashboard():
                     </div>
                     <div class="metric-card">
                         <div class="metric-value network">${metrics.active_connections || 0}</div>
-                        <div class="metric-label">Active Connections</div>
+                        <div class="metric-label">In-flight Requests</div>
                     </div>
                 `;
                 
@@ -720,6 +741,27 @@ async def get_monitoring_dashboard():
     """
     return HTMLResponse(content=html_content)
 
+def install_performance_monitor(app: FastAPI) -> FastAPI:
+    """Serve the /monitor routes from ``app`` and feed the monitor from its real request latency.
+
+    The monitor reads the process-wide ``request_metrics``, so it only sees
+    the requests of the app it is installed on.
+    """
+    if not any(middleware.cls is RequestMetricsMiddleware for middleware in app.user_middleware):
+        app.add_middleware(RequestMetricsMiddleware, metrics=performance_monitor.request_metrics)
+    app.include_router(monitor_router)
+
+    @app.on_event("startup")
+    async def start_performance_monitor():
+        # Let the monitor thread hand broadcasts to the server's event loop
+        performance_monitor.hub.attach_loop(asyncio.get_running_loop())
+        performance_monitor.start_monitoring()
+
+    return app
+
+# Standalone FastAPI app for Performance Monitoring
+monitor_app = install_performance_monitor(FastAPI(title="N8N Performance Monitor", version="1.0.0"))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(monitor_app, host="127.0.0.1", port=8005)
@@ -1,4 +1,4 @@
-I'll help you fix any remaining errors and ensure all workflows are running error-free and active. Let me run a comprehensive check and fix any issues.#!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 ULTRA-AGGRESSIVE Excellence Upgrader
 FORCE ALL workflows to 100% excellent quality (90+ points)
@@ -7,7 +7,6 @@ No mercy - every workflow WILL achieve excellence!
 
 import json
 import os
-import re
 import uuid
 import shutil
 from pathlib import Path
@@ -18,6 +17,27 @@ import concurrent.futures
 import threading
 from dataclasses import dataclass
 
+from parallel_workflows import iter_completed, process_map, DEFAULT_CHUNK_SIZE
+from report_stream import OnlineStats, UpgradeSummary
+from workflow_writer import load_for_update, write_workflow_if_changed
+from workflow_graph import iter_connection_targets
+from workflow_rules import (RuleEngine, SensitiveDataRule, HardcodedUrlRule, UrlSubstitutionRule,
+                            SecretPlaceholderRule, SENSITIVE_KEY_PATTERNS, URL_PLACEHOLDERS, STRICT_URL_PATTERN)
+
+HARDCODED_URL_SCAN = RuleEngine([
+    HardcodedUrlRule('hardcoded_urls', STRICT_URL_PATTERN, lambda path, url: f"{path}: {url}",
+                     URL_PLACEHOLDERS + ('example.com',), per_match=True)
+])
+SENSITIVE_DATA_SCAN = RuleEngine([
+    SensitiveDataRule('sensitive_data', SENSITIVE_KEY_PATTERNS + ('bearer',),
+                      lambda path, value: f"{path}: {str(value)[:50]}...", token_strings=True)
+])
+SECURITY_SCAN = RuleEngine(HARDCODED_URL_SCAN.rules + SENSITIVE_DATA_SCAN.rules)
+
+HARDCODED_URL_FIX = RuleEngine([UrlSubstitutionRule('hardcoded_urls')])
+SENSITIVE_DATA_FIX = RuleEngine([SecretPlaceholderRule('sensitive_data')])
+SECURITY_FIXES = RuleEngine(HARDCODED_URL_FIX.rules + SENSITIVE_DATA_FIX.rules)
+
 @dataclass
 class WorkflowQuality:
     """Quality metrics for a workflow"""
@@ -31,12 +51,14 @@ class WorkflowQuality:
 class UltraAggressiveUpgrader:
     """ULTRA-AGGRESSIVE upgrader - NO MERCY for poor quality!"""
     
-    def __init__(self, workflows_dir="C:\\Users\\sahii\\OneDrive\\Saved Games\\Microsoft Edge Drop Files\\Documents\\Cline\\n8n-workflows\\workflows", backup_dir="workflows_backup", max_workers=6):
+    def __init__(self, workflows_dir="C:\\Users\\sahii\\OneDrive\\Saved Games\\Microsoft Edge Drop Files\\Documents\\Cline\\n8n-workflows\\workflows", backup_dir="workflows_backup", max_workers=6, use_processes=True, chunk_size=DEFAULT_CHUNK_SIZE):
         self.workflows_dir = Path(workflows_dir)
         self.backup_dir = Path(backup_dir)
         self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.chunk_size = chunk_size
         self.upgrade_stats = defaultdict(int)
-        self.quality_metrics = defaultdict(list)
+        self.quality_metrics = defaultdict(OnlineStats)
         self.thread_lock = threading.Lock()
         
         # Create backup directory
@@ -53,15 +75,18 @@ class UltraAggressiveUpgrader:
         # Base score
         score = 100.0
         
+        # URLs and sensitive data are collected in one pass over the workflow
+        security_scan = SECURITY_SCAN.run(workflow_data)
+        
         # Check for hardcoded URLs (deduct 15 points)
-        hardcoded_urls = self.find_hardcoded_urls(workflow_data)
+        hardcoded_urls = security_scan.findings['hardcoded_urls']
         if hardcoded_urls:
             score -= 15
             issues.append(f"Hardcoded URLs found: {len(hardcoded_urls)}")
             recommendations.append("Replace hardcoded URLs with environment variables")
         
         # Check for sensitive data (deduct 20 points)
-        sensitive_data = self.find_sensitive_data(workflow_data)
+        sensitive_data = security_scan.findings['sensitive_data']
         if sensitive_data:
             score -= 20
             issues.append(f"Sensitive data found: {len(sensitive_data)}")
@@ -173,49 +198,11 @@ class UltraAggressiveUpgrader:
     
     def find_hardcoded_urls(self, data: Any, path: str = "") -> List[str]:
         """Find hardcoded URLs in workflow data"""
-        urls = []
-        
-        if isinstance(data, dict):
-            for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
-                urls.extend(self.find_hardcoded_urls(value, current_path))
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                urls.extend(self.find_hardcoded_urls(item, f"{path}[{i}]"))
-        elif isinstance(data, str):
-            url_pattern = r'https?://[^\s<>"\'{}|\\^`\[\]]+'
-            matches = re.findall(url_pattern, data)
-            for match in matches:
-                if not any(placeholder in data for placeholder in ['{{', '${', 'YOUR_', 'PLACEHOLDER', 'example.com']):
-                    urls.append(f"{path}: {match}")
-        
-        return urls
+        return HARDCODED_URL_SCAN.run(data, path).findings['hardcoded_urls']
     
     def find_sensitive_data(self, data: Any, path: str = "") -> List[str]:
         """Find sensitive data patterns"""
-        sensitive_locations = []
-        sensitive_patterns = [
-            r'password', r'token', r'key', r'secret', r'credential',
-            r'api_key', r'access_token', r'refresh_token', r'bearer'
-        ]
-        
-        if isinstance(data, dict):
-            for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
-                
-                if any(pattern in key.lower() for pattern in sensitive_patterns):
-                    if value and str(value).strip() and value != "":
-                        sensitive_locations.append(f"{current_path}: {str(value)[:50]}...")
-                
-                sensitive_locations.extend(self.find_sensitive_data(value, current_path))
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                sensitive_locations.extend(self.find_sensitive_data(item, f"{path}[{i}]"))
-        elif isinstance(data, str):
-            if re.search(r'[A-Za-z0-9]{20,}', data) and any(pattern in path.lower() for pattern in sensitive_patterns):
-                sensitive_locations.append(f"{path}: {data[:50]}...")
-        
-        return sensitive_locations
+        return SENSITIVE_DATA_SCAN.run(data, path).findings['sensitive_data']
     
     def has_error_handling(self, workflow_data: Dict) -> bool:
         """Check if workflow has error handling"""
@@ -333,55 +320,18 @@ class UltraAggressiveUpgrader:
     
     def fix_hardcoded_urls(self, workflow_data: Dict) -> Dict:
         """Replace hardcoded URLs with environment variables"""
-        def replace_urls(obj):
-            if isinstance(obj, dict):
-                new_obj = {}
-                for key, value in obj.items():
-                    if isinstance(value, str):
-                        new_value = re.sub(
-                            r'https?://[^\s<>"\'{}|\\^`\[\]]+',
-                            lambda m: '{{ $env.API_BASE_URL }}' if 'api' in m.group().lower() else '{{ $env.WEBHOOK_URL }}',
-                            value
-                        )
-                        new_obj[key] = new_value
-                    else:
-                        new_obj[key] = replace_urls(value)
-                return new_obj
-            elif isinstance(obj, list):
-                return [replace_urls(item) for item in obj]
-            else:
-                return obj
-        
-        return replace_urls(workflow_data)
+        HARDCODED_URL_FIX.run(workflow_data)
+        return workflow_data
     
     def fix_sensitive_data(self, workflow_data: Dict) -> Dict:
         """Replace sensitive data with placeholders"""
-        def replace_sensitive(obj):
-            if isinstance(obj, dict):
-                new_obj = {}
-                for key, value in obj.items():
-                    sensitive_patterns = ['password', 'token', 'key', 'secret', 'credential']
-                    if any(pattern in key.lower() for pattern in sensitive_patterns):
-                        if isinstance(value, str) and value.strip():
-                            if 'api_key' in key.lower():
-                                new_obj[key] = 'YOUR_API_KEY_HERE'
-                            elif 'token' in key.lower():
-                                new_obj[key] = 'YOUR_TOKEN_HERE'
-                            elif 'password' in key.lower():
-                                new_obj[key] = 'YOUR_PASSWORD_HERE'
-                            else:
-                                new_obj[key] = 'YOUR_CREDENTIAL_HERE'
-                        else:
-                            new_obj[key] = value
-                    else:
-                        new_obj[key] = replace_sensitive(value)
-                return new_obj
-            elif isinstance(obj, list):
-                return [replace_sensitive(item) for item in obj]
-            else:
-                return obj
-        
-        return replace_sensitive(workflow_data)
+        SENSITIVE_DATA_FIX.run(workflow_data)
+        return workflow_data
+    
+    def fix_security_issues(self, workflow_data: Dict) -> Dict:
+        """Replace hardcoded URLs and sensitive data in a single pass"""
+        SECURITY_FIXES.run(workflow_data)
+        return workflow_data
     
     def add_error_handling(self, workflow_data: Dict) -> Dict:
         """Add comprehensive error handling to workflow"""
@@ -394,9 +344,15 @@ class UltraAggressiveUpgrader:
             if any(critical in node_type for critical in ['http', 'webhook', 'database', 'api', 'email']):
                 critical_nodes.append(node['id'])
         
+        # Nodes that already have a handler (from an earlier run) get no second one
+        handler_ids = {node.get('id') for node in nodes if node.get('type') == 'n8n-nodes-base.stopAndError'}
+        
         for node_id in critical_nodes:
+            if any(target in handler_ids for _, _, target in iter_connection_targets(connections.get(node_id))):
+                continue
+            
             error_node = {
-                "id": f"error-handler-{node_id}-{uuid.uuid4().hex[:8]}",
+                "id": f"error-handler-{node_id}",
                 "name": f"Error Handler",
                 "type": "n8n-nodes-base.stopAndError",
                 "typeVersion": 1,
@@ -460,6 +416,10 @@ class UltraAggressiveUpgrader:
         """Add comprehensive documentation to workflow"""
         nodes = workflow_data.get('nodes', [])
         
+        # Re-runs refresh the existing note instead of adding another one
+        doc_node = next((node for node in nodes if node.get('name') == 'Workflow Documentation'
+                         and node.get('type') == 'n8n-nodes-base.stickyNote'), None)
+        
         if not workflow_data.get('description'):
             workflow_name = workflow_data.get('name', 'Workflow')
             workflow_data['description'] = f"Automated workflow: {workflow_name}. This workflow processes data and performs automated tasks."
@@ -470,7 +430,7 @@ class UltraAggressiveUpgrader:
 {workflow_data.get('description', 'This workflow automates various tasks.')}
 
 ## Workflow Details
-- **Total Nodes**: {len(nodes)}
+- **Total Nodes**: {len(nodes) - (1 if doc_node else 0)}
 - **Error Handling**: ✅ Implemented
 - **Security**: ✅ Hardened
 - **Documentation**: ✅ Complete
@@ -487,18 +447,19 @@ class UltraAggressiveUpgrader:
 - Follow security best practices
 """
         
-        doc_node = {
-            "id": f"documentation-{uuid.uuid4().hex[:8]}",
-            "name": "Workflow Documentation",
-            "type": "n8n-nodes-base.stickyNote",
-            "typeVersion": 1,
-            "position": [50, 50],
-            "parameters": {
-                "content": doc_content
-            }
-        }
-        
-        nodes.append(doc_node)
+        if doc_node:
+            doc_node.setdefault('parameters', {})['content'] = doc_content
+        else:
+            nodes.append({
+                "id": f"documentation-{uuid.uuid4().hex[:8]}",
+                "name": "Workflow Documentation",
+                "type": "n8n-nodes-base.stickyNote",
+                "typeVersion": 1,
+                "position": [50, 50],
+                "parameters": {
+                    "content": doc_content
+                }
+            })
         workflow_data['nodes'] = nodes
         return workflow_data
     
@@ -523,11 +484,15 @@ class UltraAggressiveUpgrader:
     
     def add_metadata(self, workflow_data: Dict) -> Dict:
         """Add workflow metadata"""
+        # Identity and timestamps from an earlier run are kept so re-runs do not rewrite the file;
+        # updatedAt is bumped by touch_metadata only when the workflow is actually rewritten
+        existing = workflow_data['meta'] if isinstance(workflow_data.get('meta'), dict) else {}
+        now = datetime.now().isoformat()
         workflow_data['meta'] = {
-            'instanceId': f"workflow-{uuid.uuid4().hex[:8]}",
+            'instanceId': existing.get('instanceId') or f"workflow-{uuid.uuid4().hex[:8]}",
             'versionId': '1.0.0',
-            'createdAt': datetime.now().isoformat(),
-            'updatedAt': datetime.now().isoformat(),
+            'createdAt': existing.get('createdAt') or now,
+            'updatedAt': existing.get('updatedAt') or now,
             'owner': 'n8n-user',
             'license': 'MIT',
             'category': 'automation',
@@ -536,6 +501,11 @@ class UltraAggressiveUpgrader:
         
         return workflow_data
     
+    def touch_metadata(self, workflow_data: Dict):
+        """Stamp meta.updatedAt on a workflow that is about to be rewritten"""
+        if isinstance(workflow_data.get('meta'), dict):
+            workflow_data['meta']['updatedAt'] = datetime.now().isoformat()
+    
     def add_tags(self, workflow_data: Dict) -> Dict:
         """Add workflow tags"""
         workflow_name = workflow_data.get('name', '').lower()
@@ -617,8 +587,7 @@ class UltraAggressiveUpgrader:
     def upgrade_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
         """ULTRA-AGGRESSIVE upgrade - FORCE excellent quality"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                original_data = json.load(f)
+            original_data, snapshot = load_for_update(workflow_path)
             
             workflow_data = original_data.copy()
             
@@ -628,12 +597,9 @@ class UltraAggressiveUpgrader:
             # ULTRA-AGGRESSIVE: Apply ALL fixes regardless of current state
             fixes_applied = []
             
-            # ALWAYS fix hardcoded URLs
-            workflow_data = self.fix_hardcoded_urls(workflow_data)
+            # ALWAYS fix hardcoded URLs and sensitive data (one pass)
+            workflow_data = self.fix_security_issues(workflow_data)
             fixes_applied.append('hardcoded_urls_fixed')
-            
-            # ALWAYS fix sensitive data
-            workflow_data = self.fix_sensitive_data(workflow_data)
             fixes_applied.append('sensitive_data_fixed')
             
             # ALWAYS add error handling
@@ -692,14 +658,14 @@ class UltraAggressiveUpgrader:
                 # Recalculate
                 final_quality = self.calculate_workflow_quality(workflow_data)
             
-            # Save upgraded workflow
-            with open(workflow_path, 'w', encoding='utf-8') as f:
-                json.dump(workflow_data, f, indent=2, ensure_ascii=False)
+            # Save upgraded workflow (unchanged files are left untouched)
+            written = write_workflow_if_changed(workflow_path, workflow_data, snapshot, self.touch_metadata)
             
             # Update statistics
             with self.thread_lock:
                 self.upgrade_stats['successful'] += 1
-                self.quality_metrics[final_quality.category].append(final_quality.score)
+                self.upgrade_stats['written' if written else 'unchanged'] += 1
+                self.quality_metrics[final_quality.category].add(final_quality.score)
             
             return {
                 'filename': workflow_path.name,
@@ -709,6 +675,7 @@ class UltraAggressiveUpgrader:
                 'improvement': final_quality.score - initial_quality.score,
                 'fixes_applied': fixes_applied,
                 'success': True,
+                'written': written,
                 'quality_category': final_quality.category,
                 'complexity': final_quality.complexity
             }
@@ -724,7 +691,7 @@ class UltraAggressiveUpgrader:
                 'success': False
             }
     
-    def upgrade_all_workflows(self) -> Dict[str, Any]:
+    def upgrade_all_workflows(self, stream_path: str = None) -> Dict[str, Any]:
         """ULTRA-AGGRESSIVE upgrade - NO MERCY!"""
         print("🚀 Starting ULTRA-AGGRESSIVE excellence upgrade...")
         print("🎯 TARGET: 100% EXCELLENT quality (90+ points) - NO MERCY!")
@@ -740,49 +707,56 @@ class UltraAggressiveUpgrader:
         print(f"📊 Found {len(workflow_files)} workflows to FORCE to excellence")
         
         # Process workflows in parallel
-        upgrade_results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_workflow = {
-                executor.submit(self.upgrade_single_workflow, workflow_file): workflow_file 
-                for workflow_file in workflow_files
-            }
-            
-            completed = 0
-            for future in concurrent.futures.as_completed(future_to_workflow):
-                workflow_file = future_to_workflow[future]
-                try:
-                    result = future.result()
-                    upgrade_results.append(result)
-                    completed += 1
+        summary = UpgradeSummary(stream_path)
+        if self.use_processes:
+            # CPU-bound work: one process per core, per-worker stats merged into this instance
+            for result in process_map(self, 'upgrade_single_workflow', workflow_files, {'workflows_dir': self.workflows_dir, 'backup_dir': self.backup_dir},
+                                      ('upgrade_stats', 'quality_metrics'), self.max_workers, self.chunk_size):
+                summary.add(result)
+                if summary.total % 100 == 0:
+                    print(f"💪 FORCING {summary.total}/{len(workflow_files)} workflows to excellence...")
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                completed = 0
+                for workflow_file, future in iter_completed(executor, self.upgrade_single_workflow, workflow_files, self.max_workers * 4):
+                    try:
+                        result = future.result()
+                        summary.add(result)
+                        completed += 1
                     
-                    if completed % 100 == 0:
-                        print(f"💪 FORCING {completed}/{len(workflow_files)} workflows to excellence...")
+                        if completed % 100 == 0:
+                            print(f"💪 FORCING {completed}/{len(workflow_files)} workflows to excellence...")
                         
-                except Exception as e:
-                    print(f"❌ Error processing {workflow_file.name}: {e}")
-                    upgrade_results.append({
-                        'filename': workflow_file.name,
-                        'category': workflow_file.parent.name,
-                        'error': str(e),
-                        'success': False
-                    })
+                    except Exception as e:
+                        print(f"❌ Error processing {workflow_file.name}: {e}")
+                        summary.add({
+                            'filename': workflow_file.name,
+                            'category': workflow_file.parent.name,
+                            'error': str(e),
+                            'success': False
+                        })
         
         # Calculate final statistics
-        successful_upgrades = sum(1 for r in upgrade_results if r.get('success', False))
-        failed_upgrades = len(upgrade_results) - successful_upgrades
+        summary.close()
+        successful_upgrades = summary.successful
+        failed_upgrades = summary.failed
         
         print(f"\n✅ ULTRA-AGGRESSIVE excellence upgrade complete!")
         print(f"📊 Processed {len(workflow_files)} workflows")
         print(f"💪 Successfully FORCED {successful_upgrades} workflows to excellence")
         print(f"❌ Failed upgrades: {failed_upgrades}")
+        print(f"💾 Rewrote {self.upgrade_stats['written']} files ({self.upgrade_stats['unchanged']} unchanged)")
         
         return {
             'total_workflows': len(workflow_files),
             'successful_upgrades': successful_upgrades,
             'failed_upgrades': failed_upgrades,
             'upgrade_stats': dict(self.upgrade_stats),
-            'quality_metrics': dict(self.quality_metrics),
-            'results': upgrade_results
+            'quality_metrics': {category: stats.summary() for category, stats in self.quality_metrics.items()},
+            'results': summary.detailed_results(),
+            'category_breakdown': dict(summary.category_breakdown),
+            'average_improvement': summary.average_improvement(),
+            'excellent_upgrades': summary.excellent
         }
     
     def generate_comprehensive_report(self, upgrade_results: Dict[str, Any]):
@@ -800,16 +774,12 @@ class UltraAggressiveUpgrader:
         
         # Quality distribution
         print(f"\n🎯 QUALITY DISTRIBUTION:")
-        for category, scores in upgrade_results['quality_metrics'].items():
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                print(f"   {category.title()}: {len(scores)} workflows (avg: {avg_score:.1f})")
+        for category, stats in upgrade_results['quality_metrics'].items():
+            if stats['count']:
+                print(f"   {category.title()}: {stats['count']} workflows (avg: {stats['mean']:.1f})")
         
         # Category breakdown
-        category_stats = defaultdict(int)
-        for result in upgrade_results['results']:
-            if result.get('success'):
-                category_stats[result.get('category', 'unknown')] += 1
+        category_stats = upgrade_results['category_breakdown']
         
         print(f"\n📁 CATEGORY BREAKDOWN:")
         for category, count in sorted(category_stats.items()):
@@ -836,33 +806,45 @@ class UltraAggressiveUpgrader:
         print(f"\n📄 Comprehensive report saved to: ultra_aggressive_report.json")
         
         # Generate summary statistics
-        if upgrade_results['results']:
-            successful_results = [r for r in upgrade_results['results'] if r.get('success')]
-            if successful_results:
-                avg_improvement = sum(r.get('improvement', 0) for r in successful_results) / len(successful_results)
-                print(f"\n📈 AVERAGE QUALITY IMPROVEMENT: {avg_improvement:.1f} points")
-                
-                excellent_count = sum(1 for r in successful_results if r.get('quality_category') == 'excellent')
-                print(f"🏆 WORKFLOWS ACHIEVING EXCELLENCE: {excellent_count}/{len(successful_results)} ({excellent_count/len(successful_results)*100:.1f}%)")
-                
-                if excellent_count == len(successful_results):
-                    print(f"\n🎉 MISSION ACCOMPLISHED! 100% EXCELLENT QUALITY ACHIEVED! 🎉")
-                    print(f"💪 ULTRA-AGGRESSIVE UPGRADE SUCCESSFUL!")
-                else:
-                    print(f"\n🎯 TARGET: {len(successful_results) - excellent_count} workflows still need improvement")
-                    print(f"💪 RUN AGAIN TO FORCE REMAINING WORKFLOWS TO EXCELLENCE!")
+        if upgrade_results['successful_upgrades']:
+            avg_improvement = upgrade_results['average_improvement']
+            print(f"\n📈 AVERAGE QUALITY IMPROVEMENT: {avg_improvement:.1f} points")
+            
+            excellent_count = upgrade_results['excellent_upgrades']
+            print(f"🏆 WORKFLOWS ACHIEVING EXCELLENCE: {excellent_count}/{upgrade_results['successful_upgrades']} ({excellent_count/upgrade_results['successful_upgrades']*100:.1f}%)")
+            
+            if excellent_count == upgrade_results['successful_upgrades']:
+                print(f"\n🎉 MISSION ACCOMPLISHED! 100% EXCELLENT QUALITY ACHIEVED! 🎉")
+                print(f"💪 ULTRA-AGGRESSIVE UPGRADE SUCCESSFUL!")
+            else:
+                print(f"\n🎯 TARGET: {upgrade_results['successful_upgrades'] - excellent_count} workflows still need improvement")
+                print(f"💪 RUN AGAIN TO FORCE REMAINING WORKFLOWS TO EXCELLENCE!")
 
 def main():
     """Main ULTRA-AGGRESSIVE excellence upgrade function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='ULTRA-AGGRESSIVE excellence upgrader')
+    parser.add_argument('--dir', help='Workflows directory')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parallel workers (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Workflows per worker task')
+    parser.add_argument('--threads', action='store_true', help='Use a thread pool instead of worker processes')
+    parser.add_argument('--stream', help='Write per-workflow results to this file (.jsonl, .csv or .parquet) '
+                                         'instead of keeping them in the JSON report')
+    args = parser.parse_args()
+    
     print("🎯 ULTRA-AGGRESSIVE Excellence Upgrader for n8n Workflows")
     print("💪 NO MERCY - FORCE 100% EXCELLENT QUALITY!")
     print("🎯 TARGET: 100% EXCELLENT QUALITY (90+ points)")
     print("=" * 70)
     
-    upgrader = UltraAggressiveUpgrader()
+    options = {'max_workers': args.workers, 'use_processes': not args.threads, 'chunk_size': args.chunk_size}
+    if args.dir:
+        options['workflows_dir'] = args.dir
+    upgrader = UltraAggressiveUpgrader(**options)
     
     # Run ULTRA-AGGRESSIVE upgrade
-    upgrade_results = upgrader.upgrade_all_workflows()
+    upgrade_results = upgrader.upgrade_all_workflows(args.stream)
     
     # Generate comprehensive report
     upgrader.generate_comprehensive_report(upgrade_results)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Validation Store - Persisted per-workflow validation results for incremental runs
+Results are keyed by file content hash and rule-set version, so re-runs only validate what changed.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_STORE_PATH = '.validation_cache.db'
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """MD5 of the file contents (same digest as the workflow database)."""
+    hash_md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
+
+
+def rules_version(version: Union[int, str], *module_names: str) -> str:
+    """Rule-set version: the validator's own constant plus a fingerprint of the modules holding its checks.
+
+    Editing any of those modules invalidates every stored result, so a
+    changed check is re-run even if nobody bumped the constant.
+    """
+    fingerprint = hashlib.md5()
+    for name in module_names:
+        module = sys.modules.get(name)
+        source = getattr(module, '__file__', None)
+        if source and os.path.exists(source):
+            with open(source, 'rb') as f:
+                fingerprint.update(f.read())
+    return f"{version}-{fingerprint.hexdigest()[:12]}"
+
+
+class ValidationStore:
+    """SQLite table of validation results for one validator and rule-set version.
+
+    ``lookup`` serves a stored result when the file's size and mtime are
+    unchanged, or when they changed but the content hash did not (e.g. after
+    a checkout). Results stored under another rule version never match.
+    """
+
+    def __init__(self, validator: str, rule_version: str, store_path: Optional[str] = None,
+                 flush_every: int = 256):
+        self.validator = validator
+        self.rule_version = rule_version
+        self.store_path = store_path or os.environ.get('WORKFLOW_VALIDATION_CACHE', DEFAULT_STORE_PATH)
+        self.flush_every = flush_every
+        self.stats = {'reused': 0, 'validated': 0}
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._index: Dict[str, Tuple[int, int, str, str]] = {}
+        self._conn = sqlite3.connect(self.store_path, check_same_thread=False)
+        self._init_store()
+        atexit.register(self.close)
+
+    def _init_store(self):
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS validation_results (
+                validator TEXT NOT NULL,
+                path TEXT NOT NULL,
+                file_hash TEXT NOT NULL,
+                rule_version TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                validated_at TEXT NOT NULL,
+                PRIMARY KEY (validator, path)
+            )
+        """)
+        conn.commit()
+
+        self._index = {
+            path: (size, mtime_ns, hash_value, version)
+            for path, size, mtime_ns, hash_value, version in conn.execute(
+                "SELECT path, size, mtime_ns, file_hash, rule_version FROM validation_results WHERE validator = ?",
+                (self.validator,)
+            )
+        }
+
+    def lookup(self, path: Union[str, Path]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """(stored result or None, content hash if it had to be computed)."""
+        key = os.path.abspath(path)
+        cached = self._index.get(key)
+        if not cached or cached[3] != self.rule_version:
+            return None, None
+
+        stat = os.stat(key)
+        if cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return self._result(key), cached[2]
+
+        current_hash = file_hash(key)
+        if current_hash != cached[2]:
+            return None, current_hash
+
+        result = self._result(key)
+        if result is not None:
+            with self._lock:
+                self._index[key] = (stat.st_size, stat.st_mtime_ns, current_hash, self.rule_version)
+                self._pending.append(('touch', key, stat.st_size, stat.st_mtime_ns))
+        return result, current_hash
+
+    def _result(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for pending in reversed(self._pending):
+                if pending[0] == 'store' and pending[1] == key:
+                    return json.loads(pending[6])
+            row = self._conn.execute(
+                "SELECT result FROM validation_results WHERE validator = ? AND path = ?", (self.validator, key)
+            ).fetchone()
+        if row:
+            self.stats['reused'] += 1
+            return json.loads(row[0])
+        return None
+
+    def store(self, path: Union[str, Path], result: Dict[str, Any], hash_value: Optional[str] = None):
+        """Remember the result of validating ``path`` under the current rule version."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        hash_value = hash_value or file_hash(key)
+        with self._lock:
+            self.stats['validated'] += 1
+            self._index[key] = (stat.st_size, stat.st_mtime_ns, hash_value, self.rule_version)
+            self._pending.append(('store', key, hash_value, self.rule_version, stat.st_size, stat.st_mtime_ns,
+                                  json.dumps(result)))
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        conn = self._conn
+        now = datetime.now().isoformat()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO validation_results "
+                "(validator, path, file_hash, rule_version, size, mtime_ns, result, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.validator,) + entry[1:] + (now,) for entry in self._pending if entry[0] == 'store']
+            )
+            conn.executemany(
+                "UPDATE validation_results SET size = ?, mtime_ns = ? WHERE validator = ? AND path = ?",
+                [(entry[2], entry[3], self.validator, entry[1]) for entry in self._pending if entry[0] == 'touch']
+            )
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Another process holds the write lock; keep the entries for the next flush
+            conn.rollback()
+            return
+        self._pending = []
+
+    def flush(self):
+        """Write pending results to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        try:
+            self.flush()
+            self._conn.close()
+        except sqlite3.ProgrammingError:
+            pass  # already closed
+
+    def prune(self, workflows_dir: Union[str, Path]) -> int:
+        """Drop results for files that no longer exist under workflows_dir."""
+        root = os.path.abspath(workflows_dir) + os.sep
+        stale = [path for path in self._index if path.startswith(root) and not os.path.exists(path)]
+        with self._lock:
+            self._flush_locked()
+            self._conn.executemany(
+                "DELETE FROM validation_results WHERE validator = ? AND path = ?",
+                [(self.validator, path) for path in stale]
+            )
+            self._conn.commit()
+            for path in stale:
+                del self._index[path]
+        return len(stale)
+
+    def iter_results(self, workflows_dir: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Stored results under workflows_dir for the current rule version, in path order."""
+        self.flush()
+        root = os.path.abspath(workflows_dir) + os.sep
+        rows = self._conn.execute(
+            "SELECT path, result FROM validation_results WHERE validator = ? AND rule_version = ? ORDER BY path",
+            (self.validator, self.rule_version)
+        )
+        for path, result in rows:
+            if path.startswith(root):
+                yield json.loads(result)
@@ -9,6 +9,8 @@ import glob
 from pathlib import Path
 from typing import Dict, List, Any
 
+from workflow_corpus import load_workflow
+
 class WorkflowActivator:
     """Analyze and activate workflows based on quality and completeness"""
     
@@ -30,8 +32,7 @@ class WorkflowActivator:
     def analyze_workflow_quality(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a workflow file for quality and activation potential"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_workflow(file_path)
         except (json.JSONDecodeError, FileNotFoundError):
             return {'quality_score': 0, 'issues': ['Invalid JSON or file not found']}
         
@@ -236,8 +237,7 @@ class WorkflowActivator:
             
             if analysis['quality_score'] >= threshold_score and analysis['activation_recommended']:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_workflow(file_path)
                     
                     # Set active flag
                     data['active'] = True
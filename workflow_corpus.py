@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Workflow Corpus - Parsed workflows shared by the batch analyzers
+Each file is parsed once and cached in SQLite, invalidated by size/mtime and then content hash.
+"""
+
+import atexit
+import hashlib
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+import json_backend
+
+# Bump when the cached representation changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_PATH = '.workflow_cache.db'
+
+
+class WorkflowCorpus:
+    """Persistent parse cache for workflow JSON files.
+
+    A lookup whose size and mtime match the cached entry is served without
+    reading the file. When the stat data changed but the MD5 of the content
+    did not (e.g. after a checkout), the entry is revalidated without parsing.
+    Documents are stored with ``marshal``, which round-trips JSON types and
+    loads several times faster than parsing the JSON again.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, flush_every: int = 256):
+        self.cache_path = cache_path or os.environ.get('WORKFLOW_CORPUS_CACHE', DEFAULT_CACHE_PATH)
+        self.flush_every = flush_every
+        self.stats = {'hits': 0, 'revalidated': 0, 'parsed': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._index: Dict[str, Tuple[int, int, str]] = {}
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._init_cache()
+        atexit.register(self.close)
+
+    def _init_cache(self):
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS corpus_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_cache (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                file_hash TEXT NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+
+        # marshal output is tied to the Python version, so that is part of the cache key too
+        version = f"{CACHE_VERSION}:{marshal.version}:{sys.version_info[:2]}"
+        row = conn.execute("SELECT value FROM corpus_meta WHERE key = 'version'").fetchone()
+        if not row or row[0] != version:
+            conn.execute("DELETE FROM workflow_cache")
+            conn.execute("INSERT OR REPLACE INTO corpus_meta (key, value) VALUES ('version', ?)", (version,))
+        conn.commit()
+
+        self._index = {
+            path: (size, mtime_ns, file_hash)
+            for path, size, mtime_ns, file_hash in conn.execute(
+                "SELECT path, size, mtime_ns, file_hash FROM workflow_cache"
+            )
+        }
+
+    def load(self, path: Union[str, Path]) -> Any:
+        """Parsed workflow JSON for ``path``; raises like ``json_backend.load_file``."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        cached = self._index.get(key)
+
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            payload = self._payload(key)
+            if payload is not None:
+                self.stats['hits'] += 1
+                return marshal.loads(payload)
+
+        with open(key, 'rb') as f:
+            raw = f.read()
+        file_hash = hashlib.md5(raw).hexdigest()
+
+        if cached and cached[2] == file_hash:
+            payload = self._payload(key)
+            if payload is not None:
+                self.stats['revalidated'] += 1
+                self._remember(key, stat, file_hash, None)
+                return marshal.loads(payload)
+
+        try:
+            data = json_backend.loads(raw)
+        except ValueError:
+            # Invalid JSON is not cached; callers see the parser's exception every time
+            self.stats['errors'] += 1
+            raise
+        self.stats['parsed'] += 1
+        self._remember(key, stat, file_hash, marshal.dumps(data))
+        return data
+
+    def _payload(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            for pending in reversed(self._pending):
+                if pending[0] == key and pending[4] is not None:
+                    return pending[4]
+            row = self._conn.execute("SELECT payload FROM workflow_cache WHERE path = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _remember(self, key: str, stat: os.stat_result, file_hash: str, payload: Optional[bytes]):
+        with self._lock:
+            self._index[key] = (stat.st_size, stat.st_mtime_ns, file_hash)
+            self._pending.append((key, stat.st_size, stat.st_mtime_ns, file_hash, payload))
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        conn = self._conn
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO workflow_cache (path, size, mtime_ns, file_hash, payload) VALUES (?, ?, ?, ?, ?)",
+                [entry for entry in self._pending if entry[4] is not None]
+            )
+            conn.executemany(
+                "UPDATE workflow_cache SET size = ?, mtime_ns = ? WHERE path = ?",
+                [(entry[1], entry[2], entry[0]) for entry in self._pending if entry[4] is None]
+            )
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Another process holds the write lock; keep the entries for the next flush
+            conn.rollback()
+            return
+        self._pending = []
+
+    def flush(self):
+        """Write pending cache entries to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        try:
+            self.flush()
+            self._conn.close()
+        except sqlite3.ProgrammingError:
+            pass  # already closed
+
+    @staticmethod
+    def category_files(workflows_dir: Union[str, Path]) -> Iterator[Path]:
+        """workflows/<category>/*.json in directory order (the layout the analyzers walk)."""
+        for category_dir in Path(workflows_dir).iterdir():
+            if category_dir.is_dir():
+                yield from category_dir.glob('*.json')
+
+    def iter_workflows(self, workflows_dir: Union[str, Path] = 'workflows',
+                       recursive: bool = False) -> Iterator[Tuple[Path, Any]]:
+        """Yield (path, parsed workflow) pairs; files that fail to parse are skipped."""
+        paths = Path(workflows_dir).rglob('*.json') if recursive else self.category_files(workflows_dir)
+        for path in paths:
+            try:
+                yield path, self.load(path)
+            except (ValueError, OSError):
+                continue
+        self.flush()
+
+    def prune(self, workflows_dir: Union[str, Path] = 'workflows') -> int:
+        """Drop cache entries for files that no longer exist under workflows_dir."""
+        root = os.path.abspath(workflows_dir) + os.sep
+        stale = [path for path in self._index if path.startswith(root) and not os.path.exists(path)]
+        with self._lock:
+            self._flush_locked()
+            self._conn.executemany("DELETE FROM workflow_cache WHERE path = ?", [(path,) for path in stale])
+            self._conn.commit()
+            for path in stale:
+                del self._index[path]
+        return len(stale)
+
+
+_corpora: Dict[str, WorkflowCorpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def get_corpus(cache_path: Optional[str] = None) -> WorkflowCorpus:
+    """Process-wide corpus for a cache file (shared by every analyzer in the process)."""
+    cache_path = os.path.abspath(cache_path or os.environ.get('WORKFLOW_CORPUS_CACHE', DEFAULT_CACHE_PATH))
+    with _corpora_lock:
+        corpus = _corpora.get(cache_path)
+        if corpus is None:
+            corpus = _corpora[cache_path] = WorkflowCorpus(cache_path)
+        return corpus
+
+
+def flush_corpora():
+    """Flush every corpus opened in this process (pool workers exit without running atexit)."""
+    with _corpora_lock:
+        corpora = list(_corpora.values())
+    for corpus in corpora:
+        corpus.flush()
+
+
+def load_workflow(path: Union[str, Path]) -> Any:
+    """Load a workflow through the shared cache (WORKFLOW_CORPUS_CACHE=off disables it)."""
+    if os.environ.get('WORKFLOW_CORPUS_CACHE', '').lower() in ('off', '0', 'none'):
+        return json_backend.load_file(path)
+    return get_corpus().load(path)
+
+
+def main():
+    """Command-line interface for the workflow corpus cache."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Workflow corpus parse cache')
+    parser.add_argument('--dir', default='workflows', help='Workflows directory')
+    parser.add_argument('--cache', help=f'Cache database (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--warm', action='store_true', help='Parse every workflow into the cache')
+    parser.add_argument('--prune', action='store_true', help='Remove entries for deleted files')
+
+    args = parser.parse_args()
+    corpus = get_corpus(args.cache)
+
+    if args.prune:
+        print(f"🧹 Removed {corpus.prune(args.dir)} stale cache entries")
+
+    if args.warm or not args.prune:
+        start = time.perf_counter()
+        count = sum(1 for _ in corpus.iter_workflows(args.dir, recursive=True))
+        elapsed = time.perf_counter() - start
+        print(f"✅ {count} workflows in {elapsed:.2f}s — {corpus.stats['hits']} cached, "
+              f"{corpus.stats['revalidated']} revalidated, {corpus.stats['parsed']} parsed, "
+              f"{corpus.stats['errors']} invalid")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import time
 
+from workflow_corpus import load_workflow
+
 @dataclass
 class WorkflowStats:
     """Workflow statistics and health metrics"""
@@ -45,85 +47,85 @@ class WorkflowDashboard:
         self.stats = {}
         self.categories = {}
         
-        total_workflows = 0
-        total_nodes = 0
-        total_connections = 0
-        total_size = 0
-        
         for category_path in self.workflows_dir.iterdir():
             if category_path.is_dir():
                 category = category_path.name
-                self.categories[category] = {
-                    'count': 0,
-                    'nodes': 0,
-                    'connections': 0,
-                    'size': 0,
-                    'active': 0,
-                    'inactive': 0,
-                    'errors': 0
-                }
+                self.add_category(category)
                 
                 for workflow_file in category_path.glob('*.json'):
                     try:
-                        with open(workflow_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        
-                        # Get file stats
-                        file_stat = workflow_file.stat()
-                        last_modified = datetime.fromtimestamp(file_stat.st_mtime)
-                        file_size = file_stat.st_size
-                        
-                        # Calculate quality score (simplified)
-                        quality_score = self._calculate_quality_score(data)
-                        
-                        # Determine status
-                        status = self._determine_status(data, quality_score)
-                        
-                        # Create workflow stats
-                        workflow_name = data.get('name', workflow_file.stem)
-                        stats = WorkflowStats(
-                            name=workflow_name,
-                            category=category,
-                            nodes=len(data.get('nodes', [])),
-                            connections=len(data.get('connections', {})),
-                            last_modified=last_modified,
-                            file_size=file_size,
-                            quality_score=quality_score,
-                            status=status
-                        )
-                        
-                        self.stats[workflow_name] = stats
-                        
-                        # Update category stats
-                        self.categories[category]['count'] += 1
-                        self.categories[category]['nodes'] += stats.nodes
-                        self.categories[category]['connections'] += stats.connections
-                        self.categories[category]['size'] += file_size
-                        
-                        if status == 'active':
-                            self.categories[category]['active'] += 1
-                        elif status == 'error':
-                            self.categories[category]['errors'] += 1
-                        else:
-                            self.categories[category]['inactive'] += 1
-                        
-                        # Update totals
-                        total_workflows += 1
-                        total_nodes += stats.nodes
-                        total_connections += stats.connections
-                        total_size += file_size
+                        data = load_workflow(workflow_file)
+                        self.record_workflow(self.build_workflow_stats(workflow_file, category, data))
                         
                     except Exception as e:
                         print(f"⚠️ Error processing {workflow_file}: {e}")
                         continue
         
+        return self.scan_summary()
+    
+    def add_category(self, category: str):
+        """Start an empty statistics bucket for a category folder"""
+        self.categories[category] = {
+            'count': 0,
+            'nodes': 0,
+            'connections': 0,
+            'size': 0,
+            'active': 0,
+            'inactive': 0,
+            'errors': 0
+        }
+    
+    def build_workflow_stats(self, workflow_file: Path, category: str, data: Dict) -> WorkflowStats:
+        """Statistics for one parsed workflow file"""
+        # Get file stats
+        file_stat = workflow_file.stat()
+        last_modified = datetime.fromtimestamp(file_stat.st_mtime)
+        file_size = file_stat.st_size
+        
+        # Calculate quality score (simplified)
+        quality_score = self._calculate_quality_score(data)
+        
+        # Determine status
+        status = self._determine_status(data, quality_score)
+        
+        return WorkflowStats(
+            name=data.get('name', workflow_file.stem),
+            category=category,
+            nodes=len(data.get('nodes', [])),
+            connections=len(data.get('connections', {})),
+            last_modified=last_modified,
+            file_size=file_size,
+            quality_score=quality_score,
+            status=status
+        )
+    
+    def record_workflow(self, stats: WorkflowStats):
+        """Add one workflow to the per-workflow and per-category statistics"""
+        self.stats[stats.name] = stats
+        
+        # Update category stats
+        category = self.categories[stats.category]
+        category['count'] += 1
+        category['nodes'] += stats.nodes
+        category['connections'] += stats.connections
+        category['size'] += stats.file_size
+        
+        if stats.status == 'active':
+            category['active'] += 1
+        elif stats.status == 'error':
+            category['errors'] += 1
+        else:
+            category['inactive'] += 1
+    
+    def scan_summary(self) -> Dict[str, Any]:
+        """Totals across all recorded categories"""
         self.last_scan = datetime.now()
         
         return {
-            'total_workflows': total_workflows,
-            'total_nodes': total_nodes,
-            'total_connections': total_connections,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
+            'total_workflows': sum(category['count'] for category in self.categories.values()),
+            'total_nodes': sum(category['nodes'] for category in self.categories.values()),
+            'total_connections': sum(category['connections'] for category in self.categories.values()),
+            'total_size_mb': round(sum(category['size'] for category in self.categories.values()) / (1024 * 1024), 2),
             'categories': self.categories,
             'last_scan': self.last_scan.isoformat()
         }
@@ -180,9 +182,10 @@ class WorkflowDashboard:
         else:
             return 'error'
     
-    def get_dashboard_data(self) -> Dict[str, Any]:
-        """Get comprehensive dashboard data"""
-        scan_data = self.scan_workflows()
+    def get_dashboard_data(self, scan_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get comprehensive dashboard data (pass scan_data to reuse an existing scan)"""
+        if scan_data is None:
+            scan_data = self.scan_workflows()
         
         # Calculate health metrics
         active_workflows = sum(1 for stats in self.stats.values() if stats.status == 'active')
@@ -255,9 +258,10 @@ class WorkflowDashboard:
         
         return distribution
     
-    def display_dashboard(self):
+    def display_dashboard(self, data: Dict[str, Any] = None):
         """Display the dashboard in console"""
-        data = self.get_dashboard_data()
+        if data is None:
+            data = self.get_dashboard_data()
         
         print("\n" + "="*80)
         print("🚀 N8N WORKFLOW DASHBOARD")
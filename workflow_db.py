@@ -10,9 +10,219 @@ import os
 import glob
 import datetime
 import hashlib
+import re
+import time
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+import json_backend
+from instrumentation import (
+    DB_QUERY_SECONDS, INDEX_GENERATION, INDEX_LAST_COMPLETED, INDEXER_FILES, INDEXER_RUN_SECONDS, timed
+)
+
+# Node type (n8n-nodes-base suffix, lowercased, "trigger" removed) -> integration name;
+# None marks utility nodes that are not integrations
+SERVICE_MAPPINGS = {
+    # Messaging & Communication
+    'telegram': 'Telegram',
+    'telegramTrigger': 'Telegram',
+    'discord': 'Discord',
+    'slack': 'Slack', 
+    'whatsapp': 'WhatsApp',
+    'mattermost': 'Mattermost',
+    'teams': 'Microsoft Teams',
+    'rocketchat': 'Rocket.Chat',
+    
+    # Email
+    'gmail': 'Gmail',
+    'mailjet': 'Mailjet',
+    'emailreadimap': 'Email (IMAP)',
+    'emailsendsmt': 'Email (SMTP)',
+    'outlook': 'Outlook',
+    
+    # Cloud Storage
+    'googledrive': 'Google Drive',
+    'googledocs': 'Google Docs',
+    'googlesheets': 'Google Sheets',
+    'dropbox': 'Dropbox',
+    'onedrive': 'OneDrive',
+    'box': 'Box',
+    
+    # Databases
+    'postgres': 'PostgreSQL',
+    'mysql': 'MySQL',
+    'mongodb': 'MongoDB',
+    'redis': 'Redis',
+    'airtable': 'Airtable',
+    'notion': 'Notion',
+    
+    # Project Management
+    'jira': 'Jira',
+    'github': 'GitHub',
+    'gitlab': 'GitLab',
+    'trello': 'Trello',
+    'asana': 'Asana',
+    'mondaycom': 'Monday.com',
+    
+    # AI/ML Services
+    'openai': 'OpenAI',
+    'anthropic': 'Anthropic',
+    'huggingface': 'Hugging Face',
+    
+    # Social Media
+    'linkedin': 'LinkedIn',
+    'twitter': 'Twitter/X',
+    'facebook': 'Facebook',
+    'instagram': 'Instagram',
+    
+    # E-commerce
+    'shopify': 'Shopify',
+    'stripe': 'Stripe',
+    'paypal': 'PayPal',
+    
+    # Analytics
+    'googleanalytics': 'Google Analytics',
+    'mixpanel': 'Mixpanel',
+    
+    # Calendar & Tasks
+    'googlecalendar': 'Google Calendar', 
+    'googletasks': 'Google Tasks',
+    'cal': 'Cal.com',
+    'calendly': 'Calendly',
+    
+    # Forms & Surveys
+    'typeform': 'Typeform',
+    'googleforms': 'Google Forms',
+    'form': 'Form Trigger',
+    
+    # Development Tools
+    'webhook': 'Webhook',
+    'httpRequest': 'HTTP Request',
+    'graphql': 'GraphQL',
+    'sse': 'Server-Sent Events',
+    
+    # Utility nodes (exclude from integrations)
+    'set': None,
+    'function': None,
+    'code': None,
+    'if': None,
+    'switch': None,
+    'merge': None,
+    'split': None,
+    'stickynote': None,
+    'stickyNote': None,
+    'wait': None,
+    'schedule': None,
+    'cron': None,
+    'manual': None,
+    'stopanderror': None,
+    'noop': None,
+    'noOp': None,
+    'error': None,
+    'limit': None,
+    'aggregate': None,
+    'summarize': None,
+    'filter': None,
+    'sort': None,
+    'removeDuplicates': None,
+    'dateTime': None,
+    'extractFromFile': None,
+    'convertToFile': None,
+    'readBinaryFile': None,
+    'readBinaryFiles': None,
+    'executionData': None,
+    'executeWorkflow': None,
+    'executeCommand': None,
+    'respondToWebhook': None,
+}
+
+# Name hints: mapping keys that can appear in a lowercased node name, in priority order.
+# Each alternative sits inside a lookahead so one scan reports, at every offset, the
+# highest-priority key starting there; the lowest priority over all offsets wins.
+_NAME_HINTS = [(key, value) for key, value in SERVICE_MAPPINGS.items() if value and key == key.lower()]
+_NAME_HINT_PRIORITY = {key: rank for rank, (key, value) in enumerate(_NAME_HINTS)}
+_NAME_HINT_PATTERN = re.compile('(?=(' + '|'.join(re.escape(key) for key, value in _NAME_HINTS) + '))')
+_CALC_TERMS = ('calcslive', 'calc', 'calculation')
+
+# Per-node trigger hints
+TRIGGER_WEBHOOK, TRIGGER_SCHEDULED, TRIGGER_OTHER = 'webhook', 'scheduled', 'trigger'
+
+
+@lru_cache(maxsize=4096)
+def _classify_node_type(node_type: str) -> Tuple[Optional[str], Optional[str]]:
+    """(trigger hint, service name) derived from the node type alone."""
+    lowered = node_type.lower()
+    if 'webhook' in lowered:
+        trigger = TRIGGER_WEBHOOK
+    elif 'cron' in lowered or 'schedule' in lowered:
+        trigger = TRIGGER_SCHEDULED
+    elif 'trigger' in lowered and 'manual' not in lowered:
+        trigger = TRIGGER_OTHER
+    else:
+        trigger = None
+
+    service_name = None
+    if node_type.startswith('n8n-nodes-base.'):
+        raw_service = node_type.replace('n8n-nodes-base.', '').lower().replace('trigger', '')
+        service_name = SERVICE_MAPPINGS.get(raw_service, raw_service.title() if raw_service else None)
+    elif node_type.startswith('@n8n/'):
+        raw_service = node_type.split('.')[-1].lower() if '.' in node_type else lowered
+        raw_service = raw_service.replace('trigger', '')
+        service_name = SERVICE_MAPPINGS.get(raw_service, raw_service.title() if raw_service else None)
+    elif '-' in node_type or '@' in node_type:
+        # Custom nodes like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
+        for part in lowered.split('.'):
+            if 'youtube' in part:
+                service_name = 'YouTube'
+                break
+            elif 'telegram' in part:
+                service_name = 'Telegram'
+                break
+            elif 'discord' in part:
+                service_name = 'Discord'
+                break
+            elif 'calcslive' in part:
+                service_name = 'CalcsLive'
+                break
+    return trigger, service_name
+
+
+def _name_hint(node_name: str) -> Optional[str]:
+    """Highest-priority service whose mapping key occurs in the lowercased node name."""
+    best = None
+    for match in _NAME_HINT_PATTERN.finditer(node_name):
+        rank = _NAME_HINT_PRIORITY[match.group(1)]
+        if best is None or rank < best:
+            best = rank
+    if best is None:
+        return None
+
+    key, value = _NAME_HINTS[best]
+    if key == 'cal' and any(term in node_name for term in _CALC_TERMS):
+        # "cal" inside calcslive/calculation is not Cal.com; take the next key in priority order
+        for key, value in _NAME_HINTS[best + 1:]:
+            if key in node_name:
+                return value
+        return None
+    return value
+
+
+@lru_cache(maxsize=65536)
+def classify_node(node_type: str, node_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """(trigger hint, integration name) for one node; memoized on (type, name)."""
+    lowered_name = node_name.lower()
+    trigger, service_name = _classify_node_type(node_type)
+    if 'webhook' in lowered_name:
+        trigger = TRIGGER_WEBHOOK
+
+    # Node names can override the type-derived service (e.g. an HTTP Request named "Slack API")
+    service_name = _name_hint(lowered_name) or service_name
+    if service_name == 'None':
+        service_name = None
+    return trigger, service_name
+
+
 class WorkflowDatabase:
     """High-performance SQLite database for workflow metadata and search."""
     
@@ -22,6 +232,7 @@ class WorkflowDatabase:
             db_path = os.environ.get('WORKFLOW_DB_PATH', 'workflows.db')
         self.db_path = db_path
         self.workflows_dir = "workflows"
+        self.profiler = None
         self.init_database()
     
     def init_database(self):
@@ -147,11 +358,19 @@ class WorkflowDatabase:
         
         return ' '.join(readable_parts)
     
+    def _read_workflow_file(self, file_path: str) -> bytes:
+        """Read the raw bytes of a workflow file."""
+        with open(file_path, 'rb') as f:
+            return f.read()
+    
+    def _parse_workflow_json(self, raw: bytes) -> Dict[str, Any]:
+        """Decode the fields the indexer uses from raw file bytes (partial parse)."""
+        return json_backend.loads_summary(raw)
+    
     def analyze_workflow_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Analyze a single workflow file and extract metadata."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._parse_workflow_json(self._read_workflow_file(file_path))
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Error reading {file_path}: {str(e)}")
             return None
@@ -213,178 +432,18 @@ class WorkflowDatabase:
         trigger_type = 'Manual'
         integrations = set()
         
-        # Enhanced service mapping for better recognition
-        service_mappings = {
-            # Messaging & Communication
-            'telegram': 'Telegram',
-            'telegramTrigger': 'Telegram',
-            'discord': 'Discord',
-            'slack': 'Slack', 
-            'whatsapp': 'WhatsApp',
-            'mattermost': 'Mattermost',
-            'teams': 'Microsoft Teams',
-            'rocketchat': 'Rocket.Chat',
-            
-            # Email
-            'gmail': 'Gmail',
-            'mailjet': 'Mailjet',
-            'emailreadimap': 'Email (IMAP)',
-            'emailsendsmt': 'Email (SMTP)',
-            'outlook': 'Outlook',
-            
-            # Cloud Storage
-            'googledrive': 'Google Drive',
-            'googledocs': 'Google Docs',
-            'googlesheets': 'Google Sheets',
-            'dropbox': 'Dropbox',
-            'onedrive': 'OneDrive',
-            'box': 'Box',
-            
-            # Databases
-            'postgres': 'PostgreSQL',
-            'mysql': 'MySQL',
-            'mongodb': 'MongoDB',
-            'redis': 'Redis',
-            'airtable': 'Airtable',
-            'notion': 'Notion',
-            
-            # Project Management
-            'jira': 'Jira',
-            'github': 'GitHub',
-            'gitlab': 'GitLab',
-            'trello': 'Trello',
-            'asana': 'Asana',
-            'mondaycom': 'Monday.com',
-            
-            # AI/ML Services
-            'openai': 'OpenAI',
-            'anthropic': 'Anthropic',
-            'huggingface': 'Hugging Face',
-            
-            # Social Media
-            'linkedin': 'LinkedIn',
-            'twitter': 'Twitter/X',
-            'facebook': 'Facebook',
-            'instagram': 'Instagram',
-            
-            # E-commerce
-            'shopify': 'Shopify',
-            'stripe': 'Stripe',
-            'paypal': 'PayPal',
-            
-            # Analytics
-            'googleanalytics': 'Google Analytics',
-            'mixpanel': 'Mixpanel',
-            
-            # Calendar & Tasks
-            'googlecalendar': 'Google Calendar', 
-            'googletasks': 'Google Tasks',
-            'cal': 'Cal.com',
-            'calendly': 'Calendly',
-            
-            # Forms & Surveys
-            'typeform': 'Typeform',
-            'googleforms': 'Google Forms',
-            'form': 'Form Trigger',
-            
-            # Development Tools
-            'webhook': 'Webhook',
-            'httpRequest': 'HTTP Request',
-            'graphql': 'GraphQL',
-            'sse': 'Server-Sent Events',
-            
-            # Utility nodes (exclude from integrations)
-            'set': None,
-            'function': None,
-            'code': None,
-            'if': None,
-            'switch': None,
-            'merge': None,
-            'split': None,
-            'stickynote': None,
-            'stickyNote': None,
-            'wait': None,
-            'schedule': None,
-            'cron': None,
-            'manual': None,
-            'stopanderror': None,
-            'noop': None,
-            'noOp': None,
-            'error': None,
-            'limit': None,
-            'aggregate': None,
-            'summarize': None,
-            'filter': None,
-            'sort': None,
-            'removeDuplicates': None,
-            'dateTime': None,
-            'extractFromFile': None,
-            'convertToFile': None,
-            'readBinaryFile': None,
-            'readBinaryFiles': None,
-            'executionData': None,
-            'executeWorkflow': None,
-            'executeCommand': None,
-            'respondToWebhook': None,
-        }
-        
         for node in nodes:
-            node_type = node.get('type', '')
-            node_name = node.get('name', '').lower()
+            trigger, service_name = classify_node(node.get('type', ''), node.get('name', ''))
             
             # Determine trigger type
-            if 'webhook' in node_type.lower() or 'webhook' in node_name:
+            if trigger == TRIGGER_WEBHOOK:
                 trigger_type = 'Webhook'
-            elif 'cron' in node_type.lower() or 'schedule' in node_type.lower():
+            elif trigger == TRIGGER_SCHEDULED:
                 trigger_type = 'Scheduled'
-            elif 'trigger' in node_type.lower() and trigger_type == 'Manual':
-                if 'manual' not in node_type.lower():
-                    trigger_type = 'Webhook'
-            
-            # Extract integrations with enhanced mapping
-            service_name = None
-            
-            # Handle n8n-nodes-base nodes
-            if node_type.startswith('n8n-nodes-base.'):
-                raw_service = node_type.replace('n8n-nodes-base.', '').lower()
-                raw_service = raw_service.replace('trigger', '')
-                service_name = service_mappings.get(raw_service, raw_service.title() if raw_service else None)
-            
-            # Handle @n8n/ namespaced nodes
-            elif node_type.startswith('@n8n/'):
-                raw_service = node_type.split('.')[-1].lower() if '.' in node_type else node_type.lower()
-                raw_service = raw_service.replace('trigger', '')
-                service_name = service_mappings.get(raw_service, raw_service.title() if raw_service else None)
-            
-            # Handle custom nodes
-            elif '-' in node_type or '@' in node_type:
-                # Try to extract service name from custom node names like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
-                parts = node_type.lower().split('.')
-                for part in parts:
-                    if 'youtube' in part:
-                        service_name = 'YouTube'
-                        break
-                    elif 'telegram' in part:
-                        service_name = 'Telegram'
-                        break
-                    elif 'discord' in part:
-                        service_name = 'Discord'
-                        break
-                    elif 'calcslive' in part:
-                        service_name = 'CalcsLive'
-                        break
-            
-            # Also check node names for service hints (but avoid false positives)
-            for service_key, service_value in service_mappings.items():
-                if service_key in node_name and service_value:
-                    # Avoid false positive: "cal" in calcslive-related terms should not match "Cal.com"
-                    if service_key == 'cal' and any(term in node_name.lower() for term in ['calcslive', 'calc', 'calculation']):
-                        continue
-                    service_name = service_value
-                    break
+            elif trigger == TRIGGER_OTHER and trigger_type == 'Manual':
+                trigger_type = 'Webhook'
             
-            # Add to integrations if valid service found
-            if service_name and service_name not in ['None', None]:
+            if service_name:
                 integrations.add(service_name)
         
         # Determine if complex based on node variety and count
@@ -453,25 +512,26 @@ class WorkflowDatabase:
             return {'processed': 0, 'skipped': 0, 'errors': 0}
         
         print(f"Indexing {len(json_files)} workflow files...")
+        run_start = time.perf_counter()
         
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         
         stats = {'processed': 0, 'skipped': 0, 'errors': 0}
+        profiler = self.profiler
+        if profiler:
+            profiler.begin_run()
         
         for file_path in json_files:
             filename = os.path.basename(file_path)
+            if profiler:
+                profiler.begin_file(file_path)
             
             try:
                 # Check if file needs to be reprocessed
                 if not force_reindex:
                     current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?", 
-                        (filename,)
-                    )
-                    row = cursor.fetchone()
-                    if row and row['file_hash'] == current_hash:
+                    if self._stored_file_hash(conn, filename) == current_hash:
                         stats['skipped'] += 1
                         continue
                 
@@ -482,28 +542,7 @@ class WorkflowDatabase:
                     continue
                 
                 # Insert or update in database
-                conn.execute("""
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
-                    workflow_data['filename'],
-                    workflow_data['name'],
-                    workflow_data['workflow_id'],
-                    workflow_data['active'],
-                    workflow_data['description'],
-                    workflow_data['trigger_type'],
-                    workflow_data['complexity'],
-                    workflow_data['node_count'],
-                    json.dumps(workflow_data['integrations']),
-                    json.dumps(workflow_data['tags']),
-                    workflow_data['created_at'],
-                    workflow_data['updated_at'],
-                    workflow_data['file_hash'],
-                    workflow_data['file_size']
-                ))
+                self._upsert_workflow(conn, workflow_data)
                 
                 stats['processed'] += 1
                 
@@ -511,13 +550,58 @@ class WorkflowDatabase:
                 print(f"Error processing {file_path}: {str(e)}")
                 stats['errors'] += 1
                 continue
-        
-        conn.commit()
+            finally:
+                if profiler:
+                    profiler.end_file()
+        
+        if profiler:
+            with profiler.stage('commit'):
+                conn.commit()
+            profiler.end_run()
+        else:
+            conn.commit()
         conn.close()
         
+        for result, count in stats.items():
+            INDEXER_FILES.inc(count, result=result)
+        INDEXER_RUN_SECONDS.observe(time.perf_counter() - run_start)
+        INDEX_GENERATION.inc()
+        INDEX_LAST_COMPLETED.set(time.time())
+        
         print(f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors")
         return stats
     
+    def _stored_file_hash(self, conn: sqlite3.Connection, filename: str) -> Optional[str]:
+        """File hash recorded at the last index run, if any."""
+        row = conn.execute("SELECT file_hash FROM workflows WHERE filename = ?", (filename,)).fetchone()
+        return row['file_hash'] if row else None
+    
+    def _upsert_workflow(self, conn: sqlite3.Connection, workflow_data: Dict[str, Any]):
+        """Insert or replace one analyzed workflow row."""
+        conn.execute("""
+            INSERT OR REPLACE INTO workflows (
+                filename, name, workflow_id, active, description, trigger_type,
+                complexity, node_count, integrations, tags, created_at, updated_at,
+                file_hash, file_size, analyzed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (
+            workflow_data['filename'],
+            workflow_data['name'],
+            workflow_data['workflow_id'],
+            workflow_data['active'],
+            workflow_data['description'],
+            workflow_data['trigger_type'],
+            workflow_data['complexity'],
+            workflow_data['node_count'],
+            json.dumps(workflow_data['integrations']),
+            json.dumps(workflow_data['tags']),
+            workflow_data['created_at'],
+            workflow_data['updated_at'],
+            workflow_data['file_hash'],
+            workflow_data['file_size']
+        ))
+    
+    @timed(DB_QUERY_SECONDS, operation='search_workflows')
     def search_workflows(self, query: str = "", trigger_filter: str = "all", 
                         complexity_filter: str = "all", active_only: bool = False,
                         limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
@@ -599,6 +683,7 @@ class WorkflowDatabase:
         conn.close()
         return results, total
     
+    @timed(DB_QUERY_SECONDS, operation='get_stats')
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         conn = sqlite3.connect(self.db_path)
@@ -668,6 +753,7 @@ class WorkflowDatabase:
             'development': ['Webhook', 'HTTP Request', 'GraphQL', 'Server-Sent Events', 'YouTube']
         }
 
+    @timed(DB_QUERY_SECONDS, operation='search_by_category')
     def search_by_category(self, category: str, limit: int = 50, offset: int = 0) -> Tuple[List[Dict], int]:
         """Search workflows by service category."""
         categories = self.get_service_categories()
@@ -731,12 +817,36 @@ def main():
     parser.add_argument('--force', action='store_true', help='Force reindex all files')
     parser.add_argument('--search', help='Search workflows')
     parser.add_argument('--stats', action='store_true', help='Show database statistics')
+    parser.add_argument('--profile', action='store_true', help='Index with per-stage timings and slowest files')
+    parser.add_argument('--profile-top', type=int, default=10, help='Number of slowest files to report')
+    parser.add_argument('--profile-json', help='Write the profile report as JSON to this file')
+    parser.add_argument('--pstats', help='Also run under cProfile and dump pstats to this file')
     
     args = parser.parse_args()
     
     db = WorkflowDatabase()
     
-    if args.index:
+    if args.profile:
+        from index_profiler import IndexProfiler
+        
+        profiler = IndexProfiler(top_n=args.profile_top).instrument(db)
+        if args.pstats:
+            import cProfile
+            
+            cprofiler = cProfile.Profile()
+            stats = cprofiler.runcall(db.index_all_workflows, force_reindex=args.force)
+            cprofiler.dump_stats(args.pstats)
+            print(f"💾 cProfile stats written to {args.pstats} (inspect with: python -m pstats {args.pstats})")
+        else:
+            stats = db.index_all_workflows(force_reindex=args.force)
+        
+        profiler.print_report()
+        if args.profile_json:
+            with open(args.profile_json, 'w', encoding='utf-8') as f:
+                json.dump(dict(profiler.report(), result=stats), f, indent=2)
+            print(f"💾 Profile report written to {args.profile_json}")
+    
+    elif args.index:
         stats = db.index_all_workflows(force_reindex=args.force)
         print(f"Indexed {stats['processed']} workflows")
     
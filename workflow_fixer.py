@@ -11,12 +11,18 @@ Comprehensive fixer for common n8n workflow issues including:
 
 import json
 import os
-import re
 import uuid
 from pathlib import Path
 from typing import Dict, List, Any, Set
 from collections import defaultdict
 
+from workflow_rules import RuleEngine, CredentialReferenceRule, UrlEnvironmentRule, SENSITIVE_KEY_PATTERNS
+from workflow_writer import load_for_update, write_workflow_if_changed
+
+SENSITIVE_DATA_FIX = RuleEngine([CredentialReferenceRule('sensitive_data', SENSITIVE_KEY_PATTERNS)])
+HARDCODED_URL_FIX = RuleEngine([UrlEnvironmentRule('hardcoded_urls')])
+SECURITY_FIXES = RuleEngine(SENSITIVE_DATA_FIX.rules + HARDCODED_URL_FIX.rules)
+
 class WorkflowFixer:
     def __init__(self, workflows_dir="workflows"):
         self.workflows_dir = Path(workflows_dir)
@@ -27,75 +33,24 @@ class WorkflowFixer:
             'error_handling_added': 0,
             'duplicate_names_fixed': 0,
             'structural_fixes': 0,
-            'naming_fixes': 0
+            'naming_fixes': 0,
+            'files_written': 0
         }
         
     def fix_sensitive_data(self, workflow_data: Dict) -> Dict:
         """Remove or replace sensitive data with placeholders"""
-        fixed = False
-        
-        def replace_sensitive_values(obj, path=""):
-            nonlocal fixed
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    
-                    # Check for sensitive data patterns
-                    sensitive_patterns = [
-                        r'password', r'token', r'key', r'secret', r'credential',
-                        r'api_key', r'access_token', r'refresh_token', r'sessionKey'
-                    ]
-                    
-                    if any(pattern in key.lower() for pattern in sensitive_patterns):
-                        if value and str(value).strip() and value != "":
-                            if isinstance(value, str) and not value.startswith('{{') and not value.startswith('${'):
-                                obj[key] = f"{{{{ $credentials.{key} }}}}"
-                                fixed = True
-                    
-                    # Recursively check nested objects
-                    replace_sensitive_values(value, current_path)
-                    
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    replace_sensitive_values(item, f"{path}[{i}]")
-        
-        replace_sensitive_values(workflow_data)
-        return workflow_data, fixed
+        result = SENSITIVE_DATA_FIX.run(workflow_data)
+        return workflow_data, 'sensitive_data' in result.fixed
     
     def fix_hardcoded_urls(self, workflow_data: Dict) -> Dict:
         """Replace hardcoded URLs with environment variables or placeholders"""
-        fixed = False
-        
-        def replace_urls(obj, path=""):
-            nonlocal fixed
-            if isinstance(obj, str):
-                # Match URLs but not expressions
-                url_pattern = r'https?://[^\s"\'<>]+'
-                urls = re.findall(url_pattern, obj)
-                
-                for url in urls:
-                    if not any(placeholder in obj for placeholder in ['{{', '${', 'YOUR_', 'PLACEHOLDER']):
-                        # Replace with environment variable pattern
-                        if 'myshopify.com' in url:
-                            obj = obj.replace(url, "{{ $env.SHOPIFY_URL }}")
-                        elif 'webhook' in url.lower():
-                            obj = obj.replace(url, "{{ $env.WEBHOOK_URL }}")
-                        else:
-                            obj = obj.replace(url, "{{ $env.API_BASE_URL }}")
-                        fixed = True
-                        
-            elif isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    obj[key] = replace_urls(value, current_path)
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    obj[i] = replace_urls(item, f"{path}[{i}]")
-                    
-            return obj
-        
-        workflow_data = replace_urls(workflow_data)
-        return workflow_data, fixed
+        result = HARDCODED_URL_FIX.run(workflow_data)
+        return workflow_data, 'hardcoded_urls' in result.fixed
+    
+    def fix_security_issues(self, workflow_data: Dict) -> Dict:
+        """Apply the sensitive data and URL fixes in a single pass"""
+        result = SECURITY_FIXES.run(workflow_data)
+        return workflow_data, 'sensitive_data' in result.fixed, 'hardcoded_urls' in result.fixed
     
     def add_error_handling(self, workflow_data: Dict) -> Dict:
         """Add error handling nodes to workflows that need them"""
@@ -303,8 +258,7 @@ class WorkflowFixer:
     def fix_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
         """Fix a single workflow file"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                workflow_data = json.load(f)
+            workflow_data, snapshot = load_for_update(workflow_path)
             
             fixes_applied = {
                 'security_fixes': False,
@@ -316,11 +270,8 @@ class WorkflowFixer:
             }
             
             # Apply all fixes
-            workflow_data, security_fixed = self.fix_sensitive_data(workflow_data)
-            fixes_applied['security_fixes'] = security_fixed
-            
-            workflow_data, url_fixed = self.fix_hardcoded_urls(workflow_data)
-            fixes_applied['security_fixes'] = fixes_applied['security_fixes'] or url_fixed
+            workflow_data, security_fixed, url_fixed = self.fix_security_issues(workflow_data)
+            fixes_applied['security_fixes'] = security_fixed or url_fixed
             
             workflow_data, error_fixed = self.add_error_handling(workflow_data)
             fixes_applied['error_handling_added'] = error_fixed
@@ -340,13 +291,13 @@ class WorkflowFixer:
             workflow_data = self.add_documentation(workflow_data)
             fixes_applied['documentation_added'] = True
             
-            # Save fixed workflow
-            with open(workflow_path, 'w', encoding='utf-8') as f:
-                json.dump(workflow_data, f, indent=2, ensure_ascii=False)
+            # Save fixed workflow (unchanged files are left untouched)
+            written = write_workflow_if_changed(workflow_path, workflow_data, snapshot)
             
             return {
                 'filename': workflow_path.name,
                 'fixed': True,
+                'written': written,
                 'fixes_applied': fixes_applied,
                 'workflow_name': workflow_data.get('name', 'Unnamed')
             }
@@ -381,6 +332,8 @@ class WorkflowFixer:
                     
                     if result['fixed']:
                         self.fix_stats['fixed_workflows'] += 1
+                        if result['written']:
+                            self.fix_stats['files_written'] += 1
                         
                         # Update specific fix counters
                         if result['fixes_applied']['security_fixes']:
@@ -410,6 +363,7 @@ class WorkflowFixer:
         print(f"📝 Duplicate names fixed: {self.fix_stats['duplicate_names_fixed']}")
         print(f"🏗️ Structural fixes: {self.fix_stats['structural_fixes']}")
         print(f"📋 Naming fixes: {self.fix_stats['naming_fixes']}")
+        print(f"💾 Files rewritten: {self.fix_stats['files_written']} (unchanged files are not touched)")
         
         return summary
     
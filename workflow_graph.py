@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Workflow Graph - Linear-time structural metrics for n8n workflow connections
+Builds the adjacency index once; depth, branching, cycles and reachability are all O(nodes + connections).
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DECISION_NODE_TYPES = ('if', 'switch', 'condition')
+
+# Node types that start an execution
+TRIGGER_TYPE_HINTS = ('trigger', 'webhook', 'cron', 'schedule', 'start')
+
+# Canvas annotations, never part of the execution graph
+ANNOTATION_TYPES = ('n8n-nodes-base.stickyNote',)
+
+
+def iter_connection_targets(outputs: Any) -> Iterator[Tuple[str, int, str]]:
+    """(connection type, output index, target node) for one source's entry in ``connections``.
+
+    Accepts the n8n shape ``{"main": [[{"node": ...}], ...]}`` and tolerates a
+    bare connection dict in place of an output list.
+    """
+    if not isinstance(outputs, dict):
+        return
+    for connection_type, slots in outputs.items():
+        if not isinstance(slots, list):
+            continue
+        for index, slot in enumerate(slots):
+            targets = slot if isinstance(slot, list) else [slot]
+            for connection in targets:
+                if isinstance(connection, dict) and 'node' in connection:
+                    yield connection_type, index, connection['node']
+
+
+class WorkflowGraph:
+    """Directed graph of a workflow, keyed by node name like n8n's ``connections``.
+
+    Connections keyed by node id (as written by some older fixers) are mapped
+    to the node's name. Endpoints that match no node are kept as vertices so
+    no connection is silently dropped.
+    """
+
+    def __init__(self, nodes: List[Dict], connections: Dict):
+        self.nodes: Dict[str, Dict] = {}
+        id_to_name = {}
+        for position, node in enumerate(nodes if isinstance(nodes, list) else []):
+            if not isinstance(node, dict):
+                continue
+            name = node.get('name') or node.get('id') or f"node-{position}"
+            self.nodes.setdefault(name, node)
+            if node.get('id') is not None:
+                id_to_name.setdefault(node['id'], name)
+
+        def resolve(key):
+            if key in self.nodes:
+                return key
+            return id_to_name.get(key, key)
+
+        self.successors: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        self.in_degree: Dict[str, int] = {name: 0 for name in self.nodes}
+        # Vertex -> the key it has in ``connections`` (differs when keyed by node id), in connections order
+        self.source_keys: Dict[str, str] = {}
+        self.edge_count = 0
+        self.main_slots = 0
+        self.main_slot_targets = 0
+
+        for key, outputs in (connections.items() if isinstance(connections, dict) else ()):
+            source = resolve(key)
+            self.source_keys.setdefault(source, key)
+            self._add_vertex(source)
+            if isinstance(outputs, dict) and isinstance(outputs.get('main'), list):
+                for slot in outputs['main']:
+                    if isinstance(slot, list):
+                        self.main_slots += 1
+                        self.main_slot_targets += len(slot)
+            for _, _, target in iter_connection_targets(outputs):
+                target = resolve(target)
+                self._add_vertex(target)
+                self.successors[source].append(target)
+                self.in_degree[target] += 1
+                self.edge_count += 1
+
+        self._components: Optional[List[List[str]]] = None
+
+    def _add_vertex(self, name: str):
+        if name not in self.successors:
+            self.successors[name] = []
+            self.in_degree[name] = 0
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.successors)
+
+    def sources(self) -> List[str]:
+        """Vertices without incoming connections."""
+        return [name for name, degree in self.in_degree.items() if degree == 0]
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's algorithm (iterative), components in reverse topological order."""
+        if self._components is not None:
+            return self._components
+
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self.successors:
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                vertex, child = work[-1]
+                children = self.successors[vertex]
+                if child < len(children):
+                    work[-1] = (vertex, child + 1)
+                    target = children[child]
+                    if target not in index_of:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, 0))
+                    elif target in on_stack:
+                        lowlink[vertex] = min(lowlink[vertex], index_of[target])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[vertex])
+                if lowlink[vertex] == index_of[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+
+        self._components = components
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of vertices that can reach each other (including self-loops)."""
+        return [
+            component for component in self.strongly_connected_components()
+            if len(component) > 1 or component[0] in self.successors[component[0]]
+        ]
+
+    def max_depth(self) -> int:
+        """Number of nodes on the longest execution path.
+
+        Computed over the component DAG in topological order; a cycle counts
+        once with all of its nodes (the longest simple path through it).
+        """
+        components = self.strongly_connected_components()
+        if not components:
+            return 0
+
+        component_of = {}
+        for position, component in enumerate(components):
+            for vertex in component:
+                component_of[vertex] = position
+
+        # Tarjan emits sinks first, so walking the list backwards is a topological order
+        depth = [0] * len(components)
+        best = 0
+        for position in range(len(components) - 1, -1, -1):
+            depth[position] += len(components[position])
+            best = max(best, depth[position])
+            for vertex in components[position]:
+                for target in self.successors[vertex]:
+                    target_position = component_of[target]
+                    if target_position != position and depth[target_position] < depth[position]:
+                        depth[target_position] = depth[position]
+        return best
+
+    def branching_factor(self) -> float:
+        """Average number of targets per 'main' output."""
+        return self.main_slot_targets / self.main_slots if self.main_slots > 0 else 0
+
+    def cyclomatic_complexity(self) -> int:
+        """Simplified cyclomatic complexity: decision nodes + 1."""
+        decision_nodes = 0
+        for node in self.nodes.values():
+            node_type = str(node.get('type', '')).lower()
+            if any(decision_type in node_type for decision_type in DECISION_NODE_TYPES):
+                decision_nodes += 1
+        return decision_nodes + 1
+
+    def entry_points(self) -> List[str]:
+        """Trigger nodes, or every connected source when no node looks like a trigger."""
+        triggers = [
+            name for name, node in self.nodes.items()
+            if any(hint in str(node.get('type', '')).lower() for hint in TRIGGER_TYPE_HINTS)
+        ]
+        if triggers:
+            return triggers
+        return [name for name in self.sources() if self.successors[name]]
+
+    def unreachable_nodes(self) -> List[str]:
+        """Nodes (annotations excluded) that no entry point leads to."""
+        reached = set(self.entry_points())
+        pending = list(reached)
+        while pending:
+            for target in self.successors[pending.pop()]:
+                if target not in reached:
+                    reached.add(target)
+                    pending.append(target)
+        return [
+            name for name, node in self.nodes.items()
+            if name not in reached and node.get('type') not in ANNOTATION_TYPES
+        ]
+
+    def metrics(self) -> Dict[str, Any]:
+        """All structural metrics in one dict."""
+        return {
+            'node_count': len(self.nodes),
+            'edge_count': self.edge_count,
+            'max_depth': self.max_depth(),
+            'branching_factor': self.branching_factor(),
+            'cyclomatic_complexity': self.cyclomatic_complexity(),
+            'cycles': self.cycles(),
+            'unreachable_nodes': self.unreachable_nodes()
+        }
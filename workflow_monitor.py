@@ -13,6 +13,8 @@ from typing import Dict, List, Any
 import requests
 from collections import defaultdict
 
+from workflow_corpus import load_workflow
+
 class WorkflowMonitor:
     def __init__(self, workflows_dir="workflows"):
         self.workflows_dir = Path(workflows_dir)
@@ -64,50 +66,64 @@ class WorkflowMonitor:
         """Generate comprehensive health report for all workflows"""
         print("🏥 Generating workflow health report...")
         
-        health_report = {
-            'timestamp': datetime.now().isoformat(),
-            'total_workflows': 0,
-            'healthy_workflows': 0,
-            'warning_workflows': 0,
-            'critical_workflows': 0,
-            'workflow_details': {},
-            'common_issues': defaultdict(int),
-            'recommendations': []
-        }
+        health_report = self.new_health_report()
         
         for category_dir in self.workflows_dir.iterdir():
             if category_dir.is_dir():
                 for workflow_file in category_dir.glob('*.json'):
                     try:
-                        with open(workflow_file, 'r', encoding='utf-8') as f:
-                            workflow_data = json.load(f)
+                        workflow_data = load_workflow(workflow_file)
                         
                         health_status = self.check_workflow_health(workflow_data)
                         workflow_name = workflow_data.get('name', workflow_file.stem)
-                        
-                        health_report['total_workflows'] += 1
-                        health_report['workflow_details'][workflow_name] = health_status
-                        
-                        if health_status['status'] == 'healthy':
-                            health_report['healthy_workflows'] += 1
-                        elif health_status['status'] == 'warning':
-                            health_report['warning_workflows'] += 1
-                        else:
-                            health_report['critical_workflows'] += 1
-                        
-                        # Track common issues
-                        for issue in health_status['issues']:
-                            health_report['common_issues'][issue] += 1
-                        for warning in health_status['warnings']:
-                            health_report['common_issues'][warning] += 1
+                        self.record_health(health_report, workflow_name, health_status)
                             
                     except Exception as e:
-                        health_report['workflow_details'][workflow_file.name] = {
-                            'status': 'error',
-                            'issues': [f'Failed to parse: {str(e)}']
-                        }
-                        health_report['critical_workflows'] += 1
+                        self.record_health_error(health_report, workflow_file.name, e)
         
+        return self.finish_health_report(health_report)
+    
+    def new_health_report(self) -> Dict[str, Any]:
+        """Empty health report to accumulate results into"""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'total_workflows': 0,
+            'healthy_workflows': 0,
+            'warning_workflows': 0,
+            'critical_workflows': 0,
+            'workflow_details': {},
+            'common_issues': defaultdict(int),
+            'recommendations': []
+        }
+    
+    def record_health(self, health_report: Dict[str, Any], workflow_name: str, health_status: Dict[str, Any]):
+        """Add one workflow's health status to the report"""
+        health_report['total_workflows'] += 1
+        health_report['workflow_details'][workflow_name] = health_status
+        
+        if health_status['status'] == 'healthy':
+            health_report['healthy_workflows'] += 1
+        elif health_status['status'] == 'warning':
+            health_report['warning_workflows'] += 1
+        else:
+            health_report['critical_workflows'] += 1
+        
+        # Track common issues
+        for issue in health_status['issues']:
+            health_report['common_issues'][issue] += 1
+        for warning in health_status['warnings']:
+            health_report['common_issues'][warning] += 1
+    
+    def record_health_error(self, health_report: Dict[str, Any], filename: str, error: Exception):
+        """Record a workflow that could not be parsed"""
+        health_report['workflow_details'][filename] = {
+            'status': 'error',
+            'issues': [f'Failed to parse: {str(error)}']
+        }
+        health_report['critical_workflows'] += 1
+    
+    def finish_health_report(self, health_report: Dict[str, Any]) -> Dict[str, Any]:
+        """Add recommendations once all workflows are recorded"""
         # Generate recommendations
         if health_report['warning_workflows'] > health_report['total_workflows'] * 0.3:
             health_report['recommendations'].append('Consider adding error handling to more workflows')
@@ -229,11 +245,12 @@ class WorkflowMonitor:
         
         print("📊 Dashboard saved to: workflow_dashboard.html")
     
-    def run_monitoring(self):
-        """Run complete monitoring process"""
+    def run_monitoring(self, health_report: Dict[str, Any] = None):
+        """Run complete monitoring process (pass health_report if it is already generated)"""
         print("🔍 Starting workflow monitoring...")
         
-        health_report = self.generate_health_report()
+        if health_report is None:
+            health_report = self.generate_health_report()
         
         # Print summary
         print(f"\n📊 HEALTH SUMMARY:")
@@ -4,12 +4,13 @@ Comprehensive Workflow Pattern Analysis
 Analyze n8n workflows to identify common patterns, best practices, and optimization opportunities.
 """
 
-import json
 import os
 from pathlib import Path
 from collections import defaultdict, Counter
 import re
 
+from workflow_corpus import load_workflow
+
 class WorkflowPatternAnalyzer:
     def __init__(self, workflows_dir="workflows"):
         self.workflows_dir = Path(workflows_dir)
@@ -21,11 +22,11 @@ class WorkflowPatternAnalyzer:
         self.error_handling_patterns = Counter()
         self.data_flow_patterns = defaultdict(list)
         
-    def analyze_workflow(self, workflow_path):
-        """Analyze a single workflow file"""
+    def analyze_workflow(self, workflow_path, data=None):
+        """Analyze a single workflow file (pass data if it is already parsed)"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if data is None:
+                data = load_workflow(workflow_path)
             
             nodes = data.get('nodes', [])
             connections = data.get('connections', {})
@@ -80,6 +81,16 @@ class WorkflowPatternAnalyzer:
             print(f"Error analyzing {workflow_path}: {e}")
             return None
     
+    def merge(self, other):
+        """Fold another analyzer's counters into this one (e.g. from a worker process)"""
+        for name in ('patterns', 'node_types', 'integrations', 'trigger_patterns',
+                     'complexity_distribution', 'error_handling_patterns'):
+            target = getattr(self, name)
+            for key, count in getattr(other, name).items():
+                target[key] += count
+        for key, values in other.data_flow_patterns.items():
+            self.data_flow_patterns[key].extend(values)
+    
     def get_complexity_level(self, node_count):
         """Determine workflow complexity level"""
         if node_count <= 5:
@@ -11,7 +11,22 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
-import statistics
+
+from report_stream import OnlineStats, TopK, open_sink
+from workflow_corpus import load_workflow
+from workflow_graph import WorkflowGraph
+
+# Flattened columns of the per-workflow analyses when streamed to CSV or Parquet
+ANALYSIS_FIELDS = (
+    'filename', 'workflow_name', 'overall_score', 'best_practices_score',
+    'complexity.node_count', 'complexity.connection_count', 'complexity.max_depth',
+    'complexity.branching_factor', 'complexity.cyclomatic_complexity',
+    'complexity.node_type_diversity', 'complexity.complexity_score',
+    'performance.http_requests', 'performance.database_operations', 'performance.file_operations',
+    'performance.api_calls', 'performance.loops', 'performance.error_handling',
+    'performance.caching_opportunities', 'performance.performance_score',
+    'optimization_opportunities', 'error'
+)
 
 class WorkflowPerformanceAnalyzer:
     def __init__(self, workflows_dir="workflows"):
@@ -28,13 +43,14 @@ class WorkflowPerformanceAnalyzer:
         """Analyze workflow complexity metrics"""
         nodes = workflow_data.get('nodes', [])
         connections = workflow_data.get('connections', {})
+        graph = WorkflowGraph(nodes, connections)
         
         complexity_metrics = {
             'node_count': len(nodes),
             'connection_count': sum(len(conns) for conns in connections.values()),
-            'max_depth': self.calculate_max_depth(nodes, connections),
-            'branching_factor': self.calculate_branching_factor(connections),
-            'cyclomatic_complexity': self.calculate_cyclomatic_complexity(nodes, connections),
+            'max_depth': graph.max_depth(),
+            'branching_factor': graph.branching_factor(),
+            'cyclomatic_complexity': graph.cyclomatic_complexity(),
             'node_type_diversity': len(set(node.get('type', '') for node in nodes)),
             'complexity_score': 0
         }
@@ -95,76 +111,15 @@ class WorkflowPerformanceAnalyzer:
     
     def calculate_max_depth(self, nodes: List[Dict], connections: Dict) -> int:
         """Calculate maximum depth of workflow execution"""
-        # Find trigger nodes (nodes with no incoming connections)
-        trigger_nodes = []
-        for node in nodes:
-            node_id = node.get('id', '')
-            is_trigger = True
-            for source_connections in connections.values():
-                for output_connections in source_connections.values():
-                    if isinstance(output_connections, list):
-                        for connection in output_connections:
-                            if isinstance(connection, dict) and connection.get('node') == node_id:
-                                is_trigger = False
-                                break
-            if is_trigger:
-                trigger_nodes.append(node_id)
-        
-        def get_depth(node_id, visited=None):
-            if visited is None:
-                visited = set()
-            
-            if node_id in visited:
-                return 0  # Circular reference
-            
-            visited.add(node_id)
-            max_child_depth = 0
-            
-            if node_id in connections:
-                for output_connections in connections[node_id].values():
-                    if isinstance(output_connections, list):
-                        for connection in output_connections:
-                            if isinstance(connection, dict) and 'node' in connection:
-                                child_depth = get_depth(connection['node'], visited.copy())
-                                max_child_depth = max(max_child_depth, child_depth)
-            
-            return max_child_depth + 1
-        
-        max_depth = 0
-        for trigger in trigger_nodes:
-            depth = get_depth(trigger)
-            max_depth = max(max_depth, depth)
-        
-        return max_depth
+        return WorkflowGraph(nodes, connections).max_depth()
     
     def calculate_branching_factor(self, connections: Dict) -> float:
         """Calculate average branching factor"""
-        if not connections:
-            return 0
-        
-        total_branches = 0
-        total_nodes = 0
-        
-        for node_id, node_connections in connections.items():
-            if 'main' in node_connections:
-                for output_connections in node_connections['main']:
-                    if isinstance(output_connections, list):
-                        total_branches += len(output_connections)
-                        total_nodes += 1
-        
-        return total_branches / total_nodes if total_nodes > 0 else 0
+        return WorkflowGraph([], connections).branching_factor()
     
     def calculate_cyclomatic_complexity(self, nodes: List[Dict], connections: Dict) -> int:
         """Calculate cyclomatic complexity (simplified)"""
-        decision_nodes = 0
-        
-        for node in nodes:
-            node_type = node.get('type', '').lower()
-            if any(decision_type in node_type for decision_type in ['if', 'switch', 'condition']):
-                decision_nodes += 1
-        
-        # Cyclomatic complexity = Decision nodes + 1
-        return decision_nodes + 1
+        return WorkflowGraph(nodes, connections).cyclomatic_complexity()
     
     def analyze_performance_patterns(self, workflow_data: Dict) -> Dict[str, Any]:
         """Analyze performance-related patterns"""
@@ -290,11 +245,11 @@ class WorkflowPerformanceAnalyzer:
         
         return min(100, score)
     
-    def analyze_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
-        """Analyze a single workflow comprehensively"""
+    def analyze_single_workflow(self, workflow_path: Path, workflow_data: Dict = None) -> Dict[str, Any]:
+        """Analyze a single workflow comprehensively (pass workflow_data if it is already parsed)"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                workflow_data = json.load(f)
+            if workflow_data is None:
+                workflow_data = load_workflow(workflow_path)
             
             workflow_name = workflow_data.get('name', workflow_path.stem)
             
@@ -326,65 +281,77 @@ class WorkflowPerformanceAnalyzer:
                 'overall_score': 0
             }
     
-    def analyze_all_workflows(self) -> Dict[str, Any]:
-        """Analyze all workflows and generate comprehensive report"""
+    def analyze_all_workflows(self, stream_path: str = None) -> Dict[str, Any]:
+        """Analyze all workflows and generate comprehensive report (stream_path writes analyses as they finish)"""
         print("📊 Analyzing workflow performance...")
         
+        summary = self.new_analysis_summary(stream_path)
+        for category_dir in self.workflows_dir.iterdir():
+            if category_dir.is_dir():
+                for workflow_file in category_dir.glob('*.json'):
+                    self.record_analysis(summary, self.analyze_single_workflow(workflow_file))
+        
+        return self.finish_analysis_summary(summary)
+    
+    def new_analysis_summary(self, stream_path: str = None) -> Dict[str, Any]:
+        """Online accumulators for the performance report"""
+        sink = open_sink(stream_path, ANALYSIS_FIELDS) if stream_path else None
+        return {
+            'total_workflows': 0,
+            'sink': sink,
+            'workflow_analyses': None if sink else [],
+            'scores': OnlineStats(),
+            'top_performers': TopK(10, key=lambda analysis: analysis['overall_score']),
+            'optimization_candidates': TopK(10, key=lambda analysis: analysis['overall_score'], largest=False)
+        }
+    
+    def record_analysis(self, summary: Dict[str, Any], analysis: Dict[str, Any]):
+        """Fold one workflow analysis into the summary"""
+        summary['total_workflows'] += 1
+        if summary['sink']:
+            summary['sink'].write(analysis)
+        else:
+            summary['workflow_analyses'].append(analysis)
+        
+        if 'overall_score' in analysis:
+            summary['scores'].add(analysis['overall_score'])
+            summary['top_performers'].add(analysis)
+            if analysis['overall_score'] < 70:
+                summary['optimization_candidates'].add(analysis)
+    
+    def finish_analysis_summary(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the performance report from the accumulated analyses"""
+        sink = summary['sink']
+        if sink:
+            sink.close()
+        
         analysis_results = {
             'timestamp': datetime.now().isoformat(),
-            'total_workflows': 0,
-            'workflow_analyses': [],
+            'total_workflows': summary['total_workflows'],
+            'workflow_analyses': str(sink.path) if sink else summary['workflow_analyses'],
             'summary_statistics': {},
-            'top_performers': [],
-            'optimization_candidates': [],
+            'top_performers': summary['top_performers'].items(),
+            'optimization_candidates': summary['optimization_candidates'].items(),
             'recommendations': []
         }
         
-        all_scores = []
-        
-        for category_dir in self.workflows_dir.iterdir():
-            if category_dir.is_dir():
-                for workflow_file in category_dir.glob('*.json'):
-                    analysis_results['total_workflows'] += 1
-                    analysis = self.analyze_single_workflow(workflow_file)
-                    analysis_results['workflow_analyses'].append(analysis)
-                    
-                    if 'overall_score' in analysis:
-                        all_scores.append(analysis['overall_score'])
+        scores = summary['scores']
         
         # Calculate summary statistics
-        if all_scores:
+        if scores.count:
             analysis_results['summary_statistics'] = {
-                'average_score': round(statistics.mean(all_scores), 1),
-                'median_score': round(statistics.median(all_scores), 1),
-                'min_score': min(all_scores),
-                'max_score': max(all_scores),
+                'average_score': round(scores.mean(), 1),
+                'median_score': round(scores.median(), 1),
+                'min_score': scores.min,
+                'max_score': scores.max,
                 'score_distribution': {
-                    'excellent (90-100)': len([s for s in all_scores if s >= 90]),
-                    'good (80-89)': len([s for s in all_scores if 80 <= s < 90]),
-                    'fair (70-79)': len([s for s in all_scores if 70 <= s < 80]),
-                    'poor (<70)': len([s for s in all_scores if s < 70])
+                    'excellent (90-100)': scores.count_where(lambda s: s >= 90),
+                    'good (80-89)': scores.count_where(lambda s: 80 <= s < 90),
+                    'fair (70-79)': scores.count_where(lambda s: 70 <= s < 80),
+                    'poor (<70)': scores.count_where(lambda s: s < 70)
                 }
             }
         
-        # Find top performers
-        sorted_analyses = sorted(
-            [a for a in analysis_results['workflow_analyses'] if 'overall_score' in a],
-            key=lambda x: x['overall_score'],
-            reverse=True
-        )
-        analysis_results['top_performers'] = sorted_analyses[:10]
-        
-        # Find optimization candidates
-        optimization_candidates = [
-            a for a in analysis_results['workflow_analyses']
-            if 'overall_score' in a and a['overall_score'] < 70
-        ]
-        analysis_results['optimization_candidates'] = sorted(
-            optimization_candidates,
-            key=lambda x: x['overall_score']
-        )[:10]
-        
         # Generate recommendations
         if analysis_results['summary_statistics']['average_score'] < 75:
             analysis_results['recommendations'].append("Overall workflow quality needs improvement")
@@ -394,6 +361,13 @@ class WorkflowPerformanceAnalyzer:
         
         return analysis_results
     
+    def summarize_analyses(self, workflow_analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the performance report from per-workflow analyses"""
+        summary = self.new_analysis_summary()
+        for analysis in workflow_analyses:
+            self.record_analysis(summary, analysis)
+        return self.finish_analysis_summary(summary)
+    
     def generate_performance_report(self, analysis_results: Dict[str, Any]):
         """Generate comprehensive performance report"""
         print("\n" + "="*60)
@@ -434,8 +408,16 @@ class WorkflowPerformanceAnalyzer:
 
 def main():
     """Main performance analysis function"""
-    analyzer = WorkflowPerformanceAnalyzer()
-    analysis_results = analyzer.analyze_all_workflows()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Analyze n8n workflow performance')
+    parser.add_argument('--dir', default='workflows', help='Workflows directory')
+    parser.add_argument('--stream', help='Write per-workflow analyses to this file (.jsonl, .csv or .parquet) '
+                                         'instead of keeping them in the JSON report')
+    args = parser.parse_args()
+    
+    analyzer = WorkflowPerformanceAnalyzer(args.dir)
+    analysis_results = analyzer.analyze_all_workflows(args.stream)
     analyzer.generate_performance_report(analysis_results)
     
     print(f"\n🎉 Performance analysis complete!")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Workflow Pipeline - Run the batch analyzers in a single pass over the workflows
+Each workflow is loaded once and streamed through every selected stage; chunks run in a process pool.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from workflow_corpus import load_workflow, flush_corpora
+
+STAGE_ORDER = ('validate', 'performance', 'health', 'patterns', 'dashboard')
+
+
+class PipelineStage:
+    """One analyzer in the pipeline.
+
+    ``process`` runs in worker processes and returns a picklable per-file
+    result; ``end_chunk`` may return a partial aggregate for the whole chunk.
+    ``collect``/``collect_chunk`` fold those into the main-process analyzer
+    in directory order, and ``finish`` writes the analyzer's usual reports.
+    """
+
+    name = ''
+
+    def __init__(self, workflows_dir: str):
+        self.workflows_dir = workflows_dir
+
+    def begin_chunk(self):
+        pass
+
+    def process(self, workflow_path: Path, category: str, data: Any) -> Any:
+        raise NotImplementedError
+
+    def end_chunk(self) -> Any:
+        return None
+
+    def add_category(self, category: str):
+        pass
+
+    def collect(self, result: Any):
+        pass
+
+    def collect_chunk(self, partial: Any):
+        pass
+
+    def finish(self):
+        pass
+
+
+class ValidateStage(PipelineStage):
+    name = 'validate'
+
+    def __init__(self, workflows_dir: str):
+        super().__init__(workflows_dir)
+        from workflow_validator import WorkflowValidator
+        self.validator = WorkflowValidator(workflows_dir)
+        self.summary = self.validator.new_validation_summary()
+
+    def process(self, workflow_path, category, data):
+        return self.validator.validate_single_workflow(workflow_path, data)
+
+    def collect(self, result):
+        self.validator.record_result(self.summary, result)
+
+    def finish(self):
+        summary = self.validator.finish_validation_summary(self.summary)
+        print(f"✅ Validated {summary['total_workflows']} workflows")
+        print(f"📊 {summary['valid_workflows']} workflows passed validation ({summary['validation_rate']:.1f}%)")
+        print(f"⭐ {summary['high_quality_workflows']} workflows are high quality ({summary['quality_rate']:.1f}%)")
+        self.validator.generate_validation_report(summary)
+
+
+class PerformanceStage(PipelineStage):
+    name = 'performance'
+
+    def __init__(self, workflows_dir: str):
+        super().__init__(workflows_dir)
+        from workflow_performance_analyzer import WorkflowPerformanceAnalyzer
+        self.analyzer = WorkflowPerformanceAnalyzer(workflows_dir)
+        self.summary = self.analyzer.new_analysis_summary()
+
+    def process(self, workflow_path, category, data):
+        return self.analyzer.analyze_single_workflow(workflow_path, data)
+
+    def collect(self, result):
+        self.analyzer.record_analysis(self.summary, result)
+
+    def finish(self):
+        self.analyzer.generate_performance_report(self.analyzer.finish_analysis_summary(self.summary))
+
+
+class HealthStage(PipelineStage):
+    name = 'health'
+
+    def __init__(self, workflows_dir: str):
+        super().__init__(workflows_dir)
+        from workflow_monitor import WorkflowMonitor
+        self.monitor = WorkflowMonitor(workflows_dir)
+        self.health_report = self.monitor.new_health_report()
+
+    def process(self, workflow_path, category, data):
+        # Mirrors generate_health_report: any failure marks the file as an error
+        try:
+            if data is None:
+                data = load_workflow(workflow_path)
+            health_status = self.monitor.check_workflow_health(data)
+            return True, data.get('name', workflow_path.stem), health_status
+        except Exception as e:
+            return False, workflow_path.name, str(e)
+
+    def collect(self, result):
+        ok, name, value = result
+        if ok:
+            self.monitor.record_health(self.health_report, name, value)
+        else:
+            self.monitor.record_health_error(self.health_report, name, value)
+
+    def finish(self):
+        self.monitor.run_monitoring(self.monitor.finish_health_report(self.health_report))
+
+
+class PatternsStage(PipelineStage):
+    name = 'patterns'
+
+    def __init__(self, workflows_dir: str):
+        super().__init__(workflows_dir)
+        self.analyzer = self._new_analyzer()
+        self.analyzed_count = 0
+
+    def _new_analyzer(self):
+        from workflow_pattern_analysis import WorkflowPatternAnalyzer
+        return WorkflowPatternAnalyzer(self.workflows_dir)
+
+    def begin_chunk(self):
+        self.analyzer = self._new_analyzer()
+
+    def process(self, workflow_path, category, data):
+        return self.analyzer.analyze_workflow(workflow_path, data) is not None
+
+    def end_chunk(self):
+        return self.analyzer
+
+    def collect(self, result):
+        if result:
+            self.analyzed_count += 1
+
+    def collect_chunk(self, partial):
+        self.analyzer.merge(partial)
+
+    def finish(self):
+        print(f"✅ Analyzed {self.analyzed_count} workflows")
+        if self.analyzed_count > 0:
+            self.analyzer.generate_report()
+            self.analyzer.generate_recommendations()
+        else:
+            print("❌ No workflows found to analyze.")
+
+
+class DashboardStage(PipelineStage):
+    name = 'dashboard'
+
+    def __init__(self, workflows_dir: str):
+        super().__init__(workflows_dir)
+        from workflow_dashboard import WorkflowDashboard
+        self.dashboard = WorkflowDashboard(workflows_dir)
+
+    def process(self, workflow_path, category, data):
+        # Mirrors scan_workflows: unreadable workflows are reported and skipped
+        try:
+            if data is None:
+                data = load_workflow(workflow_path)
+            return self.dashboard.build_workflow_stats(workflow_path, category, data)
+        except Exception as e:
+            print(f"⚠️ Error processing {workflow_path}: {e}")
+            return None
+
+    def add_category(self, category):
+        self.dashboard.add_category(category)
+
+    def collect(self, result):
+        if result is not None:
+            self.dashboard.record_workflow(result)
+
+    def finish(self):
+        data = self.dashboard.get_dashboard_data(self.dashboard.scan_summary())
+        self.dashboard.display_dashboard(data)
+        with open('dashboard_data.json', 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        print(f"\n💾 Dashboard data saved to: dashboard_data.json")
+
+
+STAGES = {
+    'validate': ValidateStage,
+    'performance': PerformanceStage,
+    'health': HealthStage,
+    'patterns': PatternsStage,
+    'dashboard': DashboardStage
+}
+
+# Per-process stage instances used by process_chunk
+_worker_stages: List[PipelineStage] = []
+
+
+def _init_worker(stage_names: Tuple[str, ...], workflows_dir: str):
+    global _worker_stages
+    _worker_stages = [STAGES[name](workflows_dir) for name in stage_names]
+
+
+def process_chunk(chunk: List[Tuple[str, str]]) -> Tuple[List[List[Any]], List[Any]]:
+    """Run every stage over a chunk of (path, category) pairs, loading each file once."""
+    for stage in _worker_stages:
+        stage.begin_chunk()
+
+    results = [[] for _ in _worker_stages]
+    for path, category in chunk:
+        workflow_path = Path(path)
+        try:
+            data = load_workflow(workflow_path)
+        except Exception:
+            # Each analyzer re-reads the file and reports the failure its own way
+            data = None
+        for stage_results, stage in zip(results, _worker_stages):
+            stage_results.append(stage.process(workflow_path, category, data))
+
+    partials = [stage.end_chunk() for stage in _worker_stages]
+    flush_corpora()
+    return results, partials
+
+
+class WorkflowPipeline:
+    """Stream every workflow once through the selected analyzer stages."""
+
+    def __init__(self, workflows_dir: str = "workflows", stages=STAGE_ORDER, jobs: Optional[int] = None,
+                 chunk_size: int = 64):
+        self.workflows_dir = workflows_dir
+        self.stage_names = tuple(name for name in STAGE_ORDER if name in stages)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.stages = [STAGES[name](workflows_dir) for name in self.stage_names]
+
+    def iter_chunks(self) -> Iterator[List[Tuple[str, str]]]:
+        """(path, category) chunks in the directory order the analyzers walk."""
+        chunk = []
+        for category_dir in Path(self.workflows_dir).iterdir():
+            if category_dir.is_dir():
+                for stage in self.stages:
+                    stage.add_category(category_dir.name)
+                for workflow_file in category_dir.glob('*.json'):
+                    chunk.append((str(workflow_file), category_dir.name))
+                    if len(chunk) >= self.chunk_size:
+                        yield chunk
+                        chunk = []
+        if chunk:
+            yield chunk
+
+    def _collect(self, chunk_result: Tuple[List[List[Any]], List[Any]]) -> int:
+        results, partials = chunk_result
+        for stage, stage_results, partial in zip(self.stages, results, partials):
+            for result in stage_results:
+                stage.collect(result)
+            if partial is not None:
+                stage.collect_chunk(partial)
+        return len(results[0]) if results else 0
+
+    def run(self) -> Dict[str, Any]:
+        """Process all workflows, then write each stage's reports."""
+        print(f"🚀 Running {', '.join(self.stage_names)} over {self.workflows_dir} ({self.jobs} jobs)...")
+        start = time.perf_counter()
+        processed = 0
+
+        if self.jobs == 1:
+            _init_worker(self.stage_names, self.workflows_dir)
+            for chunk in self.iter_chunks():
+                processed += self._collect(process_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                     initargs=(self.stage_names, self.workflows_dir)) as executor:
+                # map keeps chunk order, so reports list workflows exactly as the standalone scripts do
+                for chunk_result in executor.map(process_chunk, self.iter_chunks()):
+                    processed += self._collect(chunk_result)
+
+        elapsed = time.perf_counter() - start
+        print(f"✅ Processed {processed} workflows in {elapsed:.2f}s")
+
+        for stage in self.stages:
+            print(f"\n{'=' * 60}\n📋 {stage.name.upper()}\n{'=' * 60}")
+            stage.finish()
+
+        return {'workflows': processed, 'stages': list(self.stage_names), 'seconds': round(elapsed, 2)}
+
+
+def main():
+    """Command-line interface for the analyzer pipeline."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the workflow analyzers in a single pass')
+    parser.add_argument('--dir', default='workflows', help='Workflows directory')
+    parser.add_argument('--stages', default=','.join(STAGE_ORDER), help='Comma-separated stages to run')
+    parser.add_argument('--jobs', type=int, help='Worker processes (default: CPU count, 1 runs inline)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Workflows per worker task')
+
+    args = parser.parse_args()
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGE_ORDER)})")
+
+    pipeline = WorkflowPipeline(args.dir, stages, args.jobs, args.chunk_size)
+    pipeline.run()
+
+    print(f"\n🎉 Pipeline complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Workflow Rules - Single-pass rule engine for scanning and fixing workflow JSON trees
+Every registered rule sees each dict entry / list item during one traversal; patterns are compiled once.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Union
+
+# Key fragments that mark a value as a secret
+SENSITIVE_KEY_PATTERNS = ('password', 'token', 'key', 'secret', 'credential',
+                          'api_key', 'access_token', 'refresh_token')
+
+# Strings containing one of these are templated, not hardcoded
+URL_PLACEHOLDERS = ('{{', '${', 'YOUR_', 'PLACEHOLDER')
+
+SIMPLE_URL_PATTERN = re.compile(r'https?://[^\s]+')
+QUOTED_URL_PATTERN = re.compile(r'https?://[^\s"\'<>]+')
+STRICT_URL_PATTERN = re.compile(r'https?://[^\s<>"\'{}|\\^`\[\]]+')
+TOKEN_LIKE_PATTERN = re.compile(r'[A-Za-z0-9]{20,}')
+
+# Returned by Rule.visit to stop that rule from descending into the current value
+PRUNE = object()
+
+Container = Union[Dict[str, Any], List[Any]]
+
+
+def substring_pattern(fragments: Iterable[str]) -> Pattern:
+    """One compiled alternation instead of ``any(fragment in text for fragment in fragments)``."""
+    return re.compile('|'.join(re.escape(fragment) for fragment in fragments))
+
+
+def has_value(value: Any) -> bool:
+    """Same test as ``value and str(value).strip()`` without stringifying containers."""
+    if isinstance(value, str):
+        return bool(value.strip())
+    return bool(value)
+
+
+class ScanResult:
+    """Findings per rule (in traversal order) and the names of rules that changed the tree."""
+
+    def __init__(self, rules: Sequence['Rule']):
+        self.findings: Dict[str, List[str]] = {rule.name: [] for rule in rules}
+        self.fixed: Set[str] = set()
+
+    def issues(self) -> List[str]:
+        """All findings, grouped by rule in registration order."""
+        return [finding for findings in self.findings.values() for finding in findings]
+
+
+class Rule:
+    """A check and/or fix applied to every child of every dict and list in a workflow tree.
+
+    ``visit`` receives the container, the key (or list index), the current
+    value and its dotted path. Fixes assign ``parent[key]``; rules registered
+    later see the new value. Return ``PRUNE`` to skip the value's subtree for
+    this rule only.
+    """
+
+    name = 'rule'
+
+    def visit(self, parent: Container, key: Any, value: Any, path: str, result: ScanResult) -> Optional[object]:
+        raise NotImplementedError
+
+
+class RuleEngine:
+    """Apply a fixed list of rules in a single depth-first traversal."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = tuple(rules)
+
+    def run(self, data: Any, path: str = "") -> ScanResult:
+        result = ScanResult(self.rules)
+        if isinstance(data, (dict, list)):
+            self._walk(data, path, self.rules, result)
+        return result
+
+    def _walk(self, obj: Container, path: str, rules: Sequence[Rule], result: ScanResult):
+        if isinstance(obj, dict):
+            for key in obj:
+                self._visit(obj, key, f"{path}.{key}" if path else key, rules, result)
+        else:
+            for index in range(len(obj)):
+                self._visit(obj, index, f"{path}[{index}]", rules, result)
+
+    def _visit(self, parent: Container, key: Any, path: str, rules: Sequence[Rule], result: ScanResult):
+        active = rules
+        for rule in rules:
+            if rule.visit(parent, key, parent[key], path, result) is PRUNE:
+                active = tuple(other for other in active if other is not rule)
+
+        value = parent[key]
+        if active and isinstance(value, (dict, list)):
+            self._walk(value, path, active, result)
+
+
+class SensitiveDataRule(Rule):
+    """Report keys that look like secrets and hold a value.
+
+    With ``token_strings`` it also reports long token-like strings anywhere
+    under a sensitive-looking path.
+    """
+
+    def __init__(self, name: str, patterns: Iterable[str], describe: Callable[[str, Any], str],
+                 token_strings: bool = False):
+        self.name = name
+        self.pattern = substring_pattern(patterns)
+        self.describe = describe
+        self.token_strings = token_strings
+
+    def visit(self, parent, key, value, path, result):
+        if isinstance(key, str) and self.pattern.search(key.lower()) and has_value(value):
+            result.findings[self.name].append(self.describe(path, value))
+        if self.token_strings and isinstance(value, str) and TOKEN_LIKE_PATTERN.search(value) \
+                and self.pattern.search(path.lower()):
+            result.findings[self.name].append(f"{path}: {value[:50]}...")
+
+
+class HardcodedUrlRule(Rule):
+    """Report strings containing URLs that are not templated (once per string, or once per URL)."""
+
+    def __init__(self, name: str, pattern: Pattern, describe: Callable[[str, str], str],
+                 placeholders: Sequence[str] = URL_PLACEHOLDERS, per_match: bool = False):
+        self.name = name
+        self.pattern = pattern
+        self.describe = describe
+        self.placeholders = tuple(placeholders)
+        self.per_match = per_match
+
+    def visit(self, parent, key, value, path, result):
+        if not isinstance(value, str) or '://' not in value:
+            return None
+        if any(placeholder in value for placeholder in self.placeholders):
+            return None
+        findings = result.findings[self.name]
+        if self.per_match:
+            findings.extend(self.describe(path, match) for match in self.pattern.findall(value))
+        else:
+            match = self.pattern.search(value)
+            if match:
+                findings.append(self.describe(path, match.group()))
+
+
+class CredentialReferenceRule(Rule):
+    """Replace literal secrets with ``{{ $credentials.<key> }}`` references."""
+
+    def __init__(self, name: str, patterns: Iterable[str]):
+        self.name = name
+        self.pattern = substring_pattern(patterns)
+
+    def visit(self, parent, key, value, path, result):
+        if isinstance(key, str) and isinstance(value, str) and value.strip() \
+                and not value.startswith(('{{', '${')) and self.pattern.search(key.lower()):
+            parent[key] = f"{{{{ $credentials.{key} }}}}"
+            result.fixed.add(self.name)
+
+
+class UrlEnvironmentRule(Rule):
+    """Replace the first hardcoded URL of a string with an environment variable."""
+
+    def __init__(self, name: str, pattern: Pattern = QUOTED_URL_PATTERN):
+        self.name = name
+        self.pattern = pattern
+
+    def visit(self, parent, key, value, path, result):
+        if not isinstance(value, str) or '://' not in value:
+            return None
+        if any(placeholder in value for placeholder in URL_PLACEHOLDERS):
+            return None
+        match = self.pattern.search(value)
+        if match:
+            url = match.group()
+            if 'myshopify.com' in url:
+                replacement = "{{ $env.SHOPIFY_URL }}"
+            elif 'webhook' in url.lower():
+                replacement = "{{ $env.WEBHOOK_URL }}"
+            else:
+                replacement = "{{ $env.API_BASE_URL }}"
+            parent[key] = value.replace(url, replacement)
+            result.fixed.add(self.name)
+
+
+class UrlSubstitutionRule(Rule):
+    """Replace every URL in string values of objects with API/webhook environment variables."""
+
+    def __init__(self, name: str, pattern: Pattern = STRICT_URL_PATTERN):
+        self.name = name
+        self.pattern = pattern
+
+    @staticmethod
+    def _replacement(match) -> str:
+        return '{{ $env.API_BASE_URL }}' if 'api' in match.group().lower() else '{{ $env.WEBHOOK_URL }}'
+
+    def visit(self, parent, key, value, path, result):
+        if isinstance(parent, dict) and isinstance(value, str) and '://' in value:
+            new_value = self.pattern.sub(self._replacement, value)
+            if new_value != value:
+                parent[key] = new_value
+                result.fixed.add(self.name)
+
+
+class SecretPlaceholderRule(Rule):
+    """Replace secrets with YOUR_*_HERE placeholders; values under secret keys are not descended into."""
+
+    def __init__(self, name: str, patterns: Iterable[str] = ('password', 'token', 'key', 'secret', 'credential')):
+        self.name = name
+        self.pattern = substring_pattern(patterns)
+
+    def visit(self, parent, key, value, path, result):
+        if not isinstance(parent, dict):
+            return None
+        lowered = key.lower()
+        if not self.pattern.search(lowered):
+            return None
+        if isinstance(value, str) and value.strip():
+            if 'api_key' in lowered:
+                parent[key] = 'YOUR_API_KEY_HERE'
+            elif 'token' in lowered:
+                parent[key] = 'YOUR_TOKEN_HERE'
+            elif 'password' in lowered:
+                parent[key] = 'YOUR_PASSWORD_HERE'
+            else:
+                parent[key] = 'YOUR_CREDENTIAL_HERE'
+            result.fixed.add(self.name)
+        return PRUNE
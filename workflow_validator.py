@@ -8,16 +8,42 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
-import re
 from collections import defaultdict
 
+from workflow_corpus import load_workflow
+from workflow_graph import WorkflowGraph
+from workflow_rules import RuleEngine, SensitiveDataRule, HardcodedUrlRule, SENSITIVE_KEY_PATTERNS, SIMPLE_URL_PATTERN
+from report_stream import open_sink
+from validation_store import ValidationStore, rules_version
+
+# Bump when a check changes in a way the source fingerprint cannot see (e.g. data it depends on)
+VALIDATION_RULES_VERSION = 1
+
+# Columns of the per-workflow results when streamed to CSV or Parquet
+RESULT_FIELDS = ('filename', 'workflow_name', 'quality_score', 'node_count', 'has_error_handling', 'issues')
+
+NODE_PARAMETER_RULES = RuleEngine([
+    SensitiveDataRule('sensitive_data', SENSITIVE_KEY_PATTERNS, lambda path, value: f"Sensitive data found in {path}"),
+    HardcodedUrlRule('hardcoded_urls', SIMPLE_URL_PATTERN, lambda path, url: f"Hardcoded URL found in {path}")
+])
+
 class WorkflowValidator:
-    def __init__(self, workflows_dir="workflows"):
+    def __init__(self, workflows_dir="workflows", incremental=True, store_path=None):
         self.workflows_dir = Path(workflows_dir)
         self.validation_results = defaultdict(list)
         self.quality_scores = {}
         self.security_issues = []
         self.best_practice_violations = []
+        self.incremental = incremental
+        self.store_path = store_path
+        self._store = None
+    
+    def get_validation_store(self) -> ValidationStore:
+        """Stored results for this validator's current rule set (opened on first use)"""
+        if self._store is None:
+            version = rules_version(VALIDATION_RULES_VERSION, __name__, 'workflow_rules', 'workflow_graph')
+            self._store = ValidationStore('workflow_validator', version, self.store_path)
+        return self._store
         
     def validate_workflow_structure(self, workflow_data: Dict) -> List[str]:
         """Validate basic workflow structure"""
@@ -56,47 +82,8 @@ class WorkflowValidator:
     
     def validate_node_configuration(self, node: Dict) -> List[str]:
         """Validate individual node configuration"""
-        issues = []
-        
-        # Check for sensitive data in parameters
-        parameters = node.get('parameters', {})
-        sensitive_patterns = [
-            r'password', r'token', r'key', r'secret', r'credential',
-            r'api_key', r'access_token', r'refresh_token'
-        ]
-        
-        def check_sensitive_data(obj, path=""):
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    if any(pattern in key.lower() for pattern in sensitive_patterns):
-                        if value and str(value).strip() and value != "":
-                            issues.append(f"Sensitive data found in {current_path}")
-                    check_sensitive_data(value, current_path)
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    check_sensitive_data(item, f"{path}[{i}]")
-        
-        check_sensitive_data(parameters)
-        
-        # Check for hardcoded URLs (potential security issue)
-        def check_hardcoded_urls(obj, path=""):
-            if isinstance(obj, str):
-                url_pattern = r'https?://[^\s]+'
-                if re.search(url_pattern, obj):
-                    if not any(placeholder in obj for placeholder in ['{{', '${', 'YOUR_', 'PLACEHOLDER']):
-                        issues.append(f"Hardcoded URL found in {path}")
-            elif isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    check_hardcoded_urls(value, current_path)
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    check_hardcoded_urls(item, f"{path}[{i}]")
-        
-        check_hardcoded_urls(parameters)
-        
-        return issues
+        # Sensitive data and hardcoded URLs (potential security issue) in one pass over the parameters
+        return NODE_PARAMETER_RULES.run(node.get('parameters', {})).issues()
     
     def validate_error_handling(self, workflow_data: Dict) -> List[str]:
         """Check for proper error handling"""
@@ -181,50 +168,7 @@ class WorkflowValidator:
     
     def calculate_workflow_depth(self, connections: Dict, nodes: List[Dict]) -> int:
         """Calculate the maximum depth of the workflow"""
-        # Find trigger nodes (nodes with no incoming connections)
-        node_ids = {node['id'] for node in nodes}
-        
-        def get_depth(node_id, visited=None):
-            if visited is None:
-                visited = set()
-            
-            if node_id in visited:
-                return 0  # Circular reference
-            
-            visited.add(node_id)
-            max_child_depth = 0
-            
-            if node_id in connections:
-                for output_connections in connections[node_id].values():
-                    if isinstance(output_connections, list):
-                        for connection in output_connections:
-                            if isinstance(connection, dict) and 'node' in connection:
-                                child_depth = get_depth(connection['node'], visited.copy())
-                                max_child_depth = max(max_child_depth, child_depth)
-            
-            return max_child_depth + 1
-        
-        # Find trigger nodes and calculate max depth
-        trigger_nodes = []
-        for node in nodes:
-            node_id = node['id']
-            is_trigger = True
-            for source_connections in connections.values():
-                for output_connections in source_connections.values():
-                    if isinstance(output_connections, list):
-                        for connection in output_connections:
-                            if isinstance(connection, dict) and connection.get('node') == node_id:
-                                is_trigger = False
-                                break
-            if is_trigger:
-                trigger_nodes.append(node_id)
-        
-        max_depth = 0
-        for trigger in trigger_nodes:
-            depth = get_depth(trigger)
-            max_depth = max(max_depth, depth)
-        
-        return max_depth
+        return WorkflowGraph(nodes, connections).max_depth()
     
     def calculate_quality_score(self, workflow_data: Dict, issues: List[str]) -> int:
         """Calculate quality score for workflow (0-100)"""
@@ -249,11 +193,11 @@ class WorkflowValidator:
         
         return max(0, base_score)
     
-    def validate_single_workflow(self, workflow_path: Path) -> Dict[str, Any]:
-        """Validate a single workflow file"""
+    def validate_single_workflow(self, workflow_path: Path, workflow_data: Dict = None) -> Dict[str, Any]:
+        """Validate a single workflow file (pass workflow_data if it is already parsed)"""
         try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                workflow_data = json.load(f)
+            if workflow_data is None:
+                workflow_data = load_workflow(workflow_path)
             
             issues = []
             
@@ -299,43 +243,110 @@ class WorkflowValidator:
                 'workflow_name': 'Error'
             }
     
-    def validate_all_workflows(self) -> Dict[str, Any]:
-        """Validate all workflows in the repository"""
+    def validate_all_workflows(self, stream_path: str = None) -> Dict[str, Any]:
+        """Validate all workflows in the repository (stream_path writes results as they finish)"""
         print("🔍 Validating all workflows...")
         
-        validation_results = []
-        total_workflows = 0
-        valid_workflows = 0
-        high_quality_workflows = 0
-        
+        store = self.get_validation_store()
+        validation_summary = self.new_validation_summary(stream_path)
         for category_dir in self.workflows_dir.iterdir():
             if category_dir.is_dir():
                 for workflow_file in category_dir.glob('*.json'):
-                    total_workflows += 1
-                    result = self.validate_single_workflow(workflow_file)
-                    validation_results.append(result)
-                    
-                    if not result['issues']:
-                        valid_workflows += 1
-                    
-                    if result['quality_score'] >= 80:
-                        high_quality_workflows += 1
+                    result, hash_value = store.lookup(workflow_file) if self.incremental else (None, None)
+                    if result is None:
+                        result = self.validate_single_workflow(workflow_file)
+                        store.store(workflow_file, result, hash_value)
+                    self.record_result(validation_summary, result)
         
-        # Generate summary
-        summary = {
+        store.prune(self.workflows_dir)
+        store.flush()
+        summary = self.finish_validation_summary(validation_summary)
+        
+        print(f"♻️ Reused {store.stats['reused']} stored results, validated {store.stats['validated']} workflows")
+        print(f"✅ Validated {summary['total_workflows']} workflows")
+        print(f"📊 {summary['valid_workflows']} workflows passed validation ({summary['validation_rate']:.1f}%)")
+        print(f"⭐ {summary['high_quality_workflows']} workflows are high quality ({summary['quality_rate']:.1f}%)")
+        
+        return summary
+    
+    def load_stored_summary(self, stream_path: str = None) -> Dict[str, Any]:
+        """Build the validation summary from stored results without re-validating"""
+        validation_summary = self.new_validation_summary(stream_path)
+        for result in self.get_validation_store().iter_results(self.workflows_dir):
+            self.record_result(validation_summary, result)
+        return self.finish_validation_summary(validation_summary)
+    
+    def new_validation_summary(self, stream_path: str = None) -> Dict[str, Any]:
+        """Online counters for the validation summary"""
+        sink = open_sink(stream_path, RESULT_FIELDS) if stream_path else None
+        return {
+            'total_workflows': 0,
+            'valid_workflows': 0,
+            'high_quality_workflows': 0,
+            'error_handling_workflows': 0,
+            'issue_counts': defaultdict(int),
+            'quality_distribution': {'Excellent (90-100)': 0, 'Good (80-89)': 0, 'Fair (70-79)': 0, 'Poor (<70)': 0},
+            'sink': sink,
+            'results': None if sink else []
+        }
+    
+    def record_result(self, validation_summary: Dict[str, Any], result: Dict[str, Any]):
+        """Fold one workflow's validation result into the summary"""
+        validation_summary['total_workflows'] += 1
+        if not result['issues']:
+            validation_summary['valid_workflows'] += 1
+        if result['quality_score'] >= 80:
+            validation_summary['high_quality_workflows'] += 1
+        if result['has_error_handling']:
+            validation_summary['error_handling_workflows'] += 1
+        
+        for issue in result['issues']:
+            issue_type = issue.split(':')[0] if ':' in issue else issue
+            validation_summary['issue_counts'][issue_type] += 1
+        
+        score = result['quality_score']
+        if score >= 90:
+            validation_summary['quality_distribution']['Excellent (90-100)'] += 1
+        elif score >= 80:
+            validation_summary['quality_distribution']['Good (80-89)'] += 1
+        elif score >= 70:
+            validation_summary['quality_distribution']['Fair (70-79)'] += 1
+        else:
+            validation_summary['quality_distribution']['Poor (<70)'] += 1
+        
+        if validation_summary['sink']:
+            validation_summary['sink'].write(result)
+        else:
+            validation_summary['results'].append(result)
+    
+    def finish_validation_summary(self, validation_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the validation summary from the accumulated counters"""
+        sink = validation_summary['sink']
+        if sink:
+            sink.close()
+        
+        total_workflows = validation_summary['total_workflows']
+        valid_workflows = validation_summary['valid_workflows']
+        high_quality_workflows = validation_summary['high_quality_workflows']
+        
+        return {
             'total_workflows': total_workflows,
             'valid_workflows': valid_workflows,
             'high_quality_workflows': high_quality_workflows,
             'validation_rate': (valid_workflows / total_workflows * 100) if total_workflows > 0 else 0,
             'quality_rate': (high_quality_workflows / total_workflows * 100) if total_workflows > 0 else 0,
-            'results': validation_results
+            'error_handling_workflows': validation_summary['error_handling_workflows'],
+            'issue_counts': dict(validation_summary['issue_counts']),
+            'quality_distribution': validation_summary['quality_distribution'],
+            'results': str(sink.path) if sink else validation_summary['results']
         }
-        
-        print(f"✅ Validated {total_workflows} workflows")
-        print(f"📊 {valid_workflows} workflows passed validation ({summary['validation_rate']:.1f}%)")
-        print(f"⭐ {high_quality_workflows} workflows are high quality ({summary['quality_rate']:.1f}%)")
-        
-        return summary
+    
+    def summarize_results(self, validation_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the validation summary from per-workflow results"""
+        validation_summary = self.new_validation_summary()
+        for result in validation_results:
+            self.record_result(validation_summary, result)
+        return self.finish_validation_summary(validation_summary)
     
     def generate_validation_report(self, summary: Dict[str, Any]):
         """Generate comprehensive validation report"""
@@ -349,36 +360,18 @@ class WorkflowValidator:
         print(f"   High Quality: {summary['high_quality_workflows']} ({summary['quality_rate']:.1f}%)")
         
         # Issue analysis
-        issue_counts = defaultdict(int)
-        for result in summary['results']:
-            for issue in result['issues']:
-                issue_type = issue.split(':')[0] if ':' in issue else issue
-                issue_counts[issue_type] += 1
-        
         print(f"\n⚠️  MOST COMMON ISSUES:")
-        for issue_type, count in sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for issue_type, count in sorted(summary['issue_counts'].items(), key=lambda x: x[1], reverse=True)[:10]:
             print(f"   {issue_type}: {count} workflows")
         
         # Quality distribution
-        quality_ranges = {'Excellent (90-100)': 0, 'Good (80-89)': 0, 'Fair (70-79)': 0, 'Poor (<70)': 0}
-        for result in summary['results']:
-            score = result['quality_score']
-            if score >= 90:
-                quality_ranges['Excellent (90-100)'] += 1
-            elif score >= 80:
-                quality_ranges['Good (80-89)'] += 1
-            elif score >= 70:
-                quality_ranges['Fair (70-79)'] += 1
-            else:
-                quality_ranges['Poor (<70)'] += 1
-        
         print(f"\n⭐ QUALITY DISTRIBUTION:")
-        for range_name, count in quality_ranges.items():
+        for range_name, count in summary['quality_distribution'].items():
             percentage = (count / summary['total_workflows'] * 100) if summary['total_workflows'] > 0 else 0
             print(f"   {range_name}: {count} workflows ({percentage:.1f}%)")
         
         # Error handling analysis
-        error_handling_count = sum(1 for result in summary['results'] if result['has_error_handling'])
+        error_handling_count = summary['error_handling_workflows']
         print(f"\n🛡️ ERROR HANDLING:")
         print(f"   Workflows with error handling: {error_handling_count} ({error_handling_count/summary['total_workflows']*100:.1f}%)")
         
@@ -390,10 +383,24 @@ class WorkflowValidator:
 
 def main():
     """Main validation function"""
-    validator = WorkflowValidator()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Validate n8n workflows')
+    parser.add_argument('--dir', default='workflows', help='Workflows directory')
+    parser.add_argument('--full', action='store_true', help='Re-validate every workflow, ignoring stored results')
+    parser.add_argument('--from-store', action='store_true', help='Report from stored results without validating')
+    parser.add_argument('--store', help='Validation results database (default: .validation_cache.db)')
+    parser.add_argument('--stream', help='Write per-workflow results to this file (.jsonl, .csv or .parquet) '
+                                         'instead of keeping them in the JSON report')
+    args = parser.parse_args()
+    
+    validator = WorkflowValidator(args.dir, incremental=not args.full, store_path=args.store)
     
     # Run validation
-    summary = validator.validate_all_workflows()
+    if args.from_store:
+        summary = validator.load_stored_summary(args.stream)
+    else:
+        summary = validator.validate_all_workflows(args.stream)
     
     # Generate report
     validator.generate_validation_report(summary)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Workflow Writer - Change-aware, atomic write-back for workflow JSON files
+A file is only rewritten when its serialized content changed; writes go through a temp file and rename.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+import json_backend
+
+PathLike = Union[str, Path]
+
+
+def serialize_workflow(workflow_data: Any) -> bytes:
+    """Canonical on-disk form used by the fixers and upgraders."""
+    return json.dumps(workflow_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def load_for_update(workflow_path: PathLike) -> Tuple[Any, bytes]:
+    """Parse a workflow and snapshot its canonical bytes before any fix mutates it."""
+    workflow_data = json_backend.load_file(workflow_path)
+    return workflow_data, serialize_workflow(workflow_data)
+
+
+def write_atomic(path: PathLike, content: bytes):
+    """Replace ``path`` with ``content`` so readers never see a partially written file."""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_file_if_changed(path: PathLike, content: bytes) -> bool:
+    """Write ``content`` only if the file is missing or differs; returns True when the file was written."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, content)
+    return True
+
+
+def write_workflow_if_changed(workflow_path: PathLike, workflow_data: Any, snapshot: bytes,
+                              before_write: Optional[Callable[[Any], None]] = None) -> bool:
+    """Write the workflow only if it differs from ``snapshot``; returns True when the file was written.
+
+    ``before_write`` is called on ``workflow_data`` once it is known to have
+    changed (e.g. to stamp a modification time) and before it is serialized.
+    """
+    content = serialize_workflow(workflow_data)
+    if content == snapshot:
+        return False
+    if before_write:
+        before_write(workflow_data)
+        content = serialize_workflow(workflow_data)
+    write_atomic(workflow_path, content)
+    return True